@@ -0,0 +1,102 @@
+#bench_bar_chart.py
+
+"""Per-frame cost of the motor-current bar chart: rebuild vs in-place update.
+
+Usage (from ``my_drone_dashboard``)::
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_bar_chart.py --frames 500
+
+Each frame appends one sample to a real :class:`DataHandler` store, updates
+the bar chart of a shown :class:`MotorCurrentVisualization` and repaints it
+synchronously.  The legacy path (``clear()``, ticks reset, four new
+``BarGraphItem`` objects, autorange re-enabled) is replayed for comparison.
+Update and paint times come from ``utils.perf.TIMINGS``, the same
+instrumentation the live widget reports.  The in-place bar heights are
+checked against the store after every frame.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+import pyqtgraph as pg  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from benchmarks.synthetic import flight_rows  # noqa: E402
+from config_manager import DEFAULT_CONFIG  # noqa: E402
+from data_handler import DataHandler  # noqa: E402
+from ui.blocks import MotorCurrentVisualization  # noqa: E402
+from utils.perf import TIMINGS  # noqa: E402
+
+
+def legacy_bars(widget: MotorCurrentVisualization) -> None:
+    """The bar-chart part of update_plot before the persistent item."""
+    current_vals = [widget.data_handler.store.latest(f"motor{i+1}_current", 0.0) for i in range(4)]
+    widget.bar_plot.clear()
+    ticks = [(i, f"M{i+1}") for i in range(4)]
+    widget.bar_plot.getAxis('bottom').setTicks([ticks])
+    for i, val in enumerate(current_vals):
+        bg = pg.BarGraphItem(x=[i], height=[val], width=0.6, brush=widget.colors[i])
+        widget.bar_plot.addItem(bg)
+    widget.bar_plot.enableAutoRange(axis=pg.ViewBox.XAxis, enable=True)
+    widget.bar_plot.enableAutoRange(axis=pg.ViewBox.YAxis, enable=True)
+    widget.total_current_label.setText(f"Total: {sum(current_vals):.2f} A")
+
+
+def check(widget: MotorCurrentVisualization) -> None:
+    store = widget.data_handler.store
+    want = [store.latest(f"motor{i+1}_current") for i in range(4)]
+    assert np.array_equal(widget.bar_item.opts["height"], want)
+    assert widget.bar_plot.plotItem.items == [widget.bar_item]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--frames", type=int, default=500)
+    args = ap.parse_args()
+
+    app = QApplication(sys.argv)
+    dh = DataHandler(dict(DEFAULT_CONFIG, arduino_port=""))
+    widget = MotorCurrentVisualization(dh)   # redrawn by hand below, as the RenderScheduler would
+    widget.resize(1200, 800)
+    widget.show()
+    app.processEvents()
+
+    _, rows = flight_rows(2 * args.frames + 1, 100.0)
+    rows[:, 1:5] = np.random.default_rng(5).normal(2.5, 1.0, (len(rows), 4))
+    dh.store.extend(rows[:1])
+    pos = 1
+
+    def run(stage, update, verify):
+        nonlocal pos
+        TIMINGS.reset()
+        for _ in range(args.frames):
+            dh.store.extend(rows[pos:pos + 1])
+            pos += 1
+            with TIMINGS.measure(f"{stage}.update"):
+                update(widget)
+            widget.bar_plot.viewport().repaint()
+            if verify:
+                check(widget)
+        s = TIMINGS.summary()
+        return s[f"{stage}.update"], s["motor.bars.paint"]
+
+    old = run("legacy", legacy_bars, False)
+    widget.bar_plot.clear()
+    widget.bar_plot.addItem(widget.bar_item)
+    widget.bar_plot.setXRange(-0.5, 3.5, padding=0.05)
+    new = run("inplace", MotorCurrentVisualization._update_bars, True)
+
+    print(f"{args.frames} frames, 4 bars, ms per frame (mean / p95)")
+    for name, (upd, paint) in (("rebuild", old), ("in place", new)):
+        print(f"  {name:9s} update {upd['mean']:7.3f} / {upd['p95']:7.3f}"
+              f"   paint {paint['mean']:7.3f} / {paint['p95']:7.3f}")
+
+
+if __name__ == "__main__":
+    main()
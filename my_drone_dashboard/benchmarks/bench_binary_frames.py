@@ -0,0 +1,132 @@
+#bench_binary_frames.py
+
+"""Compare the text line and the binary COBS frame on size and decode cost.
+
+Usage (from ``my_drone_dashboard``)::
+
+    python benchmarks/bench_binary_frames.py --frames 50000 --baud 115200
+
+Both streams go through :class:`serial_ingest.FrameAssembler`, so the
+numbers include framing.  A copy of the binary stream with one flipped
+bit every 100 frames checks that corrupt frames are dropped, not raised.
+
+The framing checks feed streams in serial-sized chunks: a text stream
+with a stray ``0x00`` must stay in text framing and lose no line, and a
+binary link that turns back into text (or into zero-delimited garbage)
+must fall back to newline framing.
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synthetic import arduino_stream  # noqa: E402
+from binary_protocol import BinaryFrameDecoder, encode_frame  # noqa: E402
+from serial_ingest import FrameAssembler  # noqa: E402
+from telemetry_parser import TelemetryParser  # noqa: E402
+
+
+def binary_stream(n: int, num_motors: int = 4) -> bytes:
+    out = bytearray()
+    for i in range(n):
+        t = i * 0.01
+        out += encode_frame(
+            i,
+            [1500 + int(200 * math.sin(t)), 1500, 1000 + i % 1000, 1500],
+            [1100 + (i + 37 * m) % 800 for m in range(num_motors)],
+            [20 * math.sin(t), 15 * math.cos(t), (i * 0.5) % 360],
+            [2.5 + math.sin(t + m) for m in range(num_motors)],
+        )
+    return bytes(out)
+
+
+def chunked(asm: FrameAssembler, data: bytes, size: int = 256, decoder=None):
+    """Feed *data* like successive serial reads; text lines out (binary ones decoded)."""
+    lines = []
+    for i in range(0, len(data), size):
+        frames = asm.feed(data[i:i + size])
+        if asm.binary and decoder is not None:
+            before = decoder.frames_ok
+            decoder.decode_batch(frames)
+            asm.rejected(len(frames) - (decoder.frames_ok - before), len(frames))
+        elif not asm.binary:
+            lines.extend(frames)
+    return lines
+
+
+def framing_checks() -> None:
+    text = arduino_stream(2000)
+    cut = text.index(b"\n", 1000) + 1
+    asm = FrameAssembler()
+    lines = chunked(asm, text[:cut] + b"\x00" + text[cut:])           # noise between lines
+    assert not asm.binary and len(lines) == 2000 and asm.overflows == 0, (len(lines), asm.overflows)
+    mid = cut + 20
+    asm = FrameAssembler()
+    lines = chunked(asm, text[:mid] + b"\x00" + text[mid:])           # noise inside a line
+    assert not asm.binary and lines == FrameAssembler().feed(text) and asm.noise_zeros == 1
+
+    asm = FrameAssembler()
+    decoder = BinaryFrameDecoder(4)
+    lines = chunked(asm, b"\x00" + binary_stream(200) + text, decoder=decoder)
+    assert decoder.frames_ok == 200 and not asm.binary and asm.fallbacks == 1
+    assert len(lines) >= 2000 - 3, len(lines)
+
+    asm = FrameAssembler()
+    garbage = b"".join(bytes([7, 1, 2, 3, 4, 5, 6, 0]) for _ in range(100))
+    chunked(asm, b"\x00" + binary_stream(10) + garbage, decoder=BinaryFrameDecoder(4))
+    assert not asm.binary and asm.fallbacks == 1
+    print(f"framing: stray 0x00 kept text framing ({asm.fallbacks} fallback from binary to text)")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--frames", type=int, default=50000)
+    ap.add_argument("--baud", type=int, default=115200)
+    args = ap.parse_args()
+    n = args.frames
+
+    text = arduino_stream(n)
+    binary = b"\x00" + binary_stream(n)   # leading zero: resync like a fresh link
+    bytes_per_s = args.baud / 10          # 8N1
+
+    # -- text --------------------------------------------------------------
+    parser = TelemetryParser(4)
+    t0 = time.perf_counter_ns()
+    lines = FrameAssembler().feed(text)
+    for ln in lines:
+        parser.parse(ln)
+    text_ns = (time.perf_counter_ns() - t0) / len(lines)
+
+    # -- binary ------------------------------------------------------------
+    asm = FrameAssembler()
+    decoder = BinaryFrameDecoder(4)
+    t0 = time.perf_counter_ns()
+    frames = decoder.decode_batch(asm.feed(binary))
+    bin_ns = (time.perf_counter_ns() - t0) / len(frames)
+    assert asm.binary and len(frames) == n and decoder.seq_gaps == 0
+
+    # -- corruption ----------------------------------------------------------
+    corrupt = bytearray(binary)
+    for pos in range(60, len(corrupt), 51 * 100):
+        if corrupt[pos]:
+            corrupt[pos] ^= 0x10 if corrupt[pos] != 0x10 else 0x20
+    decoder_c = BinaryFrameDecoder(4)
+    good = decoder_c.decode_batch(FrameAssembler().feed(bytes(corrupt)))
+
+    t_sz, b_sz = len(text) / n, (len(binary) - 1) / n
+    print(f"text  : {t_sz:6.1f} B/sample  {bytes_per_s / t_sz:8.0f} samples/s @ {args.baud}  "
+          f"{text_ns:7.0f} ns/sample decode")
+    print(f"binary: {b_sz:6.1f} B/sample  {bytes_per_s / b_sz:8.0f} samples/s @ {args.baud}  "
+          f"{bin_ns:7.0f} ns/sample decode")
+    print(f"gain  : {t_sz / b_sz:.1f}x samples per baud, {text_ns / bin_ns:.1f}x cheaper decode")
+    print(f"corrupted stream: {len(good)} ok, {decoder_c.crc_errors} CRC errors, "
+          f"{decoder_c.malformed} malformed, {decoder_c.seq_gaps} sequence gaps")
+    framing_checks()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#bench_camera_display.py
+
+"""GUI-thread cost of showing one camera frame: QLabel pixmap vs VideoTile.
+
+Usage (from ``my_drone_dashboard``)::
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_camera_display.py --frames 300
+
+A 1280x720 BGR frame is shown in a 640x360 tile.  The legacy path
+(``cvtColor`` to RGB, ``QImage``, ``QPixmap.fromImage``, ``scaled()``,
+``QLabel.setPixmap``) runs entirely on the GUI thread.  The new path
+downscales on the capture worker (timed separately, as the worker does)
+and the GUI thread only wraps the BGR buffer and paints it.  Both widgets
+are repainted synchronously; the tile's rendering is checked against the
+``cv2.resize`` reference.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+from PyQt6.QtCore import Qt  # noqa: E402
+from PyQt6.QtGui import QImage, QPixmap  # noqa: E402
+from PyQt6.QtWidgets import QApplication, QLabel  # noqa: E402
+
+from benchmarks.synthetic import jpeg_frame  # noqa: E402
+from camera_capture import CameraCapture  # noqa: E402
+from ui.multi_camera import VideoTile  # noqa: E402
+
+TILE = (640, 360)
+
+
+def legacy_show(label: QLabel, frame: np.ndarray) -> None:
+    """update_frame's display part before VideoTile."""
+    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    height, width, _ = frame.shape
+    q_img = QImage(frame.data, width, height, 3 * width, QImage.Format.Format_RGB888)
+    pixmap = QPixmap.fromImage(q_img).scaled(label.size(), Qt.AspectRatioMode.KeepAspectRatio)
+    label.setPixmap(pixmap)
+    label.repaint()
+
+
+def check(tile: VideoTile, reference: np.ndarray) -> None:
+    shot = tile.grab().toImage().convertToFormat(QImage.Format.Format_BGR888)
+    ptr = shot.constBits()
+    ptr.setsize(shot.sizeInBytes())
+    rgb = np.frombuffer(ptr, np.uint8).reshape(shot.height(), shot.bytesPerLine())[:, :3 * shot.width()]
+    rgb = rgb.reshape(shot.height(), shot.width(), 3)
+    err = np.abs(rgb.astype(int) - reference.astype(int)).mean()
+    assert err < 1.0, f"tile differs from reference by {err:.2f}"
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--frames", type=int, default=300)
+    args = ap.parse_args()
+
+    app = QApplication(sys.argv)
+    frame = cv2.imdecode(np.frombuffer(jpeg_frame(1280, 720), np.uint8), cv2.IMREAD_COLOR)
+
+    label = QLabel()
+    label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    label.setFixedSize(*TILE)
+    label.show()
+    tile = VideoTile()
+    tile.setFixedSize(*TILE)
+    tile.show()
+    app.processEvents()
+
+    capture = CameraCapture("bench")
+    capture.target_size = tile.device_size()
+
+    gui_old, gui_new, worker = [], [], []
+    for _ in range(args.frames):
+        t0 = time.perf_counter()
+        legacy_show(label, frame)
+        gui_old.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        small = capture._fit(frame)
+        worker.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        tile.set_frame(small)
+        tile.repaint()
+        gui_new.append(time.perf_counter() - t0)
+
+    check(tile, small)
+
+    def fmt(xs):
+        xs = np.array(xs) * 1e3
+        return f"{xs.mean():7.3f} / {np.percentile(xs, 95):7.3f}"
+
+    print(f"{args.frames} frames, 1280x720 -> {TILE[0]}x{TILE[1]}, ms per frame (mean / p95)")
+    print(f"  QLabel pixmap   GUI {fmt(gui_old)}")
+    print(f"  VideoTile       GUI {fmt(gui_new)}   worker resize {fmt(worker)}")
+
+
+if __name__ == "__main__":
+    main()
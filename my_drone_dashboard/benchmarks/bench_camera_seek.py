@@ -0,0 +1,156 @@
+#bench_camera_seek.py
+
+"""Camera recording: stream copy, segment rolling and index seek cost.
+
+Usage (from ``my_drone_dashboard``)::
+
+    python benchmarks/bench_camera_seek.py --hours 1 --seeks 2000
+
+The MJPEG check serves one JPEG as ``multipart/x-mixed-replace`` and
+records it through :class:`CameraCapture`; every indexed frame must be
+the served bytes unchanged (stream copy).  The re-encode check records a
+:class:`FakeCamera` at 30 fps with short segments while the decode budget
+is 5 fps: every grabbed frame must still be recorded, spread over several
+segments, with increasing frame numbers and timestamps.  A paused
+re-encode recording whose source fails to decode now and then must keep
+its worker alive.
+
+The seek check writes an index for ``--hours`` of 30 fps video and
+compares :meth:`CameraRecording.seek` (binary search on the mapped
+index) with a linear scan for random telemetry timestamps.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+
+from benchmarks.bench_mjpeg import serve  # noqa: E402
+from benchmarks.synthetic import FakeCamera, jpeg_frame  # noqa: E402
+from camera_capture import CameraCapture  # noqa: E402
+from camera_recorder import FRAME_RECORD, MAGIC, CameraRecording, segment_path  # noqa: E402
+
+
+def mjpeg_check(folder: str, jpeg: bytes, frames: int) -> CameraRecording:
+    server = serve(jpeg, frames, True)
+    capture = CameraCapture(f"http://127.0.0.1:{server.server_port}/video", reconnect_delay=60)
+    capture.requested_fps = 0   # display paused: recording must not depend on decoding
+    capture.start_recording(os.path.join(folder, "camera_mjpeg"), 60.0)
+    capture.start()
+    end = time.monotonic() + 30
+    while capture.stats.errors == 0 and time.monotonic() < end:
+        time.sleep(0.05)
+    capture.stop()
+    server.shutdown()
+    assert capture.stats.frames == 0, capture.stats.frames
+    rec = CameraRecording(os.path.join(folder, "camera_mjpeg.vidx"))
+    assert len(rec) == frames, (len(rec), frames)
+    assert all(rec.jpeg(i) == jpeg for i in range(len(rec))), "stream copy changed the bytes"
+    return rec
+
+
+def reencode_check(folder: str, width: int, height: int, seconds: float) -> CameraRecording:
+    capture = CameraCapture("fake", open_capture=lambda url: FakeCamera(url, 30.0, width, height))
+    capture.requested_fps = 5
+    capture.start_recording(os.path.join(folder, "camera_fake"), 0.5)
+    capture.start()
+    time.sleep(seconds)
+    capture.stop()
+    rec = CameraRecording(os.path.join(folder, "camera_fake.vidx"))
+    f = rec.frames
+    assert len(rec) == capture.stats.recorded > 2 * capture.stats.frames, (len(rec), capture.stats)
+    assert (np.diff(f["frame"].astype(np.int64)) > 0).all() and (np.diff(f["time"]) >= 0).all()
+    segments = int(f["segment"][-1]) + 1
+    assert segments >= int(seconds / 0.5) - 1, segments
+    for seg in range(segments):
+        assert os.path.getsize(segment_path(rec.stem, seg)) > 0
+    assert rec.frame_at(rec.t_last).shape == (height, width, 3)
+    return rec
+
+
+class FlakyCamera(FakeCamera):
+    """FakeCamera whose ``retrieve`` fails on every *every*-th frame."""
+
+    def __init__(self, url: str = "", every: int = 10, **kwargs) -> None:
+        super().__init__(url, **kwargs)
+        self.every, self.count = every, 0
+
+    def retrieve(self):
+        self.count += 1
+        if self.count % self.every == 0:
+            return False, None
+        return super().retrieve()
+
+
+def paused_failure_check(folder: str, seconds: float) -> CameraCapture:
+    capture = CameraCapture("flaky", reconnect_delay=0.05,
+                            open_capture=lambda url: FlakyCamera(url, fps=30.0, width=320, height=240))
+    capture.requested_fps = 0   # camera tab hidden, still recording
+    capture.start_recording(os.path.join(folder, "camera_flaky"), 60.0)
+    capture.start()
+    time.sleep(seconds)
+    alive = capture._thread.is_alive()
+    capture.stop()
+    assert alive, "capture worker died"
+    assert capture.stats.errors > 0 and capture.stats.recorded > 20 * seconds, capture.stats
+    return capture
+
+
+def write_index(path: str, count: int, fps: float, t0: float) -> None:
+    header = b"{}"
+    with open(path, "wb") as f:
+        f.write(MAGIC + len(header).to_bytes(4, "little") + header)
+        jitter = np.random.default_rng(1).uniform(0.0, 0.3 / fps, count)
+        times = t0 + np.arange(count) / fps + jitter
+        f.write(b"".join(FRAME_RECORD.pack(int(t * 1e9), t, i, i // 1800, 0, 0)
+                         for i, t in enumerate(times)))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--hours", type=float, default=1.0, help="length of the synthetic index")
+    ap.add_argument("--seeks", type=int, default=2000)
+    ap.add_argument("--width", type=int, default=1280)
+    ap.add_argument("--height", type=int, default=720)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        jpeg = jpeg_frame(args.width, args.height)
+        rec = mjpeg_check(folder, jpeg, 100)
+        print(f"stream copy: {len(rec)} frames recorded with decoding paused, bytes unchanged")
+        rec = reencode_check(folder, args.width, args.height, 3.0)
+        print(f"re-encode:   {len(rec)} frames at 30 fps over {int(rec.frames['segment'][-1]) + 1}"
+              f" segments of 0.5 s, {(rec.t_last - rec.t_first):.2f} s")
+        flaky = paused_failure_check(folder, 1.5)
+        print(f"paused:      {flaky.stats.recorded} frames recorded through"
+              f" {flaky.stats.errors} decode failures")
+
+        count = int(args.hours * 3600 * 30)
+        path = os.path.join(folder, "camera_long.vidx")
+        write_index(path, count, 30.0, 1.7e9)
+        t_open = time.perf_counter()
+        rec = CameraRecording(path)
+        t_open = (time.perf_counter() - t_open) * 1e3
+        times = np.array(rec.time)
+        queries = np.random.default_rng(2).uniform(rec.t_first - 1, rec.t_last + 1, args.seeks)
+
+        t0 = time.perf_counter()
+        fast = [rec.seek(t) for t in queries]
+        t_seek = (time.perf_counter() - t0) / args.seeks * 1e6
+        t0 = time.perf_counter()
+        slow = [min(max(int((times <= t).sum()) - 1, 0), count - 1) for t in queries]
+        t_scan = (time.perf_counter() - t0) / args.seeks * 1e6
+        assert fast == slow
+        print(f"seek in {count} frames ({args.hours:g} h at 30 fps, index opened in {t_open:.1f} ms):"
+              f" binary search {t_seek:.1f} us, linear scan {t_scan:.0f} us ({t_scan / t_seek:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
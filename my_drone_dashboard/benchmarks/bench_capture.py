@@ -0,0 +1,131 @@
+#bench_capture.py
+
+"""GUI-thread cost of four camera channels: inline read(), threads, processes.
+
+Usage (from ``my_drone_dashboard``)::
+
+    python benchmarks/bench_capture.py --seconds 5 --fps 30
+
+Four :class:`~benchmarks.synthetic.FakeCamera` streams (paced at ``--fps``,
+each frame decodes a real 1280x720 JPEG and is downscaled to a 640x360
+tile) are consumed by a 30 ms tick standing in for the GUI timer.  The
+legacy tick calls ``read()`` for every channel inline; the threaded tick
+takes the newest frame from each :class:`CameraCapture` slot; the process
+tick copies it out of each :class:`CameraProcess` shared-memory ring.
+
+Every tick also runs a fixed pure-Python workload (a stand-in for line
+parsing and plot bookkeeping); its duration shows how much the capture
+path competes with the GUI thread for the interpreter.  Reported: time
+the tick blocks, the workload time, achieved display rate per channel,
+frame age at pick-up and the capture counters.
+"""
+
+import argparse
+import functools
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+
+from benchmarks.synthetic import FakeCamera  # noqa: E402
+from camera_capture import CameraCapture  # noqa: E402
+from camera_process import CameraProcess  # noqa: E402
+
+CHANNELS = 4
+TICK     = 0.030
+TILE     = (640, 360)
+
+
+def python_work() -> float:
+    """~1 ms of interpreter-bound work; returns its duration in ms."""
+    t0 = time.perf_counter()
+    total = 0
+    for i in range(20000):
+        total += i % 7
+    return (time.perf_counter() - t0) * 1e3
+
+
+def run(seconds: float, tick) -> dict:
+    blocked, work, shown, ages = [], [], 0, []
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        t0 = time.perf_counter()
+        n, age = tick()
+        blocked.append((time.perf_counter() - t0) * 1e3)
+        work.append(python_work())
+        shown += n
+        ages.extend(age)
+        time.sleep(max(0.0, TICK - (time.perf_counter() - t0)))
+    return {"blocked": np.array(blocked), "work": np.array(work),
+            "fps": shown / seconds / CHANNELS, "age": np.array(ages)}
+
+
+def take_newest(captures):
+    def tick():
+        n, age = 0, []
+        for c in captures:
+            frame = c.latest()
+            if frame is not None:
+                n += 1
+                age.append((time.monotonic() - frame.captured) * 1e3)
+        return n, age
+    return tick
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--fps", type=float, default=30.0)
+    args = ap.parse_args()
+
+    camera = functools.partial(FakeCamera, fps=args.fps)
+    results = {}
+
+    cams = [camera() for _ in range(CHANNELS)]
+    reference = CameraCapture("inline")
+    reference.target_size = TILE
+
+    def inline_tick():
+        for cam in cams:
+            ok, frame = cam.read()
+            reference._fit(frame)
+        return CHANNELS, []
+
+    results["inline"] = run(args.seconds, inline_tick)
+
+    for name, cls in (("threaded", CameraCapture), ("process", CameraProcess)):
+        captures = [cls(f"{name}{i}", open_capture=camera) for i in range(CHANNELS)]
+        for c in captures:
+            c.target_size = TILE
+            c.start()
+        tick = take_newest(captures)
+        end = time.monotonic() + 5
+        while time.monotonic() < end and not all(c.stats.frames for c in captures):
+            tick()   # let the streams open (processes also need to spawn)
+            time.sleep(0.05)
+        results[name] = run(args.seconds, tick)
+        for c in captures:
+            c.stop()
+        results[name]["stats"] = [c.stats for c in captures]
+
+    print(f"{CHANNELS} channels @ {args.fps:g} fps source, {TICK * 1e3:.0f} ms GUI tick, {args.seconds:g} s"
+          f"  (ms: mean / p95)")
+    for name, r in results.items():
+        b, w = r["blocked"], r["work"]
+        age = f"{np.percentile(r['age'], 95):6.1f} ms" if r["age"].size else "   n/a"
+        print(f"  {name:9s} GUI blocked {b.mean():6.2f} / {np.percentile(b, 95):6.2f}"
+              f"   python work {w.mean():5.2f} / {np.percentile(w, 95):5.2f}"
+              f"   shown {r['fps']:5.1f} fps/channel   frame age p95 {age}")
+        for s in r.get("stats", []):
+            print(f"    decoded {s.frames:4d}  delivered {s.delivered:4d}  dropped {s.dropped:3d}"
+                  f"  {s.fps:5.1f} fps  decode {s.decode_ms:5.1f} ms  errors {s.errors}  restarts {s.restarts}")
+            assert s.delivered + s.dropped <= s.frames and s.errors == 0 and s.restarts == 0
+
+
+if __name__ == "__main__":
+    main()
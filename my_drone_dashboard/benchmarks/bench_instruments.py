@@ -0,0 +1,314 @@
+#bench_instruments.py
+
+"""Paint time of the PFD instruments: full redraw vs cached layers.
+
+Usage (from ``my_drone_dashboard``)::
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_instruments.py --frames 500 --size 300
+
+Each frame sets a new attitude / heading and renders the widget into a
+QImage (``QWidget.render`` runs ``paintEvent``).  The legacy painters
+(everything redrawn with antialiasing and ``fontMetrics`` each frame)
+are replayed from subclasses.  At integer angles the cached output is
+compared with the legacy image and must match on almost every pixel.
+
+``--hover`` frames then feed all four shown instruments a hovering
+drone's sensor noise and report paints issued vs. repaints suppressed by
+``PFDInstrument.threshold_px`` (``--threshold``).
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+from PyQt6.QtCore import QPointF, QRectF, Qt  # noqa: E402
+from PyQt6.QtGui import QBrush, QColor, QFont, QImage, QPainter, QPainterPath, QPen  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from pdf import AirspeedIndicator, AltitudeIndicator, DroneAttitudeIndicator, HeadingIndicator  # noqa: E402
+
+
+class LegacyAttitude(DroneAttitudeIndicator):
+    """paintEvent before the cached layers."""
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        width = self.width()
+        height = self.height()
+        center_x = width / 2
+        center_y = height / 2
+        radius = min(width, height) / 2 - 10
+
+        # Save the current state
+        painter.save()
+
+        # Move to center and rotate
+        painter.translate(center_x, center_y)
+        painter.rotate(self.roll)
+
+        # Draw artificial horizon
+        sky_rect = QRectF(-radius, -radius, radius * 2, radius * 2)
+        ground_rect = QRectF(-radius, 0, radius * 2, radius * 2)
+
+        # Adjust for pitch
+        pitch_offset = radius * self.pitch / 45.0  # Scale pitch to pixels
+        painter.translate(0, pitch_offset)
+
+        # Draw sky
+        painter.setBrush(QBrush(QColor(0, 128, 255)))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawRect(QRectF(-radius, -radius * 2, radius * 2, radius * 2))
+
+        # Draw ground
+        painter.setBrush(QBrush(QColor(139, 69, 19)))
+        painter.drawRect(QRectF(-radius, 0, radius * 2, radius * 2))
+
+        # Draw horizon line
+        painter.setPen(QPen(Qt.GlobalColor.white, 2))
+        painter.drawLine(int(-radius), 0, int(radius), 0)
+
+        # Draw pitch lines
+        painter.setPen(QPen(Qt.GlobalColor.white, 1))
+        for i in range(-45, 46, 5):
+            if i == 0:
+                continue  # Skip zero (horizon line already drawn)
+
+            y = -i * radius / 45.0
+
+            # Different line lengths based on multiples of 10
+            line_length = radius * 0.5 if i % 10 == 0 else radius * 0.25
+
+            painter.drawLine(int(-line_length / 2), int(y), int(line_length / 2), int(y))
+
+            # Add degree numbers for multiples of 10
+            if i % 10 == 0:
+                painter.setFont(QFont("Arial", 8))
+                degree_text = str(abs(i))
+                text_width = painter.fontMetrics().horizontalAdvance(degree_text)
+                painter.drawText(QPointF(-line_length / 2 - text_width - 5, y + 4), degree_text)
+                painter.drawText(QPointF(line_length / 2 + 5, y + 4), degree_text)
+
+        painter.restore()
+
+        # Draw fixed aircraft symbol
+        painter.setPen(QPen(Qt.GlobalColor.yellow, 3))
+        painter.drawLine(int(center_x - 30), int(center_y), int(center_x - 10), int(center_y))
+        painter.drawLine(int(center_x + 10), int(center_y), int(center_x + 30), int(center_y))
+        painter.drawLine(int(center_x), int(center_y - 5), int(center_x), int(center_y + 5))
+
+        # Draw outer circle
+        painter.setPen(QPen(Qt.GlobalColor.white, 2))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawEllipse(QRectF(center_x - radius, center_y - radius, radius * 2, radius * 2))
+
+        # Draw roll indicator at the top
+        painter.save()
+        painter.translate(center_x, center_y)
+
+        # Draw roll indicator ticks
+        tick_angles = [-60, -45, -30, -20, -10, 0, 10, 20, 30, 45, 60]
+        for angle in tick_angles:
+            painter.save()
+            painter.rotate(angle)
+            tick_length = 10 if angle % 30 == 0 else 5
+            painter.drawLine(0, int(-radius + 2), 0, int(-radius + 2 + tick_length))
+
+            if angle % 30 == 0:
+                painter.setFont(QFont("Arial", 8))
+                text = str(abs(angle))
+                text_width = painter.fontMetrics().horizontalAdvance(text)
+                painter.drawText(QPointF(-text_width/2, -radius + 25), text)
+
+            painter.restore()
+
+        # Draw roll indicator arrow
+        painter.rotate(-self.roll)
+        painter.setPen(QPen(Qt.GlobalColor.yellow, 2))
+        painter.drawLine(0, int(-radius + 5), 0, int(-radius + 15))
+        painter.drawLine(0, int(-radius + 15), -5, int(-radius + 20))
+        painter.drawLine(0, int(-radius + 15), 5, int(-radius + 20))
+
+        painter.restore()
+
+
+class LegacyHeading(HeadingIndicator):
+    """paintEvent before the cached layers."""
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        width = self.width()
+        height = self.height()
+        center_x = width / 2
+
+        # Draw background
+        painter.setBrush(QBrush(QColor(10, 10, 30)))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawRect(0, 0, width, height)
+
+        # Draw heading scale
+        painter.setPen(QPen(Qt.GlobalColor.white, 1))
+        scale_width = width - 40
+        scale_top = 20
+        scale_height = 30
+
+        painter.drawLine(20, scale_top + scale_height, width - 20, scale_top + scale_height)
+
+        # Draw degree marks
+        pixels_per_degree = scale_width / 60.0  # Show 60 degrees in view
+
+        for i in range(-30, 31):
+            degree = (self.heading + i) % 360
+            x = int(center_x + i * pixels_per_degree)
+
+            if 0 <= x <= width:
+                # Different line heights based on multiples
+                line_height = 15 if degree % 30 == 0 else (10 if degree % 10 == 0 else 5)
+
+                painter.drawLine(x, scale_top + scale_height - line_height, x, scale_top + scale_height)
+
+                # Add text for major headings
+                if degree % 30 == 0:
+                    # Use N, E, S, W for cardinal directions
+                    if degree == 0:
+                        label = "N"
+                    elif degree == 90:
+                        label = "E"
+                    elif degree == 180:
+                        label = "S"
+                    elif degree == 270:
+                        label = "W"
+                    else:
+                        label = str(degree)
+
+                    painter.setFont(QFont("Arial", 10))
+                    text_width = painter.fontMetrics().horizontalAdvance(label)
+                    painter.drawText(QPointF(x - text_width/2, scale_top + scale_height - 20), label)
+
+        # Draw center triangle
+        painter.setPen(QPen(Qt.GlobalColor.yellow, 2))
+        painter.setBrush(QBrush(Qt.GlobalColor.yellow))
+        triangle = QPainterPath()
+        triangle.moveTo(center_x, scale_top)
+        triangle.lineTo(center_x - 10, scale_top + 10)
+        triangle.lineTo(center_x + 10, scale_top + 10)
+        triangle.closeSubpath()
+        painter.drawPath(triangle)
+
+        # Draw heading number
+        painter.setPen(QPen(Qt.GlobalColor.white, 1))
+        painter.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        heading_text = f"{int(self.heading):03d}°"
+        text_width = painter.fontMetrics().horizontalAdvance(heading_text)
+        painter.drawText(QPointF(center_x - text_width/2, height - 10), heading_text)
+
+
+def render(widget) -> np.ndarray:
+    image = QImage(widget.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    image.fill(0)
+    widget.render(image)
+    ptr = image.constBits()
+    ptr.setsize(image.sizeInBytes())
+    return np.frombuffer(ptr, np.uint8).reshape(image.height(), image.bytesPerLine())[:, :image.width() * 4].copy()
+
+
+def time_frames(widget, poses, apply) -> float:
+    image = QImage(widget.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    t0 = time.perf_counter()
+    for pose in poses:
+        apply(widget, pose)
+        widget.render(image)
+    return (time.perf_counter() - t0) / len(poses) * 1e3
+
+
+def mismatch(a: np.ndarray, b: np.ndarray) -> float:
+    """Fraction of pixels differing by more than 64 in any channel."""
+    diff = np.abs(a.astype(np.int16) - b.astype(np.int16)).reshape(a.shape[0], -1, 4)
+    return float((diff.max(axis=2) > 64).mean())
+
+
+def hover(app, frames: int, threshold: float, size: int) -> None:
+    """Noisy near-constant readings, as while hovering."""
+    rng = np.random.default_rng(11)
+    widgets = [DroneAttitudeIndicator(), HeadingIndicator(), AltitudeIndicator(), AirspeedIndicator()]
+    for w in widgets:
+        w.threshold_px = threshold
+        w.resize(size, size)
+        w.show()
+    app.processEvents()
+    for w in widgets:
+        w.paints = 0
+    noise = rng.normal(0, [0.05, 0.05, 0.1, 0.02, 0.01], (frames, 5))
+    for pitch, roll, heading, alt, speed in (noise + [2, -1, 90.5, 12.5, 0.3]).tolist():
+        widgets[0].setPitchRoll(pitch, roll)
+        widgets[1].setHeading(heading)
+        widgets[2].setAltitude(alt)
+        widgets[3].setAirspeed(speed)
+        app.processEvents()
+    print(f"hover, {frames} updates, threshold {threshold} px")
+    for w in widgets:
+        print(f"  {type(w).__name__:24s} paints {w.paints:6d}   suppressed {w.suppressed:6d}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--frames", type=int, default=500)
+    ap.add_argument("--size", type=int, default=300)
+    ap.add_argument("--hover", type=int, default=1000)
+    ap.add_argument("--threshold", type=float, default=0.5)
+    args = ap.parse_args()
+
+    app = QApplication(sys.argv)
+    rng = np.random.default_rng(7)
+    attitudes = rng.uniform([-40, -60], [40, 60], (args.frames, 2)).tolist()
+    headings = rng.uniform(0, 360, args.frames).tolist()
+
+    def set_attitude(w, pose):
+        w.setPitchRoll(*pose)
+
+    def set_heading(w, heading):
+        w.setHeading(heading)
+
+    results = []
+    for name, new_cls, old_cls, poses, apply, checks in (
+        ("attitude", DroneAttitudeIndicator, LegacyAttitude, attitudes, set_attitude,
+         [(0, 0), (10, 0), (-20, 30), (35, -45)]),
+        ("heading", HeadingIndicator, LegacyHeading, headings, set_heading,
+         [0, 45, 91, 180, 359]),
+    ):
+        new, old = new_cls(), old_cls()
+        for w in (new, old):
+            w.resize(args.size, args.size if name == "attitude" else args.size // 3)
+        for pose in checks:
+            apply(new, pose)
+            apply(old, pose)
+            bad = mismatch(render(new), render(old))
+            assert bad < 0.02, f"{name} {pose}: {bad:.1%} of pixels differ"
+        old_ms = time_frames(old, poses, apply)
+        new_ms = time_frames(new, poses, apply)
+        new.resize(new.width() + 1, new.height())
+        t0 = time.perf_counter()
+        render(new)
+        rebuild_ms = (time.perf_counter() - t0) * 1e3
+        results.append((name, old_ms, new_ms, rebuild_ms))
+
+    print(f"{args.frames} frames at {args.size} px, ms per paint")
+    for name, old_ms, new_ms, rebuild_ms in results:
+        print(f"  {name:9s} full redraw {old_ms:7.3f}   cached {new_ms:7.3f}"
+              f"   (first paint after resize {rebuild_ms:7.3f})")
+
+    if args.hover:
+        hover(app, args.hover, args.threshold, args.size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#bench_live_plot.py
+
+"""Per-frame cost of ``MotorCurrentVisualization.update_plot``: full redraw vs incremental.
+
+Usage (from ``my_drone_dashboard``)::
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_live_plot.py --buffer 100000 --batch 10
+
+A real :class:`DataHandler` store is filled with synthetic samples; each
+frame appends ``--batch`` samples and updates the four time-series plots
+(the bar chart is left out).  The legacy path (``setData`` over the whole
+buffer + ``min``/``max`` over it) is replayed for comparison.  After
+every frame the incremental vertex buffers and rolling min/max are
+checked against the store.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from benchmarks.synthetic import flight_rows  # noqa: E402
+from config_manager import DEFAULT_CONFIG  # noqa: E402
+from data_handler import DataHandler  # noqa: E402
+from ui.blocks import MotorCurrentVisualization  # noqa: E402
+
+
+def legacy_update(widget: MotorCurrentVisualization) -> None:
+    """The time-series part of update_plot before the incremental path."""
+    dh = widget.data_handler
+    step = max(1, round(widget.frequency / 200))
+    times = dh.time_buffer[::step]
+    for i, curve in enumerate(widget.curves):
+        data = dh.motor_currents[i][::step]
+        curve.setData(times[:len(data)], data)
+        widget.plots[i].setXRange(times[-1] - 20, times[-1])
+        a, mi, ma = widget.stats[i]
+        a.setText(f"Actual: {data[-1]:.2f} A")
+        mi.setText(f"Min:    {data.min():.2f} A")
+        ma.setText(f"Max:    {data.max():.2f} A")
+
+
+def check(widget: MotorCurrentVisualization) -> None:
+    store = widget.data_handler.store
+    idx = np.arange(store.total - len(store), store.total)
+    keep = idx % widget._step == 0
+    for i, buf in enumerate(widget.buffers):
+        want = store.column(f"motor{i+1}_current")[keep][-buf.capacity:]
+        assert np.array_equal(buf.y, want), i
+        assert np.array_equal(buf.x, store.column("time")[keep][-buf.capacity:])
+        rng = widget.ranges[i]
+        assert rng.min == want.min() and rng.max == want.max()
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--buffer", type=int, default=100_000)
+    ap.add_argument("--batch", type=int, default=10)
+    ap.add_argument("--frames", type=int, default=300)
+    args = ap.parse_args()
+
+    app = QApplication(sys.argv)  # noqa: F841
+    config = dict(DEFAULT_CONFIG, arduino_port="", buffer_size=args.buffer)
+    dh = DataHandler(config)
+    widget = MotorCurrentVisualization(dh)   # redrawn by hand below, as the RenderScheduler would
+
+    _, rows = flight_rows(args.buffer + args.frames * args.batch * 2, 100.0)
+    rows[:, 1:5] = np.random.default_rng(3).normal(2.5, 1.0, (len(rows), 4))
+    dh.store.extend(rows[:args.buffer])
+    pos = args.buffer
+
+    def run(update, frequency, verify):
+        nonlocal pos
+        widget.frequency = frequency
+        update(widget)
+        spent = 0.0
+        for _ in range(args.frames):
+            dh.store.extend(rows[pos:pos + args.batch])
+            pos += args.batch
+            t0 = time.perf_counter()
+            update(widget)
+            spent += time.perf_counter() - t0
+            if verify:
+                check(widget)
+        return spent / args.frames * 1e3
+
+    inc = run(MotorCurrentVisualization._update_curves, 200, True)
+    inc5 = run(MotorCurrentVisualization._update_curves, 1000, True)
+    pos = args.buffer
+    old = run(legacy_update, 200, False)
+
+    print(f"buffer {args.buffer} samples, {args.batch} new per frame, 4 motors")
+    print(f"  full redraw     : {old:8.3f} ms/frame")
+    print(f"  incremental     : {inc:8.3f} ms/frame")
+    print(f"  incremental 1:5 : {inc5:8.3f} ms/frame (1000 ms setting, every 5th sample)")
+
+
+if __name__ == "__main__":
+    main()
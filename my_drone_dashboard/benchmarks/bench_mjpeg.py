@@ -0,0 +1,154 @@
+#bench_mjpeg.py
+
+"""MJPEG tile decode cost: full decode + resize vs IMREAD_REDUCED decode.
+
+Usage (from ``my_drone_dashboard``)::
+
+    python benchmarks/bench_mjpeg.py --frames 100 --width 1920 --height 1080
+
+For each tile size, one JPEG frame is decoded at full resolution and
+downscaled with ``INTER_AREA`` (the previous path), then decoded at the
+factor :func:`mjpeg_stream.reduction_for` picks and downscaled from there.
+Both results must agree to within a few grey levels.
+
+The stream check then serves the frame as ``multipart/x-mixed-replace``
+from a local HTTP server (parts with and without ``Content-Length``) and
+reads it through :class:`CameraCapture` with :class:`MjpegStream`.  A
+stream with an undecodable part every few frames must lose only those
+parts, on the same connection.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from benchmarks.synthetic import jpeg_frame  # noqa: E402
+from camera_capture import CameraCapture, fit_size  # noqa: E402
+from mjpeg_stream import REDUCED_FLAGS, jpeg_size, reduction_for  # noqa: E402
+
+TILES = [(960, 540), (640, 360), (320, 180), (160, 90)]
+
+
+def timed(fn, frames):
+    t0 = time.perf_counter()
+    for _ in range(frames):
+        out = fn()
+    return (time.perf_counter() - t0) / frames * 1e3, out
+
+
+CORRUPT = b"\xff\xd8" + bytes(500)   # JPEG start marker, then nothing decodable
+
+
+def serve(jpeg: bytes, frames: int, with_length: bool, corrupt_every: int = 0) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.server.requests += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "multipart/x-mixed-replace; boundary=frame")
+            self.end_headers()
+            for i in range(frames):
+                part = CORRUPT if corrupt_every and i % corrupt_every == corrupt_every - 1 else jpeg
+                head = b"--frame\r\nContent-Type: image/jpeg\r\n"
+                if with_length:
+                    head += b"Content-Length: %d\r\n" % len(part)
+                self.wfile.write(head + b"\r\n" + part + b"\r\n")
+            self.wfile.write(b"--frame--\r\n")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stream_check(jpeg: bytes, frames: int, with_length: bool, tile) -> CameraCapture:
+    server = serve(jpeg, frames, with_length)
+    capture = CameraCapture(f"http://127.0.0.1:{server.server_port}/video", reconnect_delay=60)
+    capture.target_size = tile
+    capture.start()
+    got = 0
+    end = time.monotonic() + 30
+    while capture.stats.errors == 0 and time.monotonic() < end:
+        if capture.latest() is not None:
+            got += 1
+        time.sleep(0.001)
+    capture.stop()
+    server.shutdown()
+    s = capture.stats
+    assert s.frames == frames, (s.frames, frames)
+    return capture
+
+
+def corrupt_check(jpeg: bytes, frames: int, every: int) -> CameraCapture:
+    server = serve(jpeg, frames, True, corrupt_every=every)
+    capture = CameraCapture(f"http://127.0.0.1:{server.server_port}/video", reconnect_delay=60)
+    capture.start()
+    end = time.monotonic() + 30
+    while capture.stats.state != "error" and time.monotonic() < end:   # set when the stream ends
+        capture.latest()
+        time.sleep(0.001)
+    capture.stop()
+    server.shutdown()
+    bad = frames // every
+    s = capture.stats
+    assert s.frames == frames - bad and s.errors == bad + 1, (s.frames, s.errors)
+    assert server.requests == 1, server.requests
+    return capture
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--frames", type=int, default=100)
+    ap.add_argument("--width", type=int, default=1920)
+    ap.add_argument("--height", type=int, default=1080)
+    ap.add_argument("--noise", type=int, default=8, help="sensor noise amplitude (grey levels)")
+    args = ap.parse_args()
+
+    jpeg = jpeg_frame(args.width, args.height, noise=args.noise)
+    buf = np.frombuffer(jpeg, np.uint8)
+    assert jpeg_size(jpeg) == (args.width, args.height)
+
+    print(f"{args.width}x{args.height} JPEG ({len(jpeg) // 1024} KiB), ms per frame")
+    print(f"  {'tile':>9s} {'full+resize':>12s} {'reduced+resize':>15s} {'factor':>7s} {'speedup':>8s}")
+    for tile in TILES:
+        out = fit_size(args.width, args.height, tile)
+        factor = reduction_for((args.width, args.height), tile)
+
+        def full():
+            return cv2.resize(cv2.imdecode(buf, cv2.IMREAD_COLOR), out, interpolation=cv2.INTER_AREA)
+
+        def reduced():
+            img = cv2.imdecode(buf, REDUCED_FLAGS[factor])
+            assert img.shape[1] >= out[0] and img.shape[0] >= out[1]
+            return cv2.resize(img, out, interpolation=cv2.INTER_AREA)
+
+        t_full, a = timed(full, args.frames)
+        t_red, b = timed(reduced, args.frames)
+        err = np.abs(a.astype(int) - b.astype(int)).mean()
+        assert err < 4.0, f"{tile}: reduced decode differs by {err:.2f}"
+        print(f"  {tile[0]:4d}x{tile[1]:<4d} {t_full:12.2f} {t_red:15.2f} {'1/%d' % factor:>7s} {t_full / t_red:7.1f}x")
+
+    for with_length in (True, False):
+        c = stream_check(jpeg, 50, with_length, TILES[2])
+        s = c.stats
+        print(f"  stream ({'Content-Length' if with_length else 'boundary scan'}): {s.frames} frames,"
+              f" decode {s.decode_ms:5.2f} ms at 1/{s.reduction}, grab {s.grab_ms:5.2f} ms")
+    s = corrupt_check(jpeg, 50, 5).stats
+    print(f"  stream (corrupt parts): {s.frames} frames, {s.errors - 1} undecodable parts skipped"
+          f" on one connection")
+
+
+if __name__ == "__main__":
+    main()
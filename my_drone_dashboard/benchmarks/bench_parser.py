@@ -0,0 +1,183 @@
+#bench_parser.py
+
+"""Check the telemetry parser against the corpus, fuzz it, and time it.
+
+Usage (from ``my_drone_dashboard``)::
+
+    python benchmarks/bench_parser.py --lines 50000
+
+The corpus and a seeded mutation fuzzer run first (exit code 1 on any
+mismatch or exception), then ns/line is reported for the legacy
+split-based parser and for :class:`telemetry_parser.TelemetryParser`.
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.parser_corpus import CORPUS  # noqa: E402
+from benchmarks.synthetic import arduino_line  # noqa: E402
+from telemetry_parser import TelemetryParser, RX, PWM, ANG, CUR  # noqa: E402
+
+
+def legacy_parse(text: str, latest: dict, num_motors: int = 4) -> None:
+    """The pre-parser ``DataHandler._parse_line`` body, kept for comparison."""
+    try:
+        parts = text.split("|")
+        if parts and "Rx:" in parts[0]:
+            recv = []
+            for tag in ["Y:", "P:", "T:", "R:"]:
+                for tok in parts[0].split():
+                    if tok.startswith(tag):
+                        recv.append(int(tok.replace(tag, "")))
+                        break
+            if len(recv) == 4:
+                latest["receiver"] = recv
+        if len(parts) > 3 and "PWM:" in parts[3]:
+            pwm = []
+            for i in range(num_motors):
+                label = f"M{i+1}:"
+                for tok in parts[3].split():
+                    if tok.startswith(label):
+                        pwm.append(int(tok.replace(label, "")))
+                        break
+            if len(pwm) == num_motors:
+                latest["motor_pwm"] = pwm
+        if len(parts) > 4 and "Ang:" in parts[4]:
+            for axis, key in zip(["X:", "Y:", "Z:"], ["roll", "pitch", "yaw"]):
+                for tok in parts[4].split():
+                    if tok.startswith(axis):
+                        latest[key] = float(tok.replace(axis, ""))
+                        break
+        if len(parts) > 5 and "Current:" in parts[5]:
+            curr = []
+            for i in range(num_motors):
+                label = f"M{i+1}:"
+                for tok in parts[5].split():
+                    if tok.startswith(label):
+                        curr.append(float(tok.replace(label, "")))
+                        break
+            if len(curr) == num_motors:
+                latest["motor_currents"] = curr
+    except Exception:
+        pass
+
+
+def _same(a, b) -> bool:
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b or (isinstance(a, float) and math.isnan(a) and math.isnan(b))
+
+
+def check_corpus() -> int:
+    failures = 0
+    for line, expected in CORPUS:
+        p = TelemetryParser(4)
+        rec = p.record
+        mask = p.parse(line)
+        got = {}
+        if mask & RX:
+            got["rx"] = rec.receiver
+        if mask & PWM:
+            got["pwm"] = rec.motor_pwm
+        if mask & CUR:
+            got["cur"] = rec.motor_currents
+        want_ang = expected.get("ang", {})
+        ang_ok = all(_same(getattr(rec, k), want_ang.get(k, 0.0)) for k in ("roll", "pitch", "yaw"))
+        ok = (ang_ok and bool(mask & ANG) == bool(want_ang)
+              and all(_same(got.get(k), expected.get(k)) for k in ("rx", "pwm", "cur")))
+        if not ok:
+            failures += 1
+            print(f"MISMATCH {line!r}: mask={mask} got={got} ang={(rec.roll, rec.pitch, rec.yaw)}")
+    return failures
+
+
+def fuzz(iterations: int, seed: int = 1) -> int:
+    """Mutate real lines; the parser must never raise and must agree with the
+    legacy parser on every line the canonical regex accepts."""
+    rng = random.Random(seed)
+    failures = 0
+    for i in range(iterations):
+        raw = bytearray(arduino_line(rng.randrange(100000)).encode())
+        for _ in range(rng.randrange(4)):
+            if not raw:
+                break
+            op = rng.randrange(4)
+            pos = rng.randrange(len(raw))
+            if op == 0:
+                del raw[pos:pos + rng.randrange(1, 8)]
+            elif op == 1:
+                raw[pos] = rng.randrange(256)
+            elif op == 2:
+                raw[pos:pos] = bytes(rng.choice(b"|: -.0123456789MXYZ") for _ in range(3))
+            else:
+                del raw[pos:]
+        p = TelemetryParser(4)
+        try:
+            p.parse(bytes(raw))
+        except Exception as exc:
+            failures += 1
+            print(f"EXCEPTION on {bytes(raw)!r}: {exc}")
+            continue
+        if p.lines_fast:
+            latest = {}
+            legacy_parse(raw.decode(errors="ignore"), latest)
+            rec = p.record
+            if not (_same(latest.get("receiver"), rec.receiver)
+                    and _same(latest.get("motor_pwm"), rec.motor_pwm)
+                    and _same(latest.get("motor_currents"), rec.motor_currents)
+                    and _same([latest.get(k) for k in ("roll", "pitch", "yaw")],
+                              [rec.roll, rec.pitch, rec.yaw])):
+                failures += 1
+                print(f"LEGACY DISAGREES on {bytes(raw)!r}")
+    return failures
+
+
+def bench(n_lines: int) -> None:
+    lines = [arduino_line(i) for i in range(n_lines)]
+    blines = [ln.encode() for ln in lines]
+
+    latest: dict = {}
+    t0 = time.perf_counter_ns()
+    for ln in lines:
+        legacy_parse(ln, latest)
+    legacy_ns = (time.perf_counter_ns() - t0) / n_lines
+
+    parser = TelemetryParser(4)
+    t0 = time.perf_counter_ns()
+    for ln in blines:
+        parser.parse(ln)
+    new_ns = (time.perf_counter_ns() - t0) / n_lines
+
+    shuffled = [b"|".join(reversed(ln.split(b"|"))) for ln in blines]
+    parser = TelemetryParser(4)
+    t0 = time.perf_counter_ns()
+    for ln in shuffled:
+        parser.parse(ln)
+    fallback_ns = (time.perf_counter_ns() - t0) / n_lines
+
+    print(f"legacy split parser : {legacy_ns:8.0f} ns/line")
+    print(f"compiled parser     : {new_ns:8.0f} ns/line  ({legacy_ns / new_ns:.1f}x)")
+    print(f"  tolerant fallback : {fallback_ns:8.0f} ns/line")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--lines", type=int, default=50000)
+    ap.add_argument("--fuzz", type=int, default=20000)
+    args = ap.parse_args()
+
+    failures = check_corpus() + fuzz(args.fuzz)
+    print(f"corpus: {len(CORPUS)} lines, fuzz: {args.fuzz} mutations, failures: {failures}")
+    if failures:
+        sys.exit(1)
+    bench(args.lines)
+
+
+if __name__ == "__main__":
+    main()
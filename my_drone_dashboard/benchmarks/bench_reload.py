@@ -0,0 +1,152 @@
+#bench_reload.py
+
+"""Time reopening a flight log: memory-mapped ``.qcol`` vs. the Excel file.
+
+Usage (from ``my_drone_dashboard``)::
+
+    python benchmarks/bench_reload.py --minutes 60 --rate 100 --excel-samples 20000
+
+The columnar log is written through :class:`flight_recorder.FlightRecorder`
+and :func:`flight_log.finalize_log`, exactly as at the end of a flight.
+Writing Excel files is slow, so the Excel path is timed on a shorter
+flight and scaled per sample.  Range queries are checked against boolean
+masks over the whole time column (the old partial-reload path) on random
+ranges, then both are timed.  The min/max pyramid must reproduce the
+exact extremes of random ranges.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from benchmarks.synthetic import flight_rows  # noqa: E402
+from flight_lod import LodPyramid  # noqa: E402
+from flight_log import FlightLog, export_excel, finalize_log  # noqa: E402
+from flight_recorder import FlightRecorder  # noqa: E402
+
+
+def record(path: str, columns, rows: np.ndarray) -> str:
+    rec = FlightRecorder(path, columns, flush_interval=3600)
+    rec.start()
+    for block in np.array_split(rows, max(1, len(rows) // 1000)):
+        rec.append(block)
+    rec.stop()
+    return finalize_log(path)
+
+
+def check_queries(log: FlightLog, t: np.ndarray, trials: int = 2000):
+    """Compare query/tail/slice with the mask they replace; return timings."""
+    rng = np.random.default_rng(1)
+    span = t[-1] - t[0]
+    for _ in range(trials):
+        t0, t1 = np.sort(rng.uniform(t[0] - 1, t[-1] + 1, 2))
+        if rng.random() < 0.2:          # land exactly on a sample
+            t0 = t[rng.integers(len(t))]
+        rows = np.flatnonzero((t >= t0) & (t <= t1))
+        got = log.query(t0, t1)
+        assert len(got) == len(rows) and (not len(rows) or got.start == rows[0]), (t0, t1)
+
+        seconds = rng.uniform(0, span * 1.1)
+        assert len(log.tail(seconds)) == int((t >= t[-1] - seconds).sum())
+
+        i0, i1 = rng.integers(-len(t) - 5, len(t) + 5, 2)
+        assert np.array_equal(log.slice(i0, i1).time, t[i0:i1])
+
+    mid = t[len(t) // 2]
+    reps = 200
+    t_start = time.perf_counter()
+    for _ in range(reps):
+        log.query(mid, mid + 10).time
+    query_us = (time.perf_counter() - t_start) / reps * 1e6
+    t_start = time.perf_counter()
+    for _ in range(reps // 10):
+        np.flatnonzero((log.time >= mid) & (log.time <= mid + 10))
+    mask_us = (time.perf_counter() - t_start) / (reps // 10) * 1e6
+    return query_us, mask_us
+
+
+def check_envelope(log: FlightLog, trials: int = 500):
+    """Envelope extremes must equal the raw extremes; return timings."""
+    t_start = time.perf_counter()
+    LodPyramid.build(log, log.columns)
+    lod_s = time.perf_counter() - t_start
+
+    rng = np.random.default_rng(2)
+    t, y = log.time, log["motor2_current"]
+    for _ in range(trials):
+        i0, i1 = np.sort(rng.integers(0, len(t), 2))
+        i1 += 1
+        _, env = log.envelope("motor2_current", t[i0], t[i1 - 1], int(rng.integers(50, 4000)))
+        j0, j1 = max(0, log.search(t[i0]) - 1), log.search(t[i1 - 1], "right") + 1
+        assert env.min() == y[j0:j1].min() and env.max() == y[j0:j1].max()
+
+        # a slice ending mid-bin must not pull in samples beyond its bounds
+        part = log.slice(i0, i1)
+        x, env = part.envelope("motor2_current", t[0], t[-1], 50)
+        assert env.min() == y[i0:i1].min() and env.max() == y[i0:i1].max()
+        assert t[i0] <= x.min() and x.max() <= t[i1 - 1]
+
+    t_start = time.perf_counter()
+    x, _ = log.envelope("motor2_current", t[0], t[-1], 2 * 1920)
+    envelope_ms = (time.perf_counter() - t_start) * 1e3
+    assert len(x) <= 2 * 1920
+    return lod_s, envelope_ms
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--minutes", type=float, default=60)
+    ap.add_argument("--rate", type=float, default=100)
+    ap.add_argument("--excel-samples", type=int, default=20000)
+    args = ap.parse_args()
+    n = int(args.minutes * 60 * args.rate)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        columns, rows = flight_rows(n, args.rate)
+        qcol = record(os.path.join(tmp, "flight.qlog"), columns, rows)
+        size_mb = os.path.getsize(qcol) / 1e6
+
+        t0 = time.perf_counter()
+        log = FlightLog(qcol)
+        tail = float(log["motor1_current"][-1000:].mean())
+        open_ms = (time.perf_counter() - t0) * 1e3
+
+        t0 = time.perf_counter()
+        total = sum(float(log[c].sum()) for c in log.columns)
+        scan_ms = (time.perf_counter() - t0) * 1e3
+        assert np.array_equal(log["roll"], rows[:, columns.index("roll")])
+        assert np.isfinite(tail + total)
+
+        query_us, mask_us = check_queries(log, rows[:, 0])
+        lod_s, envelope_ms = check_envelope(log)
+
+        small = os.path.join(tmp, "small.qlog")
+        xlsx = os.path.join(tmp, "flight.xlsx")
+        export_excel(record(small, columns, rows[:args.excel_samples]), xlsx)
+        t0 = time.perf_counter()
+        df = pd.read_excel(xlsx)
+        df["Timestamp"] = pd.to_datetime(df["Timestamp"], format="%Y-%m-%d %H:%M:%S.%f")
+        excel_s = time.perf_counter() - t0
+        excel_est = excel_s / len(df) * n
+
+    print(f"flight: {n} samples x {len(columns)} channels ({size_mb:.1f} MB)")
+    print(f".qcol open + last 1000 samples : {open_ms:8.2f} ms")
+    print(f".qcol scan of every channel    : {scan_ms:8.2f} ms")
+    print(f".qcol query(t0, t1), 10 s      : {query_us:8.1f} us  "
+          f"(boolean mask: {mask_us:.0f} us)")
+    print(f"pyramid build (all channels)   : {lod_s * 1e3:8.0f} ms")
+    print(f"full-flight envelope, 1920 px  : {envelope_ms:8.2f} ms")
+    print(f"{f'Excel read ({len(df)} samples)':31s}: {excel_s * 1e3:8.0f} ms  "
+          f"-> ~{excel_est:.0f} s for the full flight")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#bench_serial_ingest.py
+
+"""Replay a synthetic Arduino stream through a pty and compare ingestion loops.
+
+Usage (from ``my_drone_dashboard``)::
+
+    python benchmarks/bench_serial_ingest.py --lines 20000
+
+Reports lines per second and reader CPU time per line for the legacy
+byte-at-a-time loop and for :class:`serial_ingest.SerialIngestor`.
+Only ingestion is measured; parsed frames are merely counted.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import tty
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import serial  # noqa: E402
+
+from benchmarks.synthetic import arduino_stream  # noqa: E402
+from serial_ingest import SerialIngestor  # noqa: E402
+
+
+def _writer(fd: int, payload: bytes) -> None:
+    view = memoryview(payload)
+    while view:
+        n = os.write(fd, view[:4096])
+        view = view[n:]
+
+
+def legacy_loop(dev, n_lines: int, deadline: float) -> int:
+    """The pre-ingestor ``DataHandler._read_loop`` (parser replaced by a counter)."""
+    count = 0
+    line = ""
+    while count < n_lines and time.monotonic() < deadline:
+        if dev.in_waiting:
+            ch = dev.read(1).decode(errors="ignore")
+            if ch == "\n":
+                count += 1
+                line = ""
+            else:
+                line += ch
+    return count
+
+
+def ingestor_loop(dev, n_lines: int, deadline: float) -> int:
+    count = 0
+
+    def on_frames(frames, binary):
+        nonlocal count
+        count += len(frames)
+
+    ingestor = SerialIngestor(dev, on_frames)
+    while count < n_lines and time.monotonic() < deadline:
+        ingestor.poll()
+    return count
+
+
+def run(loop, n_lines: int, timeout: float) -> dict:
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    dev = serial.Serial(os.ttyname(slave), baudrate=921600, timeout=0.05)
+    payload = arduino_stream(n_lines)
+
+    writer = threading.Thread(target=_writer, args=(master, payload), daemon=True)
+    wall0, cpu0 = time.perf_counter(), time.thread_time()
+    writer.start()
+    got = loop(dev, n_lines, time.monotonic() + timeout)
+    wall, cpu = time.perf_counter() - wall0, time.thread_time() - cpu0
+
+    dev.close()
+    os.close(master)
+    os.close(slave)
+    return {
+        "lines": got,
+        "bytes": len(payload),
+        "lines_per_s": got / wall if wall else 0.0,
+        "cpu_us_per_line": 1e6 * cpu / got if got else float("nan"),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--lines", type=int, default=20000)
+    ap.add_argument("--timeout", type=float, default=60.0)
+    args = ap.parse_args()
+
+    for name, loop in (("legacy byte loop", legacy_loop), ("bulk ingestor", ingestor_loop)):
+        r = run(loop, args.lines, args.timeout)
+        print(f"{name:>18}: {r['lines']:>7d} lines  {r['lines_per_s']:>10.0f} lines/s  "
+              f"{r['cpu_us_per_line']:>8.2f} us CPU/line")
+
+
+if __name__ == "__main__":
+    main()
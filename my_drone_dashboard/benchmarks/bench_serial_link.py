@@ -0,0 +1,267 @@
+#bench_serial_link.py
+
+"""GUI stalls while connecting, and recovery of the background serial link.
+
+Usage (from ``my_drone_dashboard``)::
+
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_serial_link.py --reset-delay 2
+
+A fake Arduino serves synthetic telemetry lines over TCP, opened through
+pyserial's ``socket://`` URL.  Six checks:
+
+* connect: a 10 ms ``QTimer`` runs while :class:`DataHandler` starts and
+  the link waits out the board reset; the longest gap between ticks is
+  the GUI stall (the old ``connect_to_arduino`` slept ``--reset-delay``
+  seconds on the GUI thread);
+* glitch: the fake Arduino drops the connection; samples must resume
+  after the reconnect without any call from the GUI;
+* backoff: retry delays against a port that does not exist must double
+  up to the cap;
+* flapping: a port that opens and drops before sending a frame must back
+  off the same way, not retry at the initial delay forever;
+* stop: :meth:`DataHandler.stop` must return at once and no sample may
+  arrive after it; a worker hung in the driver must neither block
+  ``configure()`` nor overlap with the worker it starts next;
+* hot-plug: the port (a pty behind a symlink) appears while the link is
+  backing off for a long time, and must be opened on the next
+  ``list_ports`` scan rather than after the backoff step.
+"""
+
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import tty
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QTimer  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+import serial  # noqa: E402
+import serial_link  # noqa: E402
+from benchmarks.synthetic import arduino_stream  # noqa: E402
+from config_manager import DEFAULT_CONFIG  # noqa: E402
+from data_handler import DataHandler  # noqa: E402
+from serial_link import CONNECTED, SerialLink  # noqa: E402
+
+
+class FakeArduino:
+    """TCP server streaming telemetry lines at *rate_hz* to whoever connects."""
+
+    def __init__(self, rate_hz: float = 100.0) -> None:
+        self.period = 1.0 / rate_hz
+        self.lines = arduino_stream(1000).splitlines(keepends=True)
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.port = self.server.getsockname()[1]
+        self.client = None
+        self.connections = 0
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self) -> None:
+        while True:
+            client, _ = self.server.accept()
+            self.client, self.connections = client, self.connections + 1
+            try:
+                i = 0
+                while self.client is client:
+                    client.sendall(self.lines[i % len(self.lines)])
+                    i += 1
+                    time.sleep(self.period)
+            except OSError:
+                pass
+            client.close()
+
+    def drop(self) -> None:
+        """Cut the current connection, like a cable glitch."""
+        client, self.client = self.client, None
+        if client is not None:
+            client.shutdown(socket.SHUT_RDWR)
+
+
+def spin(app: QApplication, until, timeout: float) -> float:
+    """Process events until *until()* is true; returns the time it took."""
+    t0 = time.monotonic()
+    while not until():
+        assert time.monotonic() - t0 < timeout, "timed out"
+        app.processEvents()
+        time.sleep(0.005)
+    return time.monotonic() - t0
+
+
+def connect_check(app: QApplication, arduino: FakeArduino, reset_delay: float) -> DataHandler:
+    config = dict(DEFAULT_CONFIG, arduino_port=f"socket://127.0.0.1:{arduino.port}",
+                  sampling_mode="stream", log_dir=tempfile.mkdtemp())
+    handler = DataHandler(config)
+    handler.serial_link.reset_delay = reset_delay
+    states = []
+    handler.connectionChanged.connect(lambda state, detail: states.append(state))
+
+    gaps, last = [0.0], [time.perf_counter()]
+
+    def tick():
+        now = time.perf_counter()
+        gaps.append(now - last[0])
+        last[0] = now
+
+    ticker = QTimer()
+    ticker.timeout.connect(tick)
+    ticker.start(10)
+    t0 = time.perf_counter()
+    handler.start()
+    start_ms = (time.perf_counter() - t0) * 1e3
+    took = spin(app, lambda: len(handler.store) > 10, reset_delay + 10)
+    ticker.stop()
+    assert states[:2] == ["connecting", "connected"], states
+    print(f"connect: start() returned in {start_ms:.1f} ms, samples after {took:.2f} s,"
+          f" longest GUI gap {max(gaps) * 1e3:.0f} ms (previously {reset_delay * 1e3:.0f} ms blocked)")
+    assert max(gaps) < 0.25, max(gaps)
+    return handler
+
+
+def glitch_check(app: QApplication, handler: DataHandler, arduino: FakeArduino) -> None:
+    before = len(handler.store)
+    arduino.drop()
+    spin(app, lambda: not handler.serial_connected, 5)
+    took = spin(app, lambda: handler.serial_connected and len(handler.store) > before + 10,
+                handler.serial_link.reset_delay + 10)
+    assert arduino.connections == 2, arduino.connections
+    print(f"glitch:  reconnected and sampling again after {took:.2f} s"
+          f" ({handler.serial_link.connects} connects)")
+
+
+def stop_check(app: QApplication, handler: DataHandler) -> None:
+    t0 = time.perf_counter()
+    handler.stop()
+    took = time.perf_counter() - t0
+    rows = len(handler.store)
+    end = time.monotonic() + handler.serial_link.read_timeout + 0.2
+    spin(app, lambda: time.monotonic() >= end, 5)
+    print(f"stop:    returned in {took * 1e3:.1f} ms, {len(handler.store) - rows} samples after it")
+    assert len(handler.store) == rows and took < 0.05, (len(handler.store), rows, took)
+
+
+def backoff_check(app: QApplication, cap: float) -> None:
+    link = SerialLink("/dev/tty-does-not-exist", 115200, lambda frames, binary: None,
+                      backoff_initial=0.1, backoff_max=cap)
+    delays = retry_delays(app, link, 0.1 + 0.2 + 0.4 + cap * 2 + 0.2)
+    print(f"backoff: retry delays {delays} s (cap {cap} s)")
+    assert delays[:3] == [0.1, 0.2, 0.4] and max(delays) <= cap + 0.1, delays
+
+
+def retry_delays(app: QApplication, link: SerialLink, seconds: float, since: str = "connecting"):
+    """Run *link* for *seconds*; gaps from each *since* state to the next attempt."""
+    marks, delays = [], []
+
+    def on_state(state, detail):
+        now = time.monotonic()
+        if state == "connecting" and marks:
+            delays.append(round(now - marks.pop(), 1))
+        if state == since:
+            marks[:] = [now]
+
+    link.stateChanged.connect(on_state)
+    link.start()
+    end = time.monotonic() + seconds
+    spin(app, lambda: time.monotonic() >= end, 30)   # state changes are queued to this thread
+    link.stop()
+    return delays
+
+
+def flapping_check(app: QApplication) -> None:
+    server = socket.create_server(("127.0.0.1", 0))
+
+    def hang_up():
+        while True:
+            server.accept()[0].close()   # accepts, then drops before any frame
+
+    threading.Thread(target=hang_up, daemon=True).start()
+    link = SerialLink(f"socket://127.0.0.1:{server.getsockname()[1]}", 115200,
+                      lambda frames, binary: None, reset_delay=0.0,
+                      backoff_initial=0.1, backoff_max=0.8)
+    delays = retry_delays(app, link, 3.0, since="reconnecting")   # drops are seen after a read
+    print(f"flapping: retry delays {delays} s after {link.connects} short-lived connects")
+    assert delays[:3] == [0.1, 0.2, 0.4], delays
+
+
+def stuck_stop_check(app: QApplication) -> None:
+    real_open = serial.serial_for_url
+    release, busy = threading.Event(), threading.Event()
+    opens, overlaps = [], []
+
+    def hung_open(url, **kwargs):
+        overlaps.append(busy.is_set())
+        opens.append(url)
+        if len(opens) == 1:
+            busy.set()
+            release.wait()   # a driver that hangs in open() well past stop()'s timeout
+            busy.clear()
+            raise serial.SerialException("device went away")
+        return real_open("loop://", **kwargs)
+
+    serial.serial_for_url = hung_open
+    try:
+        link = SerialLink("loop://", 115200, lambda frames, binary: None, reset_delay=0.0)
+        link.start()
+        spin(app, lambda: opens, 5)
+        t0 = time.monotonic()
+        link.configure("loop://", 57600)   # stops the hung worker and starts a new one
+        took = time.monotonic() - t0
+        end = time.monotonic() + 0.5
+        spin(app, lambda: time.monotonic() >= end, 5)
+        assert len(opens) == 1 and link.state == "connecting", (opens, link.state)
+        release.set()
+        spin(app, lambda: link.state == CONNECTED, 5)
+        link.stop()
+    finally:
+        serial.serial_for_url = real_open
+    print(f"stuck stop: configure() returned after {took * 1e3:.1f} ms, new worker opened the port"
+          f" only after the old one exited ({len(opens)} opens)")
+    assert not any(overlaps), overlaps
+    assert took < 0.05, took
+
+
+def hotplug_check(app: QApplication) -> None:
+    master, slave = os.openpty()
+    tty.setraw(slave)
+    port = os.path.join(tempfile.mkdtemp(), "ttyDRONE")
+    present = set()
+    serial_link.available_ports = lambda: set(present)   # stands in for list_ports
+    link = SerialLink(port, 115200, lambda frames, binary: None, reset_delay=0.0,
+                      backoff_initial=60.0, backoff_max=60.0)
+    link.start()
+    spin(app, lambda: link.state == "waiting", 5)
+    os.symlink(os.ttyname(slave), port)
+    present.add(os.ttyname(slave))
+    took = spin(app, lambda: link.state == CONNECTED, 5)
+    link.stop()
+    os.close(master)
+    os.close(slave)
+    print(f"hotplug: port opened {took:.2f} s after it appeared (backoff step was 60 s)")
+    assert took < 1.0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--reset-delay", type=float, default=2.0, help="board reset wait after opening")
+    ap.add_argument("--backoff-cap", type=float, default=0.8)
+    args = ap.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    arduino = FakeArduino()
+    handler = connect_check(app, arduino, args.reset_delay)
+    glitch_check(app, handler, arduino)
+    stop_check(app, handler)
+    backoff_check(app, args.backoff_cap)
+    flapping_check(app)
+    stuck_stop_check(app)
+    hotplug_check(app)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+#bench_timestamps.py
+
+"""Per-million-row cost of timestamp conversion on the export and reload paths.
+
+Usage (from ``my_drone_dashboard``)::
+
+    python benchmarks/bench_timestamps.py --rows 1000000 --excel-rows 20000
+
+Legacy loops (``datetime.fromtimestamp(...).strftime`` per row on export,
+``to_pydatetime().timestamp()`` per row on reload) are compared with the
+vectorized helpers in :mod:`utils.timestamps` and must give identical
+strings / timestamps.  The native reload path keeps ``float64`` epoch
+seconds and converts nothing.  A full Excel round trip through
+:func:`flight_log.export_excel` / :func:`flight_log.import_excel` is timed
+on ``--excel-rows`` (openpyxl dominates) and checked for equality.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from benchmarks.synthetic import flight_rows  # noqa: E402
+from flight_log import FlightLog, export_excel, import_excel, write_columnar  # noqa: E402
+from utils.timestamps import EXCEL_FORMAT, format_epoch, parse_local  # noqa: E402
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def legacy_format(t):
+    return [datetime.fromtimestamp(ts).strftime(EXCEL_FORMAT) for ts in t]
+
+
+def legacy_parse(strings):
+    stamps = pd.to_datetime(pd.Series(strings), format=EXCEL_FORMAT).tolist()
+    return np.array([s.to_pydatetime().timestamp() for s in stamps])
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--excel-rows", type=int, default=20000)
+    args = ap.parse_args()
+    n = args.rows
+    per_m = 1e6 / n
+
+    columns, rows = flight_rows(n, t0=time.time())
+    t = rows[:, 0]
+
+    old_str, old_fmt_s = timed(legacy_format, t)
+    new_str, new_fmt_s = timed(format_epoch, t)
+    assert list(new_str) == old_str, "format_epoch differs from fromtimestamp/strftime"
+
+    old_t, old_parse_s = timed(legacy_parse, old_str)
+    new_t, new_parse_s = timed(parse_local, new_str)
+    assert np.array_equal(new_t, old_t) or np.abs(new_t - old_t).max() < 2e-6
+    assert np.abs(new_t - t).max() < 1e-6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        qcol = os.path.join(tmp, "flight.qcol")
+        write_columnar(qcol, columns, rows)
+        t0 = time.perf_counter()
+        native = float(FlightLog(qcol).time.sum())
+        native_s = time.perf_counter() - t0
+        assert native == float(t.sum())
+
+        m = min(args.excel_rows, n)
+        small = os.path.join(tmp, "small.qcol")
+        write_columnar(small, columns, rows[:m])
+        xlsx = os.path.join(tmp, "flight.xlsx")
+        _, export_s = timed(export_excel, small, xlsx)
+        back, import_s = timed(import_excel, xlsx, os.path.join(tmp, "back.qcol"))
+        log = FlightLog(back)
+        assert np.abs(log.time - t[:m]).max() < 1e-6
+        assert np.allclose(log["motor3_pwm"], rows[:m, columns.index("motor3_pwm")])
+
+    print(f"{n} rows, per million rows:")
+    print(f"  export  strftime loop   : {old_fmt_s * per_m:7.2f} s")
+    print(f"  export  format_epoch    : {new_fmt_s * per_m:7.2f} s")
+    print(f"  reload  to_pydatetime   : {old_parse_s * per_m:7.2f} s")
+    print(f"  reload  parse_local     : {new_parse_s * per_m:7.2f} s")
+    print(f"  reload  .qcol float64   : {native_s * per_m:7.4f} s (no conversion)")
+    print(f"Excel round trip ({m} rows), per million rows:")
+    print(f"  export_excel            : {export_s * 1e6 / m:7.1f} s")
+    print(f"  import_excel            : {import_s * 1e6 / m:7.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#parser_corpus.py
+
+"""Real and malformed Arduino lines with the sections each one should yield.
+
+Each entry is ``(line, expected)`` where *expected* maps the section name
+("rx", "pwm", "ang", "cur") to the values the parser must produce; missing
+sections must be left untouched.  Angles are listed per axis as
+``{"roll": .., "pitch": .., "yaw": ..}`` because they are applied per axis.
+"""
+
+CORPUS = [
+    # ── well-formed ---------------------------------------------------------
+    ("Rx: Y:1500 P:1500 T:1000 R:1500|Arm: 1|Mode: ANGLE|PWM: M1:1000 M2:1000 M3:1000 M4:1000"
+     "|Ang: X:0.00 Y:0.00 Z:0.00|Current: M1:0.000 M2:0.000 M3:0.000 M4:0.000",
+     {"rx": [1500, 1500, 1000, 1500], "pwm": [1000] * 4,
+      "ang": {"roll": 0.0, "pitch": 0.0, "yaw": 0.0}, "cur": [0.0] * 4}),
+    ("Rx: Y:1623 P:1411 T:1388 R:1502|Arm: 1|Mode: ANGLE|PWM: M1:1402 M2:1377 M3:1420 M4:1391"
+     "|Ang: X:-3.25 Y:12.50 Z:271.75|Current: M1:3.412 M2:3.118 M3:3.506 M4:3.207\r",
+     {"rx": [1623, 1411, 1388, 1502], "pwm": [1402, 1377, 1420, 1391],
+      "ang": {"roll": -3.25, "pitch": 12.5, "yaw": 271.75}, "cur": [3.412, 3.118, 3.506, 3.207]}),
+    ("  Rx:  Y:1500  P:1500  T:1000  R:1500 | x | y | PWM:  M1:1100  M2:1100  M3:1100  M4:1100 "
+     "| Ang:  X:1  Y:2  Z:3 | Current:  M1:1  M2:2  M3:3  M4:4 ",
+     {"rx": [1500, 1500, 1000, 1500], "pwm": [1100] * 4,
+      "ang": {"roll": 1.0, "pitch": 2.0, "yaw": 3.0}, "cur": [1.0, 2.0, 3.0, 4.0]}),
+    # sections out of order / shuffled tokens (tolerant path)
+    ("Rx: R:1500 T:1000 P:1490 Y:1510|a|b|PWM: M4:1004 M3:1003 M2:1002 M1:1001"
+     "|Ang: Z:90.0 Y:1.0 X:-1.0|Current: M2:0.2 M1:0.1 M4:0.4 M3:0.3",
+     {"rx": [1510, 1490, 1000, 1500], "pwm": [1001, 1002, 1003, 1004],
+      "ang": {"roll": -1.0, "pitch": 1.0, "yaw": 90.0}, "cur": [0.1, 0.2, 0.3, 0.4]}),
+    ("Current: M1:1.5 M2:1.5 M3:1.5 M4:1.5|Ang: X:5.0 Y:6.0 Z:7.0",
+     {"ang": {"roll": 5.0, "pitch": 6.0, "yaw": 7.0}, "cur": [1.5] * 4}),
+    ("Ang: X:nan Y:1.0 Z:2.0", {"ang": {"roll": float("nan"), "pitch": 1.0, "yaw": 2.0}}),
+    # ── partial / truncated ---------------------------------------------------
+    ("Rx: Y:1500 P:1500 T:1000 R:1500|Arm: 1|Mode: ANGLE|PWM: M1:1000 M2:1000 M3:10",
+     {"rx": [1500, 1500, 1000, 1500]}),
+    ("Rx: Y:1500 P:1500 T:1000 R:1500|Arm: 1|Mode: ANGLE|PWM: M1:1000 M2:1000 M3:1000 M4:1000"
+     "|Ang: X:1.00 Y:2.", {"rx": [1500, 1500, 1000, 1500], "pwm": [1000] * 4,
+                            "ang": {"roll": 1.0, "pitch": 2.0}}),
+    ("Rx: Y:1500 P:1500|Arm: 1", {}),
+    ("|Ang: X:4.5", {"ang": {"roll": 4.5}}),
+    # ── malformed -------------------------------------------------------------
+    ("", {}),
+    ("\r", {}),
+    ("garbage \x00\xff in the line", {}),
+    ("Rx: Y:15x0 P:1500 T:1000 R:1500", {}),
+    ("Rx: Y:1500.5 P:1500 T:1000 R:1500", {}),
+    ("PWM: M1:1000 M2:abc M3:1000 M4:1000", {}),
+    ("PWM: M1:1000 M2:1000 M3:1000 M5:1000", {}),
+    ("Current: M1:1.0 M2:1.0 M3:1.0 M4:--1", {}),
+    ("Ang: X:: Y:1..2 Z:", {}),
+    ("Rx:|PWM:|Ang:|Current:", {}),
+    ("Y:1500 P:1500 T:1000 R:1500", {}),
+    ("M1:1000 M2:1000 M3:1000 M4:1000", {}),
+    ("||||||||||||||||||||||||", {}),
+    ("Rx: Y:1500 P:1500 T:1000 R:1500" * 20, {"rx": [1500, 1500, 1000, 1500]}),
+]
@@ -0,0 +1,92 @@
+#synthetic.py
+
+"""Synthetic Arduino telemetry shared by the benchmark scripts."""
+
+import math
+from typing import List
+
+
+def arduino_line(i: int, num_motors: int = 4) -> str:
+    """One line in the flight controller's text format (no trailing newline)."""
+    t = i * 0.01
+    rx  = f"Rx: Y:{1500 + int(200 * math.sin(t))} P:{1500 + int(150 * math.cos(t))} " \
+          f"T:{1000 + (i % 1000)} R:{1500 - int(100 * math.sin(t))}"
+    pwm = "PWM: " + " ".join(f"M{m+1}:{1100 + (i + 37 * m) % 800}" for m in range(num_motors))
+    ang = f"Ang: X:{20 * math.sin(t):.2f} Y:{15 * math.cos(t):.2f} Z:{(i * 0.5) % 360:.2f}"
+    cur = "Current: " + " ".join(f"M{m+1}:{2.5 + math.sin(t + m):.3f}" for m in range(num_motors))
+    return "|".join([rx, "Arm: 1", "Mode: ANGLE", pwm, ang, cur])
+
+
+def arduino_stream(n_lines: int, num_motors: int = 4) -> bytes:
+    """*n_lines* synthetic lines joined with ``\\r\\n`` like ``Serial.println``."""
+    lines: List[str] = [arduino_line(i, num_motors) for i in range(n_lines)]
+    return ("\r\n".join(lines) + "\r\n").encode()
+
+
+def flight_rows(n: int, rate_hz: float = 100.0, num_motors: int = 4,
+                t0: float = 1.7e9):
+    """``(columns, rows)`` for an *n*-sample flight in ``DataHandler.store`` order."""
+    import numpy as np
+
+    from data_handler import DataHandler
+
+    columns = DataHandler.channel_names(num_motors)
+    t = t0 + np.arange(n) / rate_hz
+    rows = np.empty((n, len(columns)))
+    for j, name in enumerate(columns):
+        rows[:, j] = np.sin(t * (0.1 + 0.01 * j)) * 10 + j
+    rows[:, 0] = t
+    return columns, rows
+
+
+def jpeg_frame(width: int = 1280, height: int = 720, seed: int = 0, noise: int = 40) -> bytes:
+    """A JPEG of a gradient-plus-noise test card (realistic decode cost)."""
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    img = np.dstack([x + 0 * y, y + 0 * x, (x + y) / 2]).astype(np.uint8)
+    img = cv2.add(img, rng.integers(0, noise, img.shape, dtype=np.uint8))
+    ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    return buf.tobytes()
+
+
+class FakeCamera:
+    """Stand-in for ``cv2.VideoCapture``: ``grab`` is paced at *fps*, ``retrieve`` decodes a real JPEG."""
+
+    def __init__(self, url: str = "", fps: float = 30.0, width: int = 1280, height: int = 720) -> None:
+        import numpy as np
+
+        self.jpeg = np.frombuffer(jpeg_frame(width, height), np.uint8)
+        self.period = 1.0 / fps
+        self._next = 0.0
+        self._open = True
+
+    def isOpened(self) -> bool:
+        return self._open
+
+    def set(self, prop, value) -> bool:
+        return True
+
+    def grab(self) -> bool:
+        import time
+
+        now = time.monotonic()
+        if self._next > now:
+            time.sleep(self._next - now)   # wait for the "sensor"
+        self._next = max(now, self._next) + self.period
+        return True
+
+    def retrieve(self):
+        import cv2
+
+        return True, cv2.imdecode(self.jpeg, cv2.IMREAD_COLOR)
+
+    def read(self):
+        self.grab()
+        return self.retrieve()
+
+    def release(self) -> None:
+        self._open = False
@@ -0,0 +1,179 @@
+#binary_protocol.py
+
+"""Compact binary telemetry frames (COBS framed, CRC16 protected).
+
+The flight controller may send this instead of the text line.  Each frame
+is COBS encoded and terminated by a single ``0x00`` byte, so a zero byte in
+the stream never occurs inside a frame; :class:`serial_ingest.FrameAssembler`
+switches the link to binary mode once the packet after a ``0x00`` passes
+:func:`frame_valid`.
+
+Decoded payload, little-endian, no padding (``num_motors`` = N)::
+
+    uint8    magic            0xA5
+    uint16   seq              wraps at 65536
+    uint16   receiver[4]      yaw, pitch, throttle, roll (µs)
+    uint16   pwm[N]           motor PWM (µs)
+    float32  angles[3]        roll, pitch, yaw (°)
+    float32  currents[N]      motor currents (A)
+    uint16   crc              CRC-16/CCITT-FALSE over all preceding bytes
+
+For N = 4 that is 49 payload bytes, 51 on the wire (vs. ~150 for text).
+"""
+
+from __future__ import annotations
+
+import binascii
+import struct
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+FRAME_MAGIC = 0xA5
+
+
+def crc16(data: bytes, crc: int = 0xFFFF) -> int:
+    """CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) computed in C."""
+    return binascii.crc_hqx(data, crc)
+
+
+def cobs_encode(data: bytes) -> bytes:
+    """COBS-encode *data* (no trailing delimiter)."""
+    out = bytearray()
+    view = memoryview(data)
+    start = 0
+    n = len(data)
+    while True:
+        zero = data.find(b"\x00", start, min(n, start + 254))
+        if zero < 0:
+            block_end = min(n, start + 254)
+            out.append(block_end - start + 1)
+            out += view[start:block_end]
+            if block_end == n:
+                break
+            start = block_end
+        else:
+            out.append(zero - start + 1)
+            out += view[start:zero]
+            start = zero + 1
+            if start == n:
+                out.append(1)
+                break
+    return bytes(out)
+
+
+def cobs_decode(data: bytes) -> Optional[bytes]:
+    """Decode one COBS block; ``None`` if it is malformed."""
+    out = bytearray()
+    view = memoryview(data)
+    i, n = 0, len(data)
+    while i < n:
+        code = data[i]
+        if code == 0 or i + code > n:
+            return None
+        out += view[i + 1:i + code]
+        i += code
+        if code < 0xFF and i < n:
+            out.append(0)
+    return bytes(out)
+
+
+def frame_valid(packet: bytes) -> bool:
+    """True if *packet* (delimiter stripped) decodes to a frame with a good CRC.
+
+    Only the magic byte and the CRC are checked, so it works for any motor count.
+    """
+    body = cobs_decode(packet)
+    return (body is not None and len(body) > 3 and body[0] == FRAME_MAGIC
+            and crc16(body[:-2]) == body[-2] | (body[-1] << 8))
+
+
+def frame_format(num_motors: int = 4) -> str:
+    return f"<BH4H{num_motors}H3f{num_motors}fH"
+
+
+def frame_dtype(num_motors: int = 4) -> np.dtype:
+    """Structured dtype matching :func:`frame_format` (for ``np.frombuffer``)."""
+    return np.dtype([
+        ("magic",    "u1"),
+        ("seq",      "<u2"),
+        ("receiver", "<u2", (4,)),
+        ("pwm",      "<u2", (num_motors,)),
+        ("angles",   "<f4", (3,)),
+        ("currents", "<f4", (num_motors,)),
+        ("crc",      "<u2"),
+    ])
+
+
+def encode_frame(seq: int, receiver: Sequence[int], pwm: Sequence[int],
+                 angles: Sequence[float], currents: Sequence[float]) -> bytes:
+    """Build one wire frame (COBS + ``0x00``); mirrors the firmware encoder."""
+    fmt = struct.Struct(frame_format(len(pwm))[:-1])
+    body = fmt.pack(FRAME_MAGIC, seq & 0xFFFF, *receiver, *pwm, *angles, *currents)
+    body += struct.pack("<H", crc16(body))
+    return cobs_encode(body) + b"\x00"
+
+
+class BinaryFrameDecoder:
+    """Validates and decodes batches of COBS packets (delimiter stripped)."""
+
+    def __init__(self, num_motors: int = 4) -> None:
+        self.num_motors = num_motors
+        self.dtype      = frame_dtype(num_motors)
+        self.size       = self.dtype.itemsize
+        self.struct     = struct.Struct(frame_format(num_motors))
+        self.frames_ok  = 0
+        self.malformed  = 0   # bad COBS, wrong length or magic
+        self.crc_errors = 0
+        self.seq_gaps   = 0   # frames missing according to the sequence number
+        self._last_seq: Optional[int] = None
+
+    def decode_batch(self, packets: Iterable[bytes]) -> np.ndarray:
+        """Return a structured array holding every valid frame in *packets*."""
+        size = self.size
+        valid: List[bytes] = []
+        for packet in packets:
+            body = cobs_decode(packet)
+            if body is None or len(body) != size or body[0] != FRAME_MAGIC:
+                self.malformed += 1
+                continue
+            if crc16(body[:-2]) != body[-2] | (body[-1] << 8):
+                self.crc_errors += 1
+                continue
+            valid.append(body)
+
+        frames = np.frombuffer(b"".join(valid), dtype=self.dtype)
+        if len(frames):
+            self._count_gaps(frames["seq"])
+            self.frames_ok += len(frames)
+        return frames
+
+    def decode(self, packet: bytes) -> Optional[tuple]:
+        """Decode a single packet with ``struct.unpack_from``; ``None`` if invalid."""
+        body = cobs_decode(packet)
+        if body is None or len(body) != self.size or body[0] != FRAME_MAGIC:
+            self.malformed += 1
+            return None
+        if crc16(body[:-2]) != body[-2] | (body[-1] << 8):
+            self.crc_errors += 1
+            return None
+        fields = self.struct.unpack_from(body)
+        seq = fields[1]
+        if self._last_seq is not None and seq != self._last_seq:
+            self.seq_gaps += (seq - self._last_seq - 1) % 65536
+        self._last_seq = seq
+        self.frames_ok += 1
+        return fields
+
+    def reset(self) -> None:
+        """Forget the last sequence number (e.g. after a reconnect)."""
+        self._last_seq = None
+
+    def _count_gaps(self, seq: np.ndarray) -> None:
+        seq = seq.astype(np.int64)
+        if self._last_seq is not None:
+            seq = np.concatenate(([self._last_seq], seq))
+        if len(seq) > 1:
+            step = np.diff(seq)
+            self.seq_gaps += int(((step - 1) % 65536)[step != 0].sum())
+        self._last_seq = int(seq[-1])
@@ -0,0 +1,265 @@
+#camera_capture.py
+
+"""Threaded camera capture with latest-frame-wins hand-off.
+
+Each stream gets one :class:`CameraCapture` worker thread that owns the
+``cv2.VideoCapture`` (opening, grabbing and decoding all block there,
+never on the GUI thread) and publishes into a single-slot
+:class:`FrameSlot`.  A frame the GUI has not picked up yet is simply
+overwritten and counted as dropped, so a slow display never builds a
+backlog and always shows the newest image.
+
+When the display sets :attr:`CameraCapture.target_size`, frames are also
+downscaled to fit it on the worker, so the GUI thread only wraps and
+paints a tile-sized buffer.  ``requested_fps`` caps how many grabbed
+frames are decoded (0 pauses decoding); the rest are drained from the
+source and skipped.  While recording, every grabbed frame also goes to a
+:class:`~camera_recorder.CameraRecorder`.  HTTP MJPEG sources go through
+:class:`~mjpeg_stream.MjpegStream`, which already decodes at a reduced
+resolution when the tile is much smaller than the frame.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from camera_recorder import CameraRecorder
+from mjpeg_stream import MjpegStream, open_stream
+
+
+def fit_size(width: int, height: int, box: Tuple[int, int]) -> Tuple[int, int]:
+    """Largest size with the aspect of *width* x *height* inside *box*."""
+    scale = min(box[0] / width, box[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+@dataclass
+class CapturedFrame:
+    image:     np.ndarray   # BGR, contiguous, downscaled to target_size if set
+    seq:       int          # frames decoded on this stream so far
+    captured:  float        # time.monotonic() when the frame was ready
+    decode_ms: float        # time spent in retrieve()
+    source:    Tuple[int, int] = (0, 0)   # decoded width, height
+
+
+@dataclass
+class CaptureStats:
+    frames:    int   = 0      # decoded
+    delivered: int   = 0      # taken by the GUI
+    dropped:   int   = 0      # overwritten before the GUI took them
+    errors:    int   = 0      # failed opens / reads
+    restarts:  int   = 0      # capture processes restarted (camera_process)
+    skipped:   int   = 0      # grabbed but not decoded (over budget / paused)
+    recorded:  int   = 0      # queued for the CameraRecorder
+    fps:       float = 0.0    # decoded frames per second (1 s window)
+    grab_ms:   float = 0.0    # last grab(): waiting for / fetching the next frame
+    decode_ms: float = 0.0    # last retrieve(): decoding it
+    resize_ms: float = 0.0    # last downscale to target_size
+    reduction: int   = 1      # IMREAD_REDUCED factor of the last decode (MJPEG)
+    state:     str   = "idle" # idle | connecting | streaming | error
+
+
+class FrameSlot:
+    """Single-frame mailbox: ``put`` overwrites, ``take`` returns each frame once."""
+
+    def __init__(self) -> None:
+        self._lock  = threading.Lock()
+        self._frame: Optional[CapturedFrame] = None
+
+    def put(self, frame: CapturedFrame) -> bool:
+        """Store *frame*; True when an untaken frame was overwritten."""
+        with self._lock:
+            stale = self._frame is not None
+            self._frame = frame
+        return stale
+
+    def take(self) -> Optional[CapturedFrame]:
+        """Newest frame not taken yet, or None."""
+        with self._lock:
+            frame, self._frame = self._frame, None
+        return frame
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frame = None
+
+
+class CameraCapture:
+    """One worker thread decoding one stream into a :class:`FrameSlot`."""
+
+    def __init__(self, url: str,
+                 open_capture: Callable[[str], "cv2.VideoCapture"] = open_stream,
+                 reconnect_delay: float = 1.0) -> None:
+        self.url             = url
+        self.open_capture    = open_capture
+        self.reconnect_delay = reconnect_delay
+        self.target_size: Optional[Tuple[int, int]] = None   # set by the GUI, device pixels
+        self.requested_fps   = math.inf   # decode budget; 0 pauses decoding
+        self.recorder: Optional[CameraRecorder] = None
+        self.slot            = FrameSlot()
+        self.stats           = CaptureStats()
+        self._running        = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"capture {self.url}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Ask the worker to finish; it releases the capture itself."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.slot.clear()
+        self.stats.state = "idle"
+
+    @property
+    def recording(self) -> bool:
+        return self.recorder is not None
+
+    def start_recording(self, stem: str, segment_seconds: float = 60.0) -> None:
+        """Record every grabbed frame (regardless of the decode budget) under *stem*."""
+        self.stop_recording()
+        recorder = CameraRecorder(stem, self.url, segment_seconds)
+        recorder.start()
+        self.recorder = recorder
+
+    def stop_recording(self) -> None:
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.stop()
+
+    def latest(self) -> Optional[CapturedFrame]:
+        """Newest decoded frame since the last call (GUI side)."""
+        frame = self.slot.take()
+        if frame is not None:
+            self.stats.delivered += 1
+        return frame
+
+    # ------------------------------------------------------------------ worker
+
+    def _fit(self, image: np.ndarray) -> np.ndarray:
+        """Downscale *image* into target_size (never upscale)."""
+        box = self.target_size
+        height, width = image.shape[:2]
+        if box is None or (width <= box[0] and height <= box[1]):
+            return image
+        t0 = time.perf_counter()
+        image = cv2.resize(image, fit_size(width, height, box), interpolation=cv2.INTER_AREA)
+        self.stats.resize_ms = (time.perf_counter() - t0) * 1e3
+        return image
+
+    def _set_state(self, state: str) -> None:
+        self.stats.state = state
+
+    def _publish(self, frame: CapturedFrame) -> None:
+        if self.slot.put(frame):
+            self.stats.dropped += 1
+
+    def _skip(self) -> None:
+        """A grabbed frame was not decoded (rate limit or paused)."""
+
+    def _open(self):
+        self._set_state("connecting")
+        cap = self.open_capture(self.url)
+        if not cap.isOpened():
+            cap.release()
+            return None
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self._set_state("streaming")
+        return cap
+
+    def _run(self) -> None:
+        stats = self.stats
+        cap = None
+        window_start, window_frames = time.monotonic(), 0
+        next_due = 0.0
+        grabbed  = 0
+        try:
+            while self._running:
+                if cap is None:
+                    cap = self._open()
+                    if cap is None:
+                        stats.errors += 1
+                        self._set_state("error")
+                        time.sleep(self.reconnect_delay)
+                        continue
+
+                # grab() blocks until the source has a frame; retrieve()
+                # decodes it, so the two timings separate source rate
+                # from decode cost (FFmpeg does part of the decode in grab)
+                t0 = time.perf_counter()
+                ok = cap.grab()
+                t1 = time.perf_counter()
+                if ok:
+                    grabbed += 1
+                    stamp = time.monotonic_ns()
+                    now = stamp * 1e-9
+                    if now - window_start >= 1.0:
+                        stats.fps = window_frames / (now - window_start)
+                        window_start, window_frames = now, 0
+                    rate = self.requested_fps
+                    due = rate > 0 and now >= next_due
+                    recorder = self.recorder
+                    if recorder is not None and isinstance(cap, MjpegStream):
+                        stats.recorded += recorder.add(cap.jpeg, stamp, grabbed)   # stream copy
+                        recorder = None
+                    if not due and recorder is None:
+                        # over budget or paused: keep draining the source, skip the decode
+                        stats.skipped += 1
+                        self._skip()
+                        continue
+                    if isinstance(cap, MjpegStream):
+                        cap.target_size = self.target_size   # decode reduced
+                    ok, image = cap.retrieve()
+                    if not ok:
+                        # one undecodable frame (a corrupt JPEG part): drop it, keep the connection
+                        stats.errors += 1
+                        self._skip()
+                        continue
+                    if recorder is not None:
+                        stats.recorded += recorder.add(image, stamp, grabbed)      # encoded on the writer
+                    if not due:
+                        stats.skipped += 1
+                        self._skip()
+                        continue
+                    next_due = max(next_due + 1.0 / rate, now - 1.0 / rate)
+                t2 = time.perf_counter()
+                if not ok:
+                    # grab() failed: the stream ended or broke, reopen after a pause
+                    logging.warning("Camera %s: read failed, reconnecting", self.url)
+                    stats.errors += 1
+                    self._set_state("error")
+                    cap.release()
+                    cap = None
+                    time.sleep(self.reconnect_delay)
+                    continue
+
+                stats.frames += 1
+                window_frames += 1
+                stats.grab_ms   = (t1 - t0) * 1e3
+                stats.decode_ms = (t2 - t1) * 1e3
+                stats.reduction = getattr(cap, "reduction", 1)
+                source = (image.shape[1], image.shape[0])
+                self._publish(CapturedFrame(self._fit(image), stats.frames, time.monotonic(),
+                                            stats.decode_ms, source))
+        finally:
+            if cap is not None:
+                cap.release()
+            self.stop_recording()
@@ -0,0 +1,380 @@
+#camera_process.py
+
+"""Camera capture in a supervised child process.
+
+Each stream runs the :class:`~camera_capture.CameraCapture` loop in its
+own process, so decoding never competes with the dashboard for the GIL,
+and a stalled source or a crashing decoder can only take that process
+down.  Frames come back through a :class:`FrameRing` in shared memory;
+a control queue carries commands to the child (target size, stop) and a
+status queue carries its counters back.
+
+:class:`CameraProcess` has the same interface as ``CameraCapture``
+(``start``/``stop``/``latest``/``stats``/``target_size``/
+``requested_fps``).  Its ``poll()``, called from ``latest()``, restarts
+the child when it exits or goes silent for ``stall_timeout`` seconds.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Callable, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from camera_capture import CameraCapture, CaptureStats, CapturedFrame
+from mjpeg_stream import open_stream
+
+META = 5                          # slot header: seq, width, height, captured, decode_ms
+CHILD_FIELDS = ("frames", "skipped", "recorded", "errors", "fps", "grab_ms", "decode_ms", "resize_ms",
+                "reduction", "state")
+
+_CTX = mp.get_context("spawn")    # never fork a process that runs Qt threads
+
+
+def _clamp(size: Tuple[int, int], box: Tuple[int, int]) -> Tuple[int, int]:
+    return min(size[0], box[0]), min(size[1], box[1])
+
+
+class FrameRing:
+    """``slots`` BGR frame buffers with headers in one SharedMemory block.
+
+    Layout: a float64 header (``[0]`` latest published seq, then META
+    values per slot), padded to 64 bytes, then ``slots`` pixel buffers of
+    ``max_size`` each.  The writer sets a slot's seq to -1 while filling
+    it; readers check the seq before and after copying (a seqlock), so a
+    slot the writer lapped mid-copy is discarded rather than shown torn.
+    """
+
+    def __init__(self, slots: int, max_size: Tuple[int, int], name: Optional[str] = None) -> None:
+        self.slots      = slots
+        self.max_size   = max_size
+        self.slot_bytes = max_size[0] * max_size[1] * 3
+        head_len        = 1 + META * slots
+        offset          = (8 * head_len + 63) // 64 * 64
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=offset + slots * self.slot_bytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.head = np.ndarray((head_len,), np.float64, self.shm.buf)
+        self.data = np.ndarray((slots, self.slot_bytes), np.uint8, self.shm.buf, offset)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def reset(self) -> None:
+        self.head[:] = 0
+
+    def latest_seq(self) -> int:
+        return int(self.head[0])
+
+    def write(self, frame: CapturedFrame) -> None:
+        """Publish *frame* (writer side; must fit ``max_size``)."""
+        i = frame.seq % self.slots
+        height, width = frame.image.shape[:2]
+        meta = self.head[1 + META * i: 1 + META * (i + 1)]
+        meta[0] = -1
+        self.data[i, :width * height * 3] = frame.image.reshape(-1)
+        meta[1:] = (width, height, frame.captured, frame.decode_ms)
+        meta[0] = frame.seq
+        self.head[0] = frame.seq
+
+    def read(self, seq: int) -> Optional[CapturedFrame]:
+        """A private copy of frame *seq*, or None if its slot was overwritten."""
+        i = seq % self.slots
+        meta = self.head[1 + META * i: 1 + META * (i + 1)]
+        seen = meta.copy()
+        if seen[0] != seq:
+            return None
+        width, height = int(seen[1]), int(seen[2])
+        image = self.data[i, :width * height * 3].reshape(height, width, 3).copy()
+        if meta[0] != seq:
+            return None
+        return CapturedFrame(image, seq, float(seen[3]), float(seen[4]), (width, height))
+
+    def close(self, unlink: bool = False) -> None:
+        del self.head, self.data   # drop the buffer exports before closing
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+# ------------------------------------------------------------------ child side
+
+class _RingCapture(CameraCapture):
+    """CameraCapture publishing into a FrameRing and reporting over a queue."""
+
+    REPORT_INTERVAL = 0.5
+
+    def __init__(self, url: str, open_capture, ring: FrameRing, status) -> None:
+        super().__init__(url, open_capture)
+        self.ring         = ring
+        self.status       = status
+        self.target_size  = ring.max_size
+        self._last_report = 0.0
+
+    def _report(self) -> None:
+        self._last_report = time.monotonic()
+        self.status.put({k: getattr(self.stats, k) for k in CHILD_FIELDS})
+
+    def _set_state(self, state: str) -> None:
+        super()._set_state(state)
+        self._report()
+
+    def _publish(self, frame: CapturedFrame) -> None:
+        self.ring.write(frame)
+        if frame.captured - self._last_report >= self.REPORT_INTERVAL:
+            self._report()
+
+    def _skip(self) -> None:
+        # paused channels still prove they are alive to the watchdog
+        if time.monotonic() - self._last_report >= self.REPORT_INTERVAL:
+            self._report()
+
+
+def _capture_main(url: str, open_capture, ring_name: str, slots: int,
+                  max_size: Tuple[int, int], control, status) -> None:
+    ring = FrameRing(slots, max_size, ring_name)
+    capture = _RingCapture(url, open_capture, ring, status)
+
+    def listen() -> None:
+        # commands arrive even while the capture loop is blocked in grab()
+        parent = mp.parent_process()
+        while True:
+            try:
+                cmd, arg = control.get(timeout=1.0)
+            except queue.Empty:
+                if parent is not None and not parent.is_alive():
+                    os._exit(0)   # dashboard gone (crashed or killed): don't linger
+                continue
+            if cmd == "target":
+                capture.target_size = _clamp(arg, max_size)
+            elif cmd == "rate":
+                capture.requested_fps = arg
+            elif cmd == "record":
+                try:
+                    if arg is None:
+                        capture.stop_recording()
+                    else:
+                        capture.start_recording(*arg)
+                except OSError as e:
+                    logging.error("Camera %s: cannot record: %s", url, e)
+            elif cmd == "stop":
+                capture._running = False
+                return
+
+    threading.Thread(target=listen, name="control", daemon=True).start()
+    capture._running = True
+    try:
+        capture._run()
+    finally:
+        capture._set_state("idle")   # final counters
+        ring.close()
+
+
+# ------------------------------------------------------------------ parent side
+
+class CameraProcess:
+    """One supervised capture process per stream (GUI side)."""
+
+    def __init__(self, url: str,
+                 open_capture: Callable[[str], "cv2.VideoCapture"] = open_stream,
+                 slots: int = 3,
+                 max_size: Tuple[int, int] = (1920, 1080),
+                 stall_timeout: float = 15.0,
+                 restart_delay: float = 2.0) -> None:
+        self.url           = url
+        self.open_capture  = open_capture
+        self.slots         = slots
+        self.max_size      = max_size
+        self.stall_timeout = stall_timeout
+        self.restart_delay = restart_delay
+        self.stats         = CaptureStats()
+        self.ring: Optional[FrameRing] = None
+        self._target: Optional[Tuple[int, int]] = None
+        self._rate         = math.inf
+        self._recording: Optional[Tuple[str, float]] = None   # (stem, segment_seconds)
+        self._process      = None
+        self._running      = False
+        self._last_seq     = 0
+        self._seen_seq     = 0
+        self._heartbeat    = 0.0
+        self._restart_at   = 0.0
+        self._base         = {"frames": 0, "skipped": 0, "recorded": 0, "errors": 0}   # totals from earlier processes
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def target_size(self) -> Optional[Tuple[int, int]]:
+        return self._target
+
+    @target_size.setter
+    def target_size(self, size: Optional[Tuple[int, int]]) -> None:
+        if size == self._target:
+            return
+        self._target = size
+        if size is not None and self._process is not None:
+            self.control.put(("target", size))
+
+    @property
+    def requested_fps(self) -> float:
+        return self._rate
+
+    @requested_fps.setter
+    def requested_fps(self, fps: float) -> None:
+        if fps == self._rate:
+            return
+        self._rate = fps
+        if self._process is not None:
+            self.control.put(("rate", fps))
+
+    @property
+    def recording(self) -> bool:
+        return self._recording is not None
+
+    def start_recording(self, stem: str, segment_seconds: float = 60.0) -> None:
+        """Record in the child; a restarted child continues under ``<stem>_rN``."""
+        self._recording = (stem, segment_seconds)
+        if self._process is not None:
+            self.control.put(("record", self._recording))
+
+    def stop_recording(self) -> None:
+        self._recording = None
+        if self._process is not None:
+            self.control.put(("record", None))
+
+    def start(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self.ring = FrameRing(self.slots, self.max_size)
+        self._spawn()
+
+    def stop(self, timeout: float = 0.5) -> None:
+        self._running = False
+        self._kill(timeout)
+        if self.ring is not None:
+            self.ring.close(unlink=True)
+            self.ring = None
+        self.stats.state = "idle"
+
+    def latest(self) -> Optional[CapturedFrame]:
+        """Newest frame since the last call, copied out of shared memory."""
+        self.poll()
+        if self._process is None:
+            return None
+        seq = self.ring.latest_seq()
+        if seq <= self._last_seq:
+            return None
+        frame = self.ring.read(seq)
+        if frame is None:
+            return None   # lapped while copying; the next poll gets a newer one
+        self.stats.dropped  += seq - self._last_seq - 1
+        self.stats.delivered += 1
+        self._last_seq = seq
+        return frame
+
+    # ------------------------------------------------------------------ supervision
+
+    def poll(self) -> None:
+        """Merge child status and restart it if it died or stalled."""
+        if not self._running:
+            return
+        now = time.monotonic()
+        if self._process is None:
+            if now >= self._restart_at:
+                self._spawn()
+            return
+
+        if self._drain():
+            self._heartbeat = now
+        seq = self.ring.latest_seq()
+        if seq != self._seen_seq:
+            self._seen_seq = seq
+            self._heartbeat = now
+
+        if not self._process.is_alive():
+            logging.error("Camera %s: capture process exited (code %s), restarting",
+                          self.url, self._process.exitcode)
+            self._restart(now)
+        elif now - self._heartbeat > self.stall_timeout:
+            logging.error("Camera %s: no frames or status for %.0f s, restarting",
+                          self.url, self.stall_timeout)
+            self._restart(now)
+
+    def _drain(self) -> bool:
+        """Merge every queued status report; True if there was any."""
+        got = False
+        try:
+            while True:
+                self._merge(self.status.get_nowait())
+                got = True
+        except queue.Empty:
+            pass
+        return got
+
+    def _merge(self, values: dict) -> None:
+        for key, value in values.items():
+            if key in self._base:
+                value += self._base[key]
+            setattr(self.stats, key, value)
+
+    def _spawn(self) -> None:
+        self.ring.reset()
+        self._last_seq = self._seen_seq = 0
+        self.control = _CTX.Queue()
+        self.status  = _CTX.Queue()
+        self._process = _CTX.Process(
+            target=_capture_main, name=f"camera {self.url}", daemon=True,
+            args=(self.url, self.open_capture, self.ring.name, self.slots,
+                  self.max_size, self.control, self.status))
+        self._process.start()
+        if self._target is not None:
+            self.control.put(("target", self._target))
+        if self._rate != math.inf:
+            self.control.put(("rate", self._rate))
+        if self._recording is not None:
+            stem, segment_seconds = self._recording
+            if self.stats.restarts:
+                stem = f"{stem}_r{self.stats.restarts}"   # never overwrite the earlier part
+            self.control.put(("record", (stem, segment_seconds)))
+        self._heartbeat = time.monotonic()
+        self.stats.state = "connecting"
+
+    def _restart(self, now: float) -> None:
+        self._kill(0.0)   # dead or stuck: no point waiting for a clean exit
+        self._base = {k: getattr(self.stats, k) for k in self._base}
+        self.stats.restarts += 1
+        self.stats.state = "error"
+        self._restart_at = now + self.restart_delay
+
+    def _kill(self, timeout: float) -> None:
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if process.is_alive():
+            self.control.put(("stop", None))
+            process.join(timeout)
+        if process.is_alive():
+            # stuck in a blocking open/grab or a native decoder call
+            process.terminate()
+            process.join(1.0)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        if process.exitcode == 0:
+            self._drain()
+        for q in (self.control, self.status):
+            q.close()
+            q.cancel_join_thread()
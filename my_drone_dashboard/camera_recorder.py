@@ -0,0 +1,251 @@
+#camera_recorder.py
+
+"""Segmented camera recording with a per-frame time index.
+
+A :class:`CameraRecorder` receives every grabbed frame of one channel
+and writes it from a background thread (the capture loop never waits on
+disk):
+
+``<stem>_NNNN.mjpeg``  rolling segments of back-to-back JPEGs, a new one
+                       every ``segment_seconds``.  MJPEG sources are
+                       stream-copied (the received bytes, no re-encode);
+                       other sources are JPEG-encoded on the writer.
+``<stem>.vidx``        ``MAGIC`` (8 bytes), ``uint32`` header length, JSON
+                       header (``url``, ``created``, ``segments``), then one
+                       ``FRAME_RECORD`` per frame: host monotonic ns,
+                       epoch seconds (the same clock as the telemetry
+                       ``time`` column), frame number, segment, byte
+                       offset and length.
+
+Both files are fsync'ed on every flush, like the flight recorder.
+:class:`CameraRecording` maps an index and finds the frame shown at any
+telemetry timestamp with one binary search.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+MAGIC = b"QCVIDX\x00\x01"
+FRAME_RECORD = struct.Struct("<qdQIQI")
+FRAME_DTYPE = np.dtype([
+    ("mono_ns", "<i8"),
+    ("time",    "<f8"),
+    ("frame",   "<u8"),
+    ("segment", "<u4"),
+    ("offset",  "<u8"),
+    ("length",  "<u4"),
+])
+assert FRAME_DTYPE.itemsize == FRAME_RECORD.size
+
+
+def recording_stem(log_dir: str, label: str, when: Optional[datetime] = None) -> str:
+    """``<log_dir>/camera_YYYYmmdd_HHMMSS_<label>`` (``-2``, ``-3``… if taken)."""
+    when = when or datetime.now()
+    base = stem = os.path.join(log_dir, when.strftime(f"camera_%Y%m%d_%H%M%S_{label}"))
+    n = 1
+    while os.path.exists(stem + ".vidx"):
+        n += 1
+        stem = f"{base}-{n}"
+    return stem
+
+
+def segment_path(stem: str, segment: int) -> str:
+    return f"{stem}_{segment:04d}.mjpeg"
+
+
+class CameraRecorder:
+    """Queues frames in memory and appends them to segment files periodically."""
+
+    def __init__(self, stem: str, url: str = "", segment_seconds: float = 60.0,
+                 flush_interval: float = 1.0, max_pending: int = 120,
+                 jpeg_quality: int = 85) -> None:
+        self.stem            = stem
+        self.index_path      = stem + ".vidx"
+        self.url             = url
+        self.segment_seconds = segment_seconds
+        self.flush_interval  = flush_interval
+        self.max_pending     = max_pending
+        self.jpeg_quality    = jpeg_quality
+        self.frames_written  = 0
+        self.dropped         = 0       # writer fell more than max_pending behind
+        self.segment         = -1
+        self._segment_start  = 0.0
+        self._pending: Deque[Tuple[Any, int, float, int]] = deque()
+        self._wake   = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._epoch_offset = time.time() - time.monotonic()   # monotonic → epoch
+        self._seg = None
+        self._idx = None
+
+    # ------------------------------------------------------------------ life-cycle
+
+    def start(self) -> None:
+        os.makedirs(os.path.dirname(self.stem) or ".", exist_ok=True)
+        header = json.dumps({
+            "url":      self.url,
+            "created":  time.time(),
+            "segments": os.path.basename(self.stem) + "_NNNN.mjpeg",
+            "codec":    "jpeg",
+        }).encode()
+        self._idx = open(self.index_path, "wb")
+        self._idx.write(MAGIC + struct.pack("<I", len(header)) + header)
+        self._idx.flush()
+
+        self._thread = threading.Thread(target=self._run, name="CameraRecorder", daemon=True)
+        self._thread.start()
+        logging.info("Camera recorder writing to %s", self.index_path)
+
+    def stop(self) -> None:
+        """Write everything still pending and close the files."""
+        if self._thread is None:
+            return
+        thread, self._thread = self._thread, None
+        self._wake.set()
+        thread.join()
+        self._flush()
+        if self._seg is not None:
+            self._seg.close()
+        self._idx.close()
+        logging.info("Camera recorder closed %s (%d frames, %d segments, %d dropped)",
+                     self.index_path, self.frames_written, self.segment + 1, self.dropped)
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None
+
+    # ------------------------------------------------------------------ producer side
+
+    def add(self, frame, mono_ns: int, number: int) -> bool:
+        """Queue one frame: JPEG ``bytes`` (stream copy) or a BGR array (encoded later).
+
+        False if the writer is ``max_pending`` frames behind and it was dropped.
+        """
+        if len(self._pending) >= self.max_pending:
+            self.dropped += 1
+            return False
+        self._pending.append((frame, mono_ns, mono_ns / 1e9 + self._epoch_offset, number))
+        return True
+
+    # ------------------------------------------------------------------ writer thread
+
+    def _run(self) -> None:
+        while self._thread is not None:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._flush()
+            except Exception as exc:
+                logging.error("Camera recorder write error: %s", exc)
+
+    def _roll(self, epoch: float) -> None:
+        if self._seg is not None:
+            self._seg.close()
+        self.segment += 1
+        self._segment_start = epoch
+        self._seg = open(segment_path(self.stem, self.segment), "wb")
+
+    def _flush(self) -> None:
+        pending = self._pending
+        n = len(pending)
+        if not n:
+            return
+        records = []
+        for _ in range(n):
+            frame, mono_ns, epoch, number = pending.popleft()
+            if not isinstance(frame, (bytes, bytearray)):
+                ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+                if not ok:
+                    continue
+                frame = buf.tobytes()
+            if self._seg is None or epoch - self._segment_start >= self.segment_seconds:
+                self._roll(epoch)
+            offset = self._seg.tell()
+            self._seg.write(frame)
+            records.append(FRAME_RECORD.pack(mono_ns, epoch, number, self.segment, offset, len(frame)))
+
+        self._seg.flush()
+        os.fsync(self._seg.fileno())
+        self._idx.write(b"".join(records))
+        self._idx.flush()
+        os.fsync(self._idx.fileno())
+        self.frames_written += len(records)
+
+
+# ---------------------------------------------------------------------- reading
+
+class CameraRecording:
+    """Memory-mapped ``.vidx`` index plus random access into its segments."""
+
+    def __init__(self, index_path: str) -> None:
+        self.index_path = index_path
+        self.stem = index_path[:-len(".vidx")]
+        with open(index_path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{index_path} is not a camera index")
+            (hlen,) = struct.unpack("<I", f.read(4))
+            self.header: Dict[str, Any] = json.loads(f.read(hlen))
+        offset = len(MAGIC) + 4 + hlen
+        count = (os.path.getsize(index_path) - offset) // FRAME_DTYPE.itemsize   # drops a torn tail
+        self.frames = (np.memmap(index_path, dtype=FRAME_DTYPE, mode="r", offset=offset, shape=(count,))
+                       if count else np.empty(0, FRAME_DTYPE))
+        # contiguous copy (8 bytes per frame): searchsorted on the strided
+        # field would copy the whole column on every seek
+        self.time = np.ascontiguousarray(self.frames["time"])
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    @property
+    def t_first(self) -> float:
+        return float(self.time[0]) if len(self) else float("nan")
+
+    @property
+    def t_last(self) -> float:
+        return float(self.time[-1]) if len(self) else float("nan")
+
+    def seek(self, t: float) -> int:
+        """Index of the frame on screen at epoch *t* (the last one at or before it)."""
+        i = int(np.searchsorted(self.time, t, side="right")) - 1
+        return min(max(i, 0), len(self) - 1)
+
+    def jpeg(self, i: int) -> bytes:
+        rec = self.frames[i]
+        with open(segment_path(self.stem, int(rec["segment"])), "rb") as f:
+            f.seek(int(rec["offset"]))
+            return f.read(int(rec["length"]))
+
+    def frame_at(self, t: float, flags: int = cv2.IMREAD_COLOR) -> Optional[np.ndarray]:
+        """Decoded BGR frame shown at epoch *t*, or None for an empty recording."""
+        if not len(self):
+            return None
+        return cv2.imdecode(np.frombuffer(self.jpeg(self.seek(t)), np.uint8), flags)
+
+
+def find_recordings(log_dir: str, t0: float, t1: float) -> List[CameraRecording]:
+    """Recordings in *log_dir* overlapping the epoch range ``[t0, t1]``."""
+    try:
+        names = sorted(n for n in os.listdir(log_dir) if n.startswith("camera_") and n.endswith(".vidx"))
+    except FileNotFoundError:
+        return []
+    found = []
+    for name in names:
+        try:
+            rec = CameraRecording(os.path.join(log_dir, name))
+        except (OSError, ValueError) as e:
+            logging.error("Cannot open camera index %s: %s", name, e)
+            continue
+        if len(rec) and rec.t_first <= t1 and rec.t_last >= t0:
+            found.append(rec)
+    return found
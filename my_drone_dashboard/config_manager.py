@@ -16,6 +16,9 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "motor_current_range": [0.0, 10.0],
     "arduino_port":     "COM3",
     "arduino_baudrate": 115200,
+    "serial_reconnect_max": 30.0,    # s; reconnect backoff doubles from 0.5 s up to this
+    "sampling_mode":    "timer",     # "timer" (200 ms snapshots) | "stream" (every frame)
+    "stream_drain_ms":  50,
     # Telemetry Graphs
     "motor_titles": ["Motor1", "Motor2", "Motor3", "Motor4"],
     "motor_colors": ["#0000ff", "#ffaa7f", "#aa5500", "#ff0000"],
@@ -26,10 +29,23 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "battery_title": "Battery Status",
     "battery_color": "#ffaa7f",
     "battery_update_freq": 500,
+    "render_fps": 30,               # live redraw cap; 0 = display refresh rate
+    "pfd_repaint_threshold_px": 0.5,  # PFD skips repaints that move < this many px
+    "orientation_trail": False,     # 3D view: nose trail over the whole buffer
+    "perf_overlay": False,          # stage timings over the telemetry tab (F3)
+    "perf_log": False,              # rotating <log_dir>/perf.jsonl
+    "perf_log_interval": 5.0,       # seconds between perf.jsonl records
     # Camera
     "ip_webcam_url": "",
+    "camera_decode_budget": 60.0,   # decoded frames/s across all camera tiles
+    "camera_focus_fps": 30.0,       # focused (clicked) tile
+    "camera_background_fps": 5.0,   # every other tile
+    "camera_segment_seconds": 60.0, # length of each recorded camera segment file
     # Reload/Logging Options
     "default_reload_mode": "Full Reload",
+    "log_dir": "logs",
+    "log_flush_interval": 1.0,      # seconds of samples at risk on a crash
+    "export_excel_on_stop": False,  # also convert each flight to quadcopter_data.xlsx
     # Reload Graphs
     "reload_motor_titles": ["Motor 1", "Motor 2", "Motor 3", "Motor 4"],
     "reload_motor_colors": ["#ff0000", "#ff00ff", "#ffaaff", "#ff00ff"],
@@ -141,6 +157,13 @@ class ConfigTab(QWidget):
         telemetry_layout.addRow("Battery Graph Color:", self.battery_color_label)
         self.battery_update_freq_edit = QLineEdit(self)
         telemetry_layout.addRow("Battery Graph Update Frequency (ms):", self.battery_update_freq_edit)
+        self.render_fps_edit = QLineEdit(self)
+        telemetry_layout.addRow("Render Rate (FPS, 0 = display):", self.render_fps_edit)
+        self.pfd_threshold_edit = QLineEdit(self)
+        telemetry_layout.addRow("PFD Repaint Threshold (px):", self.pfd_threshold_edit)
+        self.orientation_trail_combo = QComboBox(self)
+        self.orientation_trail_combo.addItems(["True", "False"])
+        telemetry_layout.addRow("Show 3D Orientation Trail:", self.orientation_trail_combo)
         self.toolbox.addItem(telemetry_page, "Telemetry Graphs")
 
         # --- Data Handling Configuration Page ---
@@ -154,12 +177,27 @@ class ConfigTab(QWidget):
         data_layout.addRow("Arduino Port:", self.arduino_port_edit)
         self.arduino_baudrate_edit = QLineEdit(self)
         data_layout.addRow("Arduino Baudrate:", self.arduino_baudrate_edit)
+        self.serial_reconnect_edit = QLineEdit(self)
+        data_layout.addRow("Max Reconnect Delay (s):", self.serial_reconnect_edit)
+        self.sampling_mode_combo = QComboBox(self)
+        self.sampling_mode_combo.addItems(["timer", "stream"])
+        data_layout.addRow("Sampling Mode:", self.sampling_mode_combo)
+        self.stream_drain_edit = QLineEdit(self)
+        data_layout.addRow("Stream Drain Interval (ms):", self.stream_drain_edit)
 
         # --- Camera Configuration Page ---
         camera_page = QWidget()
         camera_layout = QFormLayout(camera_page)
         self.ip_webcam_url_edit = QLineEdit(self)
         camera_layout.addRow("IP Webcam URL:", self.ip_webcam_url_edit)
+        self.camera_budget_edit = QLineEdit(self)
+        camera_layout.addRow("Decode Budget (FPS, all tiles):", self.camera_budget_edit)
+        self.camera_focus_fps_edit = QLineEdit(self)
+        camera_layout.addRow("Focused Tile FPS:", self.camera_focus_fps_edit)
+        self.camera_background_fps_edit = QLineEdit(self)
+        camera_layout.addRow("Background Tile FPS:", self.camera_background_fps_edit)
+        self.camera_segment_edit = QLineEdit(self)
+        camera_layout.addRow("Recording Segment (s):", self.camera_segment_edit)
         self.toolbox.addItem(camera_page, "Camera")
 
         # --- Reload/Logging Options Page ---
@@ -174,6 +212,19 @@ class ConfigTab(QWidget):
             "Partial Reload (Last X Data Points)"
         ])
         reload_log_layout.addRow("Default Reload Mode:", self.default_reload_mode_combo)
+        self.log_dir_edit = QLineEdit(self)
+        reload_log_layout.addRow("Flight Log Folder:", self.log_dir_edit)
+        self.export_excel_combo = QComboBox(self)
+        self.export_excel_combo.addItems(["True", "False"])
+        reload_log_layout.addRow("Export Excel on Stop:", self.export_excel_combo)
+        self.perf_overlay_combo = QComboBox(self)
+        self.perf_overlay_combo.addItems(["True", "False"])
+        reload_log_layout.addRow("Show Perf Overlay (F3):", self.perf_overlay_combo)
+        self.perf_log_combo = QComboBox(self)
+        self.perf_log_combo.addItems(["True", "False"])
+        reload_log_layout.addRow("Write Perf Log (perf.jsonl):", self.perf_log_combo)
+        self.perf_log_interval_edit = QLineEdit(self)
+        reload_log_layout.addRow("Perf Log Interval (s):", self.perf_log_interval_edit)
         self.toolbox.addItem(reload_log_page, "Reload/Logging")
 
         # --- Reload Graphs Configuration Page ---
@@ -273,14 +324,29 @@ class ConfigTab(QWidget):
                 self.battery_title_edit.setText(self.config["battery_title"])
                 self.battery_color_label.setStyleSheet(f"background-color: {self.config['battery_color']}; border: 1px solid black;")
                 self.battery_update_freq_edit.setText(str(self.config["battery_update_freq"]))
+                self.render_fps_edit.setText(str(self.config.get("render_fps", 30)))
+                self.pfd_threshold_edit.setText(str(self.config.get("pfd_repaint_threshold_px", 0.5)))
+                self.orientation_trail_combo.setCurrentText(str(self.config.get("orientation_trail", False)))
                 self.buffer_size_edit.setText(str(self.config["buffer_size"]))
                 self.arduino_port_edit.setText(self.config.get("arduino_port","COM3"))
                 self.arduino_baudrate_edit.setText(str(self.config.get("arduino_baudrate",115200)))
+                self.serial_reconnect_edit.setText(str(self.config.get("serial_reconnect_max", 30.0)))
+                self.sampling_mode_combo.setCurrentText(self.config.get("sampling_mode", "timer"))
+                self.stream_drain_edit.setText(str(self.config.get("stream_drain_ms", 50)))
                 self.ip_webcam_url_edit.setText(self.config["ip_webcam_url"])
+                self.camera_budget_edit.setText(str(self.config.get("camera_decode_budget", 60.0)))
+                self.camera_focus_fps_edit.setText(str(self.config.get("camera_focus_fps", 30.0)))
+                self.camera_background_fps_edit.setText(str(self.config.get("camera_background_fps", 5.0)))
+                self.camera_segment_edit.setText(str(self.config.get("camera_segment_seconds", 60.0)))
                 default_reload_mode = self.config["default_reload_mode"]
                 index = self.default_reload_mode_combo.findText(default_reload_mode)
                 if index >= 0:
                     self.default_reload_mode_combo.setCurrentIndex(index)
+                self.log_dir_edit.setText(self.config.get("log_dir", "logs"))
+                self.export_excel_combo.setCurrentText(str(self.config.get("export_excel_on_stop", False)))
+                self.perf_overlay_combo.setCurrentText(str(self.config.get("perf_overlay", False)))
+                self.perf_log_combo.setCurrentText(str(self.config.get("perf_log", False)))
+                self.perf_log_interval_edit.setText(str(self.config.get("perf_log_interval", 5.0)))
                 self.reload_motor_titles_edit.setText(",".join(self.config["reload_motor_titles"]))
                 reload_motor_colors = self.config["reload_motor_colors"]
                 for i, label in enumerate(self.reload_motor_color_labels):
@@ -318,11 +384,26 @@ class ConfigTab(QWidget):
             self.config["battery_title"] = self.battery_title_edit.text().strip()
             self.config["battery_color"] = self.battery_color_label.styleSheet().split("background-color: ")[1].split(";")[0]
             self.config["battery_update_freq"] = int(self.battery_update_freq_edit.text())
+            self.config["render_fps"] = int(self.render_fps_edit.text())
+            self.config["pfd_repaint_threshold_px"] = float(self.pfd_threshold_edit.text())
+            self.config["orientation_trail"] = self.orientation_trail_combo.currentText() == "True"
             self.config["buffer_size"] = int(self.buffer_size_edit.text())
             self.config["arduino_port"]     = self.arduino_port_edit.text().strip()
             self.config["arduino_baudrate"] = int(self.arduino_baudrate_edit.text())
+            self.config["serial_reconnect_max"] = float(self.serial_reconnect_edit.text())
+            self.config["sampling_mode"]    = self.sampling_mode_combo.currentText()
+            self.config["stream_drain_ms"]  = int(self.stream_drain_edit.text())
             self.config["ip_webcam_url"] = self.ip_webcam_url_edit.text().strip()
+            self.config["camera_decode_budget"] = float(self.camera_budget_edit.text())
+            self.config["camera_focus_fps"] = float(self.camera_focus_fps_edit.text())
+            self.config["camera_background_fps"] = float(self.camera_background_fps_edit.text())
+            self.config["camera_segment_seconds"] = float(self.camera_segment_edit.text())
             self.config["default_reload_mode"] = self.default_reload_mode_combo.currentText()
+            self.config["log_dir"] = self.log_dir_edit.text().strip() or "logs"
+            self.config["export_excel_on_stop"] = self.export_excel_combo.currentText() == "True"
+            self.config["perf_overlay"] = self.perf_overlay_combo.currentText() == "True"
+            self.config["perf_log"] = self.perf_log_combo.currentText() == "True"
+            self.config["perf_log_interval"] = float(self.perf_log_interval_edit.text())
             self.config["reload_motor_titles"] = [s.strip() for s in self.reload_motor_titles_edit.text().split(",")]
             self.config["reload_motor_colors"] = [label.styleSheet().split("background-color: ")[1].split(";")[0] for label in self.reload_motor_color_labels]
             self.config["reload_orientation_titles"] = [s.strip() for s in self.reload_orientation_titles_edit.text().split(",")]
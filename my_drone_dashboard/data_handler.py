@@ -3,22 +3,28 @@
 from __future__ import annotations
 
 import logging
-import time
 import threading
-from collections import deque
-from datetime import datetime, timezone
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, List, Optional
 
-import numpy as np  # only used once for typed zeros (keep for future)
-import pandas as pd
-import serial
+import numpy as np
 from PyQt6.QtCore import QTimer, QObject, pyqtSignal
 
+from binary_protocol import BinaryFrameDecoder
+from flight_log import export_excel, finalize_log, pending_logs, recover_logs
+from flight_recorder import FlightRecorder, session_path
+from ring_buffer import RingBuffer, SampleQueue
+from serial_link import SerialLink
+from telemetry_parser import TelemetryParser, RX, PWM, ANG, CUR
+from utils.perf import TIMINGS
+
 
 class DataHandler(QObject):
     """Collects telemetry from the Arduino and stores it to buffers."""
 
     dataUpdated = pyqtSignal()
+    connectionChanged = pyqtSignal(str, str)   # SerialLink state, detail
+    logFinalized = pyqtSignal(str, str)        # .qlog, its .qcol written in the background ("" = failed)
 
     # ------------------------------------------------------------------ construction
 
@@ -31,20 +37,38 @@ class DataHandler(QObject):
         # --- serial -----------------------------------------------------
         self.arduino_port      = config.get("arduino_port", "")
         self.arduino_baudrate  = config.get("arduino_baudrate", 115200)
-        self.serial_connected  = False
-        self.serial_device     = None
-        self.serial_thread     = None
-        self.running           = False  # thread loop flag
-
-        # --- ring‑buffers ----------------------------------------------
-        self.time_buffer       = deque(maxlen=self.buffer_size)
-        self.motor_currents    = [deque(maxlen=self.buffer_size) for _ in range(self.num_motors)]
-        self.orientation       = [deque(maxlen=self.buffer_size) for _ in range(3)]  # roll, pitch, yaw
-        self.altitude          = deque(maxlen=self.buffer_size)
-        self.battery_voltage   = deque(maxlen=self.buffer_size)
-        self.battery_percentage = deque(maxlen=self.buffer_size)
-        self.motor_pwm         = [deque(maxlen=self.buffer_size) for _ in range(self.num_motors)]
-        self.receiver_channels = [deque(maxlen=self.buffer_size) for _ in range(4)]  # yaw, pitch, throttle, roll
+        self.parser            = TelemetryParser(self.num_motors)
+        self.frame_decoder     = BinaryFrameDecoder(self.num_motors)
+        self.running           = False  # start() called and not stopped
+        # opens, reads and reconnects the port on its own thread
+        self.serial_link = SerialLink(
+            self.arduino_port, self.arduino_baudrate, self._handle_frames,
+            on_connect  = self._on_link_connect,
+            backoff_max = config.get("serial_reconnect_max", 30.0),
+        )
+        self.serial_link.stateChanged.connect(self.connectionChanged)
+
+        # --- ring‑buffer (one column per channel) ---------------------
+        self.store = RingBuffer(self.channel_names(self.num_motors), self.buffer_size)
+
+        # --- sampling ---------------------------------------------------
+        # "timer":  update_data() samples latest_arduino_data every 200 ms
+        # "stream": the serial thread queues every parsed frame, stamped
+        #           at arrival; update_data() drains the queue
+        self.sampling_mode = config.get("sampling_mode", "timer")
+        self.stream_drain_ms: int = config.get("stream_drain_ms", 50)
+        self.sample_queue = SampleQueue()
+        self._epoch_offset = time.time() - time.monotonic()  # monotonic → epoch
+        self._last_read = 0.0   # monotonic time of the previous serial batch
+
+        # --- flight recorder (every sample, appended in the background) -
+        self.log_dir: str = config.get("log_dir", "logs")
+        self.log_flush_interval: float = config.get("log_flush_interval", 1.0)
+        self.recorder: FlightRecorder | None = None
+        self.log_path: str | None = None
+        # compaction / recovery run here, one job after the other, so
+        # closing or starting after a long flight never blocks the GUI
+        self._log_worker: threading.Thread | None = None
 
         # --- latest parsed line ----------------------------------------
         self.latest_arduino_data = {
@@ -73,230 +97,348 @@ class DataHandler(QObject):
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_data)
 
-        if self.arduino_port:
-            self.connect_to_arduino()
+    # ------------------------------------------------------------------ channels
+
+    @staticmethod
+    def channel_names(num_motors: int) -> List[str]:
+        """Column order of ``self.store`` (and of every row appended to it)."""
+        return (
+            ["time"]
+            + [f"motor{i+1}_current" for i in range(num_motors)]
+            + ["roll", "pitch", "yaw"]
+            + [f"motor{i+1}_pwm" for i in range(num_motors)]
+            + ["rx_yaw", "rx_pitch", "rx_throttle", "rx_roll"]
+            + ["altitude", "battery_voltage", "battery_percentage"]
+        )
+
+    # zero-copy per-channel views (oldest → newest), valid until the next sample
+
+    @property
+    def time_buffer(self) -> np.ndarray:
+        return self.store.column("time")
+
+    @property
+    def motor_currents(self) -> List[np.ndarray]:
+        return [self.store.column(f"motor{i+1}_current") for i in range(self.num_motors)]
+
+    @property
+    def orientation(self) -> List[np.ndarray]:  # roll, pitch, yaw
+        return [self.store.column(k) for k in ("roll", "pitch", "yaw")]
+
+    @property
+    def motor_pwm(self) -> List[np.ndarray]:
+        return [self.store.column(f"motor{i+1}_pwm") for i in range(self.num_motors)]
+
+    @property
+    def receiver_channels(self) -> List[np.ndarray]:  # yaw, pitch, throttle, roll
+        return [self.store.column(k) for k in ("rx_yaw", "rx_pitch", "rx_throttle", "rx_roll")]
+
+    @property
+    def altitude(self) -> np.ndarray:
+        return self.store.column("altitude")
+
+    @property
+    def battery_voltage(self) -> np.ndarray:
+        return self.store.column("battery_voltage")
+
+    @property
+    def battery_percentage(self) -> np.ndarray:
+        return self.store.column("battery_percentage")
+
+    @property
+    def update_interval(self) -> int:
+        """Period of the ``update_data`` timer in ms for the current mode."""
+        return self.stream_drain_ms if self.sampling_mode == "stream" else 200
 
     # ------------------------------------------------------------------ serial helpers
 
-    def connect_to_arduino(self) -> bool:
-        try:
-            self.serial_device = serial.Serial(
-                port     = self.arduino_port,
-                baudrate = self.arduino_baudrate,
-                timeout  = 1,
-            )
-            time.sleep(2)  # allow Arduino to reset
-            self.serial_connected = True
-            logging.info("Connected to Arduino on %s", self.arduino_port)
-            return True
-        except Exception as exc:
-            logging.error("Failed to connect to Arduino: %s", exc)
-            self.serial_connected = False
-            return False
+    @property
+    def serial_connected(self) -> bool:
+        return self.serial_link.connected
 
-    def disconnect_from_arduino(self) -> None:
-        if self.serial_device and self.serial_device.is_open:
-            self.serial_device.close()
-        self.serial_connected = False
-        logging.info("Disconnected from Arduino")
+    @property
+    def serial_device(self):
+        return self.serial_link.device
 
-    def start_serial_thread(self) -> None:
-        if not self.serial_connected:
-            return
-        self.running = True
-        self.serial_thread = threading.Thread(target=self._read_loop, daemon=True)
-        self.serial_thread.start()
+    def connect_to_arduino(self) -> None:
+        """Start connecting in the background; progress arrives via connectionChanged."""
+        self.serial_link.start()
 
-    def stop_serial_thread(self) -> None:
-        self.running = False
-        if self.serial_thread and self.serial_thread.is_alive():
-            self.serial_thread.join(timeout=1.0)
+    def disconnect_from_arduino(self) -> None:
+        self.serial_link.stop()
+
+    def _on_link_connect(self) -> None:
+        """Called on the link thread each time the port (re)opens."""
+        self.frame_decoder.reset()
+        self._last_read = 0.0
 
     # ------------------------------------------------------------------ read‑parse
 
-    def _read_loop(self) -> None:
-        """Background task: read chars, assemble full lines."""
-        line = ""
-        while self.running and self.serial_connected:
-            try:
-                if self.serial_device.in_waiting:
-                    ch = self.serial_device.read(1).decode(errors="ignore")
-                    if ch == "\n":
-                        self._parse_line(line)
-                        line = ""
-                    else:
-                        line += ch
-            except Exception as exc:
-                logging.error("Serial read error: %s", exc)
-                time.sleep(1)
-
-    def _parse_line(self, text: str) -> None:
-        """VERY simplified parser that only accepts the exact Arduino format."""
-        try:
-            parts = text.split("|")
-            if parts and "Rx:" in parts[0]:
-                recv = []
-                for tag in ["Y:", "P:", "T:", "R:"]:
-                    for tok in parts[0].split():
-                        if tok.startswith(tag):
-                            recv.append(int(tok.replace(tag, "")))
-                            break
-                if len(recv) == 4:
-                    self.latest_arduino_data["receiver"] = recv
-
-            if len(parts) > 3 and "PWM:" in parts[3]:
-                pwm = []
-                for i in range(self.num_motors):
-                    label = f"M{i+1}:"
-                    for tok in parts[3].split():
-                        if tok.startswith(label):
-                            pwm.append(int(tok.replace(label, "")))
-                            break
-                if len(pwm) == self.num_motors:
-                    self.latest_arduino_data["motor_pwm"] = pwm
-
-            if len(parts) > 4 and "Ang:" in parts[4]:
-                for axis, key in zip(["X:", "Y:", "Z:"], ["roll", "pitch", "yaw"]):
-                    for tok in parts[4].split():
-                        if tok.startswith(axis):
-                            self.latest_arduino_data[key] = float(tok.replace(axis, ""))
-                            break
-
-            if len(parts) > 5 and "Current:" in parts[5]:
-                curr = []
-                for i in range(self.num_motors):
-                    label = f"M{i+1}:"
-                    for tok in parts[5].split():
-                        if tok.startswith(label):
-                            curr.append(float(tok.replace(label, "")))
-                            break
-                if len(curr) == self.num_motors:
-                    self.latest_arduino_data["motor_currents"] = curr
-
-            self.latest_arduino_data["last_update"] = datetime.now(timezone.utc)
-        except Exception as exc:
-            logging.error("Error parsing '%s': %s", text, exc)
+    def _handle_frames(self, frames: List[bytes], binary: bool) -> Optional[int]:
+        """Decode one batch of frames from the ingestor (text lines or COBS packets).
+
+        Returns how many binary packets were rejected, so the assembler can
+        fall back to text framing.
+        """
+        with TIMINGS.measure("serial.parse"):
+            return self._decode_frames(frames, binary)
+
+    def _arrival_times(self, n: int, nbytes: int) -> np.ndarray:
+        """Epoch arrival estimates for the *n* frames of one read batch.
+
+        A bulk read returns every frame that queued up since the previous
+        read, so the stamps are spread evenly from that read to now, but
+        never further back than *nbytes* take on the wire at the configured
+        baud rate (an idle gap before a batch is not smeared into it).
+        """
+        now = time.monotonic()
+        wire = nbytes * 10.0 / self.arduino_baudrate   # 8N1
+        start = max(self._last_read, now - wire)
+        self._last_read = now
+        return self._epoch_offset + start + (now - start) * np.arange(1, n + 1) / n
+
+    def _decode_frames(self, frames: List[bytes], binary: bool) -> Optional[int]:
+        nbytes = sum(map(len, frames)) + len(frames)   # plus one delimiter each
+        if binary:
+            return self._handle_binary(frames, nbytes)
+
+        if self.sampling_mode != "stream":
+            for frame in frames:
+                self._parse_line(frame)
+            return None
+
+        rows = []
+        rec = self.parser.record
+        nan = float("nan")
+        arrival = self._arrival_times(len(frames), nbytes).tolist()
+        for i, frame in enumerate(frames):
+            if self._parse_line(frame):
+                rows.append([arrival[i], *rec.motor_currents, rec.roll, rec.pitch, rec.yaw,
+                             *rec.motor_pwm, *rec.receiver, nan, nan, nan])
+        if rows:
+            self.sample_queue.push(np.array(rows, dtype=np.float64))
+        return None
+
+    def _parse_line(self, text: bytes | str) -> int:
+        """Decode one Arduino text line and publish it to ``latest_arduino_data``."""
+        mask = self.parser.parse(text)
+        if not mask:
+            logging.debug("Unparseable line: %r", text)
+            return 0
+        self._publish(mask)
+        return mask
+
+    def _handle_binary(self, packets: List[bytes], nbytes: int) -> int:
+        """Decode COBS packets in one go; corrupt frames are counted, not raised."""
+        frames = self.frame_decoder.decode_batch(packets)
+        if not len(frames):
+            return len(packets)
+        last = frames[-1]
+        rec = self.parser.record
+        rec.receiver[:]       = last["receiver"].tolist()
+        rec.motor_pwm[:]      = last["pwm"].tolist()
+        rec.roll, rec.pitch, rec.yaw = last["angles"].tolist()
+        rec.motor_currents[:] = last["currents"].tolist()
+        self._publish(RX | PWM | ANG | CUR)
+
+        if self.sampling_mode == "stream":
+            n = len(frames)
+            self.sample_queue.push(np.column_stack([
+                self._arrival_times(n, nbytes), frames["currents"], frames["angles"],
+                frames["pwm"], frames["receiver"], np.full((n, 3), np.nan),
+            ]).astype(np.float64, copy=False))
+        return len(packets) - len(frames)
+
+    def _publish(self, mask: int) -> None:
+        rec, latest = self.parser.record, self.latest_arduino_data
+        if mask & RX:
+            latest["receiver"] = list(rec.receiver)
+        if mask & PWM:
+            latest["motor_pwm"] = list(rec.motor_pwm)
+        if mask & ANG:
+            latest["roll"], latest["pitch"], latest["yaw"] = rec.roll, rec.pitch, rec.yaw
+        if mask & CUR:
+            latest["motor_currents"] = list(rec.motor_currents)
+        latest["last_update"] = time.time()
 
     # ------------------------------------------------------------------ cyclic update (no simulation)
 
     def update_data(self) -> None:
-        ts = datetime.now(timezone.utc)
-        self.time_buffer.append(ts.timestamp())
+        if self.sampling_mode == "stream":
+            self._drain_samples()
+            return
+
+        ts = time.time()  # float epoch seconds, like every "time" sample
 
         # decide if we have fresh serial data (<2 s old)
         has_recent = (
             self.latest_arduino_data["last_update"] is not None and
-            (ts - self.latest_arduino_data["last_update"]).total_seconds() < 2.0
+            ts - self.latest_arduino_data["last_update"] < 2.0
         )
 
-        # 1. motor currents ------------------------------------------------
-        if has_recent:
-            vals = self.latest_arduino_data["motor_currents"]
-        else:
-            vals = [0.0] * self.num_motors
-        for i, val in enumerate(vals):
-            self.motor_currents[i].append(val)
-
-        # 2. orientation ---------------------------------------------------
-        if has_recent:
-            orient = [self.latest_arduino_data[k] for k in ("roll", "pitch", "yaw")]
-        else:
-            orient = [0.0, 0.0, 0.0]
-        for i, v in enumerate(orient):
-            self.orientation[i].append(v)
-
-        # 3. motor‑PWM -----------------------------------------------------
         if has_recent:
-            pwm_vals = self.latest_arduino_data["motor_pwm"]
-        else:
-            pwm_vals = [1000] * self.num_motors
-        for i, v in enumerate(pwm_vals):
-            self.motor_pwm[i].append(v)
-
-        # 4. receiver channels + expose dict ------------------------------
-        if has_recent:
-            recv_vals = self.latest_arduino_data["receiver"]
+            latest    = self.latest_arduino_data
+            vals      = latest["motor_currents"]
+            orient    = [latest[k] for k in ("roll", "pitch", "yaw")]
+            pwm_vals  = latest["motor_pwm"]
+            recv_vals = latest["receiver"]
         else:
+            vals      = [0.0] * self.num_motors
+            orient    = [0.0, 0.0, 0.0]
+            pwm_vals  = [1000] * self.num_motors
             recv_vals = [1500, 1500, 1000, 1500]
-        for i, v in enumerate(recv_vals):
-            self.receiver_channels[i].append(v)
         self.pwm_iBus = {"yaw": recv_vals[0], "pit": recv_vals[1], "thr": recv_vals[2], "rol": recv_vals[3]}
 
-        # 5. altitude (keep last or zero) ----------------------------------
-        alt = self.altitude[-1] if self.altitude else 0.0
-        self.altitude.append(alt)
-
-        # 6. battery stays flat until real packets report voltage ----------
-        prev_v = self.battery_voltage[-1] if self.battery_voltage else 12.6
+        # altitude keeps its last value; battery stays flat until real
+        # packets report voltage
+        alt    = self.store.latest("altitude", 0.0)
+        prev_v = self.store.latest("battery_voltage", 12.6)
         pct    = (prev_v / 12.6) * 100.0
-        self.battery_voltage.append(prev_v)
-        self.battery_percentage.append(pct)
 
-        # 7. GPS values remain as set externally (zeros by default) --------
-        # (No change when not connected)
+        # GPS values remain as set externally (zeros by default)
 
+        row = [ts, *vals, *orient, *pwm_vals, *recv_vals, alt, prev_v, pct]
+        with TIMINGS.measure("store.append"):
+            self.store.append(row)
+            self._record(row)
+        self.dataUpdated.emit()
+
+    def _drain_samples(self) -> None:
+        """Move every queued frame into the ring buffer (stream mode)."""
+        rows = self.sample_queue.drain()
+        if rows is None:
+            return
+
+        # altitude / battery are not part of the serial frame: carry them on
+        alt    = self.store.latest("altitude", 0.0)
+        prev_v = self.store.latest("battery_voltage", 12.6)
+        rows[:, -3:] = (alt, prev_v, (prev_v / 12.6) * 100.0)
+        with TIMINGS.measure("store.append"):
+            self.store.extend(rows)
+            self._record(rows)
+
+        yaw, pit, thr, rol = rows[-1, -7:-3].astype(int).tolist()
+        self.pwm_iBus = {"yaw": yaw, "pit": pit, "thr": thr, "rol": rol}
         self.dataUpdated.emit()
 
     # ------------------------------------------------------------------ public start/stop
 
     def start(self) -> None:
-        if self.arduino_port and not self.serial_connected:
+        if self.recorder is None:
+            # logs of a session that crashed; listed now, before this
+            # session's own log can appear
+            pending = pending_logs(self.log_dir)
+            if pending:
+                self._in_background(self._recover, pending)
+        self.running = True
+        if self.arduino_port:
             self.connect_to_arduino()
-        if self.serial_connected:
-            self.start_serial_thread()
-        self.timer.start(200)
-        logging.info("DataHandler started")
+        self.timer.start(self.update_interval)
+        logging.info("DataHandler started (%s sampling)", self.sampling_mode)
 
     def stop(self) -> None:
         self.timer.stop()
-        self.stop_serial_thread()
+        self.running = False
         self.disconnect_from_arduino()
-        self._save_to_excel()
-        logging.info("DataHandler stopped and file saved")
+        if self.recorder is not None:
+            self.recorder.stop()
+            self.recorder = None
+            self._in_background(self._finalize, self.log_path,
+                                self.config.get("export_excel_on_stop", False))
+        logging.info("DataHandler stopped and flight log closed")
+
+    def wait_for_logs(self, timeout: float | None = None) -> None:
+        """Block until queued compaction / recovery is done (application exit)."""
+        if self._log_worker is not None:
+            self._log_worker.join(timeout)
 
     # ------------------------------------------------------------------ persistence
 
-    def _save_to_excel(self) -> None:
-        readable = [datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S.%f")
-                    for ts in self.time_buffer]
-        df_dict: Dict[str, List[Any]] = {"Timestamp": readable}
+    def _in_background(self, job, *args) -> None:
+        """Run *job* on a log worker thread once the previously queued job finished."""
+        previous = self._log_worker
 
-        for i in range(self.num_motors):
-            df_dict[f"Motor{i+1}"]       = list(self.motor_currents[i])
-            df_dict[f"Motor{i+1}_PWM"]   = list(self.motor_pwm[i])
+        def run() -> None:
+            if previous is not None:
+                previous.join()
+            job(*args)
 
-        df_dict["Roll"]  = list(self.orientation[0])
-        df_dict["Pitch"] = list(self.orientation[1])
-        df_dict["Yaw"]   = list(self.orientation[2])
+        # not a daemon: an exit right after stop still completes the log
+        self._log_worker = threading.Thread(target=run, name="flight log")
+        self._log_worker.start()
 
-        names = ["Yaw", "Pitch", "Throttle", "Roll"]
-        for i, n in enumerate(names):
-            df_dict[f"Rx_{n}"] = list(self.receiver_channels[i])
-
-        df_dict["Altitude"]   = list(self.altitude)
-        df_dict["Voltage"]    = list(self.battery_voltage)
-        df_dict["Percentage"] = list(self.battery_percentage)
+    def _emit_finalized(self, qlog_path: str, qcol_path: str) -> None:
+        try:
+            self.logFinalized.emit(qlog_path, qcol_path)   # queued to the GUI thread
+        except RuntimeError:               # handler already deleted at exit
+            pass
 
-        df = pd.DataFrame(df_dict)
+    def _finalize(self, qlog_path: str, export_excel: bool) -> None:
+        try:
+            qcol_path = finalize_log(qlog_path)
+        except Exception as exc:  # the raw .qlog stays for recover_logs()
+            logging.error("Cannot compact flight log %s: %s", qlog_path, exc)
+            self._emit_finalized(qlog_path, "")
+            return
+        if self.log_path == qlog_path:
+            self.log_path = qcol_path
+        if export_excel:
+            self._save_to_excel(qcol_path)
+        self._emit_finalized(qlog_path, qcol_path)
+
+    def _recover(self, paths: List[str]) -> None:
+        for qlog_path in paths:
+            for qcol_path in recover_logs(self.log_dir, [qlog_path]):
+                self._emit_finalized(qlog_path, qcol_path)
+
+    def _record(self, rows) -> None:
+        """Hand samples to the flight recorder, opening a new log on first use."""
+        if self.recorder is None:
+            self.log_path = session_path(self.log_dir)
+            self.recorder = FlightRecorder(self.log_path, self.store.columns,
+                                           self.log_flush_interval)
+            try:
+                self.recorder.start()
+            except OSError as exc:
+                logging.error("Cannot open flight log %s: %s", self.log_path, exc)
+                self.recorder = None
+                return
+        self.recorder.append(rows)
+
+    def _save_to_excel(self, path: str) -> None:
+        """Optional conversion of the finished flight log to Excel."""
         try:
-            df.to_excel("quadcopter_data.xlsx", index=False)
+            export_excel(path, "quadcopter_data.xlsx")
         except Exception as exc:
             logging.error("Excel save error: %s", exc)
 
-
     def updateConfig(self, new_config: Dict[str, Any]) -> None:
         """Update configuration and resize buffers if requested."""
         if "buffer_size" in new_config:
             new_len = new_config["buffer_size"]
             self.buffer_size = new_len
-            self.time_buffer     = deque(self.time_buffer,     maxlen=new_len)
-            self.motor_currents  = [deque(m, maxlen=new_len) for m in self.motor_currents]
-            self.orientation     = [deque(o, maxlen=new_len) for o in self.orientation]
-            self.altitude        = deque(self.altitude,        maxlen=new_len)
-            self.battery_voltage = deque(self.battery_voltage, maxlen=new_len)
-            self.battery_percentage = deque(self.battery_percentage, maxlen=new_len)
-            self.motor_pwm       = [deque(m, maxlen=new_len) for m in self.motor_pwm]
-            self.receiver_channels = [deque(r, maxlen=new_len) for r in self.receiver_channels]
+            self.store.resize(new_len)  # keeps the newest samples
             logging.info(f"DataHandler buffer size updated to {new_len}")
 
-        # Reconnect logic for Arduino port/baud can go here if you expose those in your config tab
+        if new_config.get("sampling_mode", self.sampling_mode) != self.sampling_mode:
+            self.sampling_mode = new_config["sampling_mode"]
+            self.sample_queue.drain()  # discard frames queued under the old mode
+            if self.timer.isActive():
+                self.timer.start(self.update_interval)
+            logging.info(f"DataHandler sampling mode set to {self.sampling_mode}")
+
+        if new_config.get("stream_drain_ms", self.stream_drain_ms) != self.stream_drain_ms:
+            self.stream_drain_ms = int(new_config["stream_drain_ms"])
+            if self.timer.isActive():
+                self.timer.start(self.update_interval)
+
+        # takes effect with the next flight log
+        self.log_dir = new_config.get("log_dir", self.log_dir)
+        if "export_excel_on_stop" in new_config:
+            self.config["export_excel_on_stop"] = new_config["export_excel_on_stop"]
+
+        # reconnects (in the background) only if the port settings changed
+        self.arduino_port     = new_config.get("arduino_port", self.arduino_port)
+        self.arduino_baudrate = new_config.get("arduino_baudrate", self.arduino_baudrate)
+        self.serial_link.backoff_max = new_config.get("serial_reconnect_max", self.serial_link.backoff_max)
+        self.serial_link.configure(self.arduino_port, self.arduino_baudrate)
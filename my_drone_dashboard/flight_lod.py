@@ -0,0 +1,152 @@
+#flight_lod.py
+
+"""Min/max level-of-detail pyramid for flight log plots.
+
+Level 0 holds, for every ``BASE_ROWS`` consecutive samples of every
+channel, the minimum and maximum value; each further level merges
+``FACTOR`` bins of the one below, until a level has at most ``TOP_BINS``
+bins.  For the sorted ``time`` channel the pair is simply the first and
+last timestamp of the bin.
+
+A plot showing ``k`` samples on ``w`` pixels picks the finest level with
+at most ``w`` bins in range and draws each bin as a vertical min/max
+segment, so it never handles more than about ``2 * w`` points and spikes
+are never dropped.
+
+Saved next to the ``.qcol`` as ``.qlod``::
+
+    MAGIC (8 bytes) | uint32 header length | JSON header | padding
+    level 0: float64[len(columns), bins, 2] | padding | level 1 | ...
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+MAGIC     = b"QCLOD\x00\x01\x00"
+PAGE      = 4096
+BASE_ROWS = 16
+FACTOR    = 4
+TOP_BINS  = 256
+
+
+def _align(n: int) -> int:
+    return -(-n // PAGE) * PAGE
+
+
+def _reduce(lo: np.ndarray, hi: np.ndarray, width: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Min of *lo* and max of *hi* over consecutive groups of *width* (NaN ignored)."""
+    starts = np.arange(0, lo.shape[-1], width)
+    return np.fmin.reduceat(lo, starts, axis=-1), np.fmax.reduceat(hi, starts, axis=-1)
+
+
+class LodPyramid:
+    """Per-channel min/max pyramid; ``levels[k]`` has shape ``(channels, bins, 2)``."""
+
+    def __init__(self, columns: Sequence[str], rows: int, levels: List[np.ndarray]) -> None:
+        self.columns = list(columns)
+        self.rows    = rows
+        self.levels  = levels
+        self._index  = {name: i for i, name in enumerate(self.columns)}
+        self._time   = self._index["time"]
+
+    # ------------------------------------------------------------------ build / persist
+
+    @classmethod
+    def build(cls, data: Mapping[str, np.ndarray], columns: Sequence[str]) -> "LodPyramid":
+        """Compute the pyramid from full-resolution channel arrays."""
+        columns = list(columns)
+        rows = len(data[columns[0]])
+        if not rows:
+            return cls(columns, 0, [])
+        starts = np.arange(0, rows, BASE_ROWS)
+        lo = np.empty((len(columns), len(starts)))
+        hi = np.empty_like(lo)
+        for j, name in enumerate(columns):
+            col = np.asarray(data[name])
+            lo[j] = np.fmin.reduceat(col, starts)
+            hi[j] = np.fmax.reduceat(col, starts)
+
+        levels = [np.stack((lo, hi), axis=-1)]
+        while lo.shape[1] > TOP_BINS:
+            lo, hi = _reduce(lo, hi, FACTOR)
+            levels.append(np.stack((lo, hi), axis=-1))
+        return cls(columns, rows, levels)
+
+    def save(self, path: str) -> None:
+        header = json.dumps({
+            "columns":   self.columns,
+            "rows":      self.rows,
+            "base_rows": BASE_ROWS,
+            "factor":    FACTOR,
+            "bins":      [lvl.shape[1] for lvl in self.levels],
+        }).encode()
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + struct.pack("<I", len(header)) + header)
+            offset = _align(len(MAGIC) + 4 + len(header))
+            for lvl in self.levels:
+                f.seek(offset)
+                f.write(np.ascontiguousarray(lvl, dtype="<f8").tobytes())
+                offset = _align(offset + lvl.nbytes)
+            f.truncate(offset)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "LodPyramid":
+        """Memory-map a saved pyramid."""
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a LOD pyramid")
+            (hlen,) = struct.unpack("<I", f.read(4))
+            header: Dict[str, Any] = json.loads(f.read(hlen))
+        if header["base_rows"] != BASE_ROWS or header["factor"] != FACTOR:
+            raise ValueError(f"{path} uses a different pyramid layout")
+
+        ncols  = len(header["columns"])
+        offset = _align(len(MAGIC) + 4 + hlen)
+        levels = []
+        for bins in header["bins"]:
+            levels.append(np.memmap(path, dtype="<f8", mode="r",
+                                    offset=offset, shape=(ncols, bins, 2)))
+            offset = _align(offset + ncols * bins * 16)
+        return cls(header["columns"], header["rows"], levels)
+
+    # ------------------------------------------------------------------ query
+
+    def bin_rows(self, level: int) -> int:
+        return BASE_ROWS * FACTOR ** level
+
+    def envelope(self, name: str, i0: int, i1: int, max_bins: int,
+                 data: Mapping[str, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Min/max envelope of rows ``[i0, i1)`` using at most ~*max_bins* bins.
+
+        Returns ``(x, y)`` with two points per bin, both at the bin's first
+        timestamp: ``y`` alternates bin minimum and maximum.  The two edge
+        bins usually stick out of ``[i0, i1)``; they are recomputed from the
+        raw columns in *data* so no sample outside the range is drawn.
+        """
+        level = 0
+        while level < len(self.levels) - 1 and \
+                -(-(i1 - i0) // self.bin_rows(level)) > max_bins:
+            level += 1
+        size = self.bin_rows(level)
+        b0, b1 = i0 // size, -(-i1 // size)
+        lvl = self.levels[level]
+        x = np.repeat(lvl[self._time, b0:b1, 0], 2)
+        y = np.array(lvl[self._index[name], b0:b1]).ravel()
+
+        col, time = data[name], data["time"]
+        for b in {b0, b1 - 1}:
+            lo, hi = max(i0, b * size), min(i1, (b + 1) * size)
+            if (lo, hi) == (b * size, min(self.rows, (b + 1) * size)):
+                continue   # bin lies inside the range
+            k = 2 * (b - b0)
+            x[k:k + 2] = time[lo]
+            y[k], y[k + 1] = np.fmin.reduce(col[lo:hi]), np.fmax.reduce(col[lo:hi])
+        return x, y
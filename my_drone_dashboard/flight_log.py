@@ -0,0 +1,316 @@
+#flight_log.py
+
+"""Columnar flight log (``.qcol``) for instant reload.
+
+When a recording stops, the row-major ``.qlog`` written by
+:class:`flight_recorder.FlightRecorder` is compacted into a column-major
+file::
+
+    MAGIC (8 bytes) | uint32 header length | JSON header | padding
+    column 0: float64[rows] | padding | column 1 | padding | ...
+    block index: float64[ceil(rows / BLOCK_ROWS)]
+
+Every column starts on a ``PAGE`` boundary, so :class:`FlightLog` maps
+the whole file once with ``numpy.memmap`` and hands out each channel as a
+zero-copy array; only the pages that are actually touched get read.  The
+``time`` column is sorted ascending and serves as the time index; the
+block index holds its value at the start of every ``BLOCK_ROWS`` rows
+(one page of a column), so a time lookup bisects that small in-memory
+array and then a single page of ``time``.
+
+A min/max pyramid for plotting (:mod:`flight_lod`) is stored alongside
+as ``.qlod``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from flight_lod import LodPyramid
+from flight_recorder import open_raw
+from utils.timestamps import format_epoch, parse_local
+
+MAGIC = b"QCCOL\x00\x01\x00"
+PAGE  = 4096
+BLOCK_ROWS = PAGE // 8
+
+
+def _align(n: int) -> int:
+    return -(-n // PAGE) * PAGE
+
+
+def write_columnar(path: str, columns: Sequence[str], rows: np.ndarray,
+                   created: Optional[float] = None) -> None:
+    """Write *rows* (shape ``(n, len(columns))``) as a ``.qcol`` file.
+
+    The file is built next to *path* and renamed into place, so readers
+    never see a half-written log.
+    """
+    columns = list(columns)
+    n = len(rows)
+    t = rows[:, columns.index("time")]
+    header = json.dumps({
+        "columns": columns,
+        "dtype":   "<f8",
+        "rows":    n,
+        "created": created,
+        "t_first": float(t[0]) if n else None,
+        "t_last":  float(t[-1]) if n else None,
+        "block_rows": BLOCK_ROWS,
+    }).encode()
+    start  = _align(len(MAGIC) + 4 + len(header))
+    stride = _align(n * 8)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(header)) + header)
+        for j in range(len(columns)):
+            f.seek(start + j * stride)
+            f.write(np.ascontiguousarray(rows[:, j], dtype="<f8").tobytes())
+        f.seek(start + len(columns) * stride)
+        f.write(np.ascontiguousarray(t[::BLOCK_ROWS], dtype="<f8").tobytes())
+        f.truncate(start + len(columns) * stride + 8 * -(-n // BLOCK_ROWS))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def finalize_log(qlog_path: str) -> str:
+    """Compact a finished ``.qlog`` into ``.qcol`` and drop the raw files.
+
+    Returns the path of the columnar log.
+    """
+    header, rows = open_raw(qlog_path)
+    columns: List[str] = header["columns"]
+    t = rows[:, columns.index("time")]
+    if len(t) > 1 and (np.diff(t) < 0).any():   # wall-clock steps (timer mode)
+        rows = rows[np.argsort(t, kind="stable")]
+
+    qcol_path = os.path.splitext(qlog_path)[0] + ".qcol"
+    write_columnar(qcol_path, columns, rows, header.get("created"))
+    del rows, t  # release the map before removing the file
+    FlightLog(qcol_path).lod  # build and save the plot pyramid now
+
+    os.remove(qlog_path)
+    idx = os.path.splitext(qlog_path)[0] + ".qidx"
+    if os.path.exists(idx):
+        os.remove(idx)
+    logging.info("Flight log compacted to %s", qcol_path)
+    return qcol_path
+
+
+def pending_logs(log_dir: str) -> List[str]:
+    """Raw ``.qlog`` files in *log_dir* (recorded but never compacted)."""
+    try:
+        names = sorted(n for n in os.listdir(log_dir) if n.endswith(".qlog"))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(log_dir, name) for name in names]
+
+
+def recover_logs(log_dir: str, paths: Optional[List[str]] = None) -> List[str]:
+    """Finalize ``.qlog`` files left behind by a session that never stopped.
+
+    *paths* defaults to :func:`pending_logs`; pass a snapshot taken before
+    a new recording starts so that one is never touched.
+    """
+    recovered = []
+    for path in pending_logs(log_dir) if paths is None else paths:
+        if not os.path.exists(path):   # compacted meanwhile
+            continue
+        try:
+            recovered.append(finalize_log(path))
+        except Exception as exc:
+            logging.error("Cannot recover flight log %s: %s", os.path.basename(path), exc)
+    return recovered
+
+
+class FlightLog:
+    """Read-only, memory-mapped view of a ``.qcol`` file.
+
+    ``log["motor1_current"]`` returns a zero-copy ``float64`` array
+    (oldest first); the arrays stay valid while the log object is alive.
+    :meth:`query`, :meth:`tail` and :meth:`slice` return a
+    :class:`LogSlice` over a row range in O(log n), without reading data.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a columnar flight log")
+            (hlen,) = struct.unpack("<I", f.read(4))
+            self.header: Dict[str, Any] = json.loads(f.read(hlen))
+
+        self.path    = path
+        self.columns: List[str] = self.header["columns"]
+        self.rows: int = self.header["rows"]
+        self._index  = {name: i for i, name in enumerate(self.columns)}
+        self._lod: Optional[LodPyramid] = None
+        if not self.rows:
+            self._map = np.zeros((len(self.columns), 0))
+            self.block_rows  = BLOCK_ROWS
+            self.block_index = np.empty(0)
+            return
+
+        start  = _align(len(MAGIC) + 4 + hlen)
+        stride = _align(self.rows * 8) // 8
+        self._map = np.memmap(path, dtype=self.header["dtype"], mode="r",
+                              offset=start, shape=(len(self.columns), stride))
+        self.block_rows = self.header.get("block_rows")
+        if self.block_rows:
+            nblocks = -(-self.rows // self.block_rows)
+            self.block_index = np.array(np.memmap(
+                path, dtype="<f8", mode="r", shape=(nblocks,),
+                offset=start + len(self.columns) * stride * 8))
+        else:  # written before the block index existed
+            self.block_rows  = BLOCK_ROWS
+            self.block_index = np.array(self.time[::BLOCK_ROWS])
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._map[self._index[name], :self.rows]
+
+    def get(self, name: str, default: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        return self[name] if name in self._index else default
+
+    @property
+    def time(self) -> np.ndarray:
+        return self["time"]
+
+    # ------------------------------------------------------------------ range queries
+
+    def search(self, t: float, side: str = "left") -> int:
+        """``np.searchsorted(self.time, t, side)`` touching one page of ``time``."""
+        b  = int(np.searchsorted(self.block_index, t, side))
+        lo = max(0, (b - 1) * self.block_rows)
+        hi = min(self.rows, b * self.block_rows)
+        return lo + int(np.searchsorted(self.time[lo:hi], t, side))
+
+    def query(self, t0: float, t1: float) -> "LogSlice":
+        """Samples with ``t0 <= time <= t1``."""
+        return LogSlice(self, self.search(t0, "left"), self.search(t1, "right"))
+
+    def tail(self, seconds: float) -> "LogSlice":
+        """The last *seconds* of the flight."""
+        if not self.rows:
+            return LogSlice(self, 0, 0)
+        return LogSlice(self, self.search(float(self.time[-1]) - seconds), self.rows)
+
+    def slice(self, i0: Optional[int], i1: Optional[int]) -> "LogSlice":
+        """Rows ``i0:i1`` (Python slice semantics)."""
+        start, stop, _ = slice(i0, i1).indices(self.rows)
+        return LogSlice(self, start, stop)
+
+    # ------------------------------------------------------------------ plotting
+
+    @property
+    def lod(self) -> LodPyramid:
+        """The ``.qlod`` pyramid, built (and saved if possible) on first use."""
+        if self._lod is None:
+            lod_path = os.path.splitext(self.path)[0] + ".qlod"
+            try:
+                self._lod = LodPyramid.load(lod_path)
+            except (OSError, ValueError):
+                self._lod = LodPyramid.build(self, self.columns)
+                try:
+                    self._lod.save(lod_path)
+                except OSError as exc:
+                    logging.error("Cannot save plot pyramid %s: %s", lod_path, exc)
+        return self._lod
+
+    def envelope(self, name: str, t0: float, t1: float, max_points: int,
+                 start: int = 0, stop: Optional[int] = None):
+        """``(x, y)`` of *name* over ``[t0, t1]`` in at most ~*max_points* points.
+
+        Raw samples when they fit, otherwise the pyramid's min/max envelope.
+        One extra sample on each side keeps the line running off-screen.
+        """
+        stop = self.rows if stop is None else stop
+        i0 = max(start, self.search(t0) - 1)
+        i1 = min(stop, self.search(t1, "right") + 1)
+        if i1 - i0 <= max_points:
+            return self.time[i0:i1], self[name][i0:i1]
+        return self.lod.envelope(name, i0, i1, max_points // 2, self)
+
+
+class LogSlice:
+    """Row range ``[start, stop)`` of a :class:`FlightLog`; columns are views."""
+
+    def __init__(self, log: FlightLog, start: int, stop: int) -> None:
+        self.log   = log
+        self.start = start
+        self.stop  = max(start, stop)
+        self.columns = log.columns
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.log
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.log[name][self.start:self.stop]
+
+    def get(self, name: str, default: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        return self[name] if name in self.log else default
+
+    @property
+    def time(self) -> np.ndarray:
+        return self["time"]
+
+    def envelope(self, name: str, t0: float, t1: float, max_points: int):
+        return self.log.envelope(name, t0, t1, max_points, self.start, self.stop)
+
+
+# ---------------------------------------------------------------------- Excel
+
+def excel_columns(num_motors: int = 4) -> List[Tuple[str, str]]:
+    """``(Excel header, channel)`` pairs of the legacy quadcopter_data.xlsx layout."""
+    pairs: List[Tuple[str, str]] = []
+    for i in range(num_motors):
+        pairs += [(f"Motor{i+1}", f"motor{i+1}_current"), (f"Motor{i+1}_PWM", f"motor{i+1}_pwm")]
+    pairs += [("Roll", "roll"), ("Pitch", "pitch"), ("Yaw", "yaw")]
+    pairs += [(f"Rx_{name}", f"rx_{name.lower()}") for name in ("Yaw", "Pitch", "Throttle", "Roll")]
+    pairs += [("Altitude", "altitude"), ("Voltage", "battery_voltage"),
+              ("Percentage", "battery_percentage")]
+    return pairs
+
+
+def export_excel(log_path: str, xlsx_path: str = "quadcopter_data.xlsx") -> None:
+    """Convert a ``.qcol`` flight log to the legacy Excel layout."""
+    log = FlightLog(log_path)
+    n_motors = sum(1 for c in log.columns if c.endswith("_current"))
+
+    out: Dict[str, Any] = {"Timestamp": format_epoch(log.time)}
+    for header, channel in excel_columns(n_motors):
+        out[header] = log[channel]
+    pd.DataFrame(out).to_excel(xlsx_path, index=False)
+
+
+def import_excel(xlsx_path: str, qcol_path: str) -> str:
+    """Convert a legacy quadcopter_data.xlsx into a ``.qcol`` flight log."""
+    df = pd.read_excel(xlsx_path)
+    n_motors = sum(1 for c in df.columns if c.startswith("Motor") and c[5:].isdigit())
+    pairs = excel_columns(n_motors)
+
+    rows = np.full((len(df), len(pairs) + 1), np.nan)
+    rows[:, 0] = parse_local(df["Timestamp"])
+    for j, (header, _) in enumerate(pairs, start=1):
+        if header in df:
+            rows[:, j] = df[header].to_numpy(dtype=np.float64)
+    rows = rows[np.argsort(rows[:, 0], kind="stable")]
+    write_columnar(qcol_path, ["time"] + [c for _, c in pairs], rows)
+    logging.info("Imported %s into %s", xlsx_path, qcol_path)
+    return qcol_path
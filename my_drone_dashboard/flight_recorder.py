@@ -0,0 +1,180 @@
+#flight_recorder.py
+
+"""Append-only flight recorder.
+
+Every sample that reaches ``DataHandler.store`` is also handed to a
+:class:`FlightRecorder`, which writes it from a background thread to a raw
+binary log (``.qlog``) plus a block index (``.qidx``):
+
+``.qlog``  ``MAGIC`` (8 bytes), ``uint32`` header length, JSON header
+           (``columns``, ``dtype``, ``created``), then rows of
+           ``float64[len(columns)]`` back to back, oldest first.
+``.qidx``  one ``<QQdd`` record per flush: first row, row count, first and
+           last timestamp of the block.
+
+Rows are only ever appended and both files are fsync'ed on every flush,
+so a crash loses at most one ``flush_interval`` of samples.  Finished
+logs are compacted into the columnar format of :mod:`flight_log`.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"QCLOG\x00\x01\x00"
+INDEX_RECORD = struct.Struct("<QQdd")
+
+
+SESSION_SUFFIXES = (".qlog", ".qidx", ".qcol", ".qlod")   # every file of one flight
+
+
+def session_path(log_dir: str, when: Optional[datetime] = None) -> str:
+    """``<log_dir>/flight_YYYYmmdd_HHMMSS.qlog`` (``_02``, ``_03``… if taken) for a new recording.
+
+    The counter keeps a stop and start within the same second from
+    reopening a finished flight, and still sorts after the first name.
+    """
+    when = when or datetime.now()
+    base = stem = os.path.join(log_dir, when.strftime("flight_%Y%m%d_%H%M%S"))
+    n = 1
+    while any(os.path.exists(stem + suffix) for suffix in SESSION_SUFFIXES):
+        n += 1
+        stem = f"{base}_{n:02d}"
+    return stem + ".qlog"
+
+
+def latest_log(log_dir: str, suffix: str = ".qlog") -> Optional[str]:
+    """Most recent log in *log_dir*, or ``None``."""
+    try:
+        names = sorted(n for n in os.listdir(log_dir) if n.endswith(suffix))
+    except FileNotFoundError:
+        return None
+    return os.path.join(log_dir, names[-1]) if names else None
+
+
+class FlightRecorder:
+    """Buffers sample blocks in memory and appends them to disk periodically."""
+
+    def __init__(self, path: str, columns: Sequence[str], flush_interval: float = 1.0) -> None:
+        self.path           = path
+        self.index_path     = os.path.splitext(path)[0] + ".qidx"
+        self.columns        = list(columns)
+        self.flush_interval = flush_interval
+        self.rows_written   = 0
+        self._pending: Deque[np.ndarray] = deque()
+        self._wake   = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._log = None
+        self._idx = None
+
+    # ------------------------------------------------------------------ life-cycle
+
+    def start(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        header = json.dumps({
+            "columns": self.columns,
+            "dtype":   "<f8",
+            "created": time.time(),
+        }).encode()
+        self._log = open(self.path, "wb")
+        self._log.write(MAGIC + struct.pack("<I", len(header)) + header)
+        self._log.flush()
+        self._idx = open(self.index_path, "wb")
+
+        self._thread = threading.Thread(target=self._run, name="FlightRecorder", daemon=True)
+        self._thread.start()
+        logging.info("Flight recorder writing to %s", self.path)
+
+    def stop(self) -> None:
+        """Flush everything still pending and close the files."""
+        if self._thread is None:
+            return
+        thread, self._thread = self._thread, None
+        self._wake.set()
+        thread.join()
+        self._flush()
+        self._log.close()
+        self._idx.close()
+        logging.info("Flight recorder closed %s (%d rows)", self.path, self.rows_written)
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None
+
+    # ------------------------------------------------------------------ producer side
+
+    def append(self, rows: np.ndarray) -> None:
+        """Queue a ``(n, len(columns))`` block (or one row); never blocks on I/O."""
+        rows = np.asarray(rows, dtype="<f8")
+        if rows.ndim == 1:
+            rows = rows[np.newaxis, :]
+        self._pending.append(rows)
+
+    # ------------------------------------------------------------------ writer thread
+
+    def _run(self) -> None:
+        while self._thread is not None:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._flush()
+            except Exception as exc:
+                logging.error("Flight recorder write error: %s", exc)
+
+    def _flush(self) -> None:
+        pending = self._pending
+        n = len(pending)
+        if not n:
+            return
+        blocks = [pending.popleft() for _ in range(n)]
+        rows = blocks[0] if n == 1 else np.concatenate(blocks)
+
+        self._log.write(np.ascontiguousarray(rows).tobytes())
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+        time_col = self.columns.index("time")
+        self._idx.write(INDEX_RECORD.pack(
+            self.rows_written, len(rows), rows[0, time_col], rows[-1, time_col]))
+        self._idx.flush()
+        os.fsync(self._idx.fileno())
+        self.rows_written += len(rows)
+
+
+# ---------------------------------------------------------------------- reading
+
+def open_raw(path: str) -> Tuple[Dict[str, Any], np.ndarray]:
+    """Header and ``(rows, len(columns))`` memory map of a ``.qlog``.
+
+    A trailing partial row from an interrupted write is ignored.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a flight log")
+        (hlen,) = struct.unpack("<I", f.read(4))
+        header: Dict[str, Any] = json.loads(f.read(hlen))
+
+    ncols  = len(header["columns"])
+    offset = len(MAGIC) + 4 + hlen
+    nrows  = (os.path.getsize(path) - offset) // (8 * ncols)
+    if not nrows:
+        return header, np.empty((0, ncols))
+    return header, np.memmap(path, dtype=header["dtype"], mode="r",
+                             offset=offset, shape=(nrows, ncols))
+
+
+def read_log(path: str) -> pd.DataFrame:
+    """Load a ``.qlog`` into a DataFrame (one column per channel)."""
+    header, rows = open_raw(path)
+    return pd.DataFrame(np.array(rows), columns=header["columns"])
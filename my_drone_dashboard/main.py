@@ -14,7 +14,7 @@ import pyqtgraph as pg
 from ui.main_window   import MainWindow          # dashboard / camera / reload tabs
 from config_manager   import load_config, ConfigTab
 from data_handler     import DataHandler
-from utils.logging_setup import setup_logging
+from utils.logging_setup import setup_logging, stop_perf_log
 # ----------------------------------------------------------------------------
 
 
@@ -150,6 +150,8 @@ class ExtendedMainWindow(QMainWindow):
     def closeEvent(self, event):
         if self.data_handler.timer.isActive() or self.data_handler.running:
             self.data_handler.stop()
+        # the dashboard is only a tab here, so its own closeEvent never runs
+        self.dashboard.camera_window.stop_all()
         super().closeEvent(event)
 
 
@@ -173,8 +175,12 @@ def main() -> None:
 
     # Ensure we stop the handler on app quit 
     app.aboutToQuit.connect(data_handler.stop)
+    app.aboutToQuit.connect(window.dashboard.camera_window.stop_all)
+    app.aboutToQuit.connect(stop_perf_log)
 
-    sys.exit(app.exec())
+    code = app.exec()
+    data_handler.wait_for_logs()   # finish compacting the last flight log
+    sys.exit(code)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+#mjpeg_stream.py
+
+"""MJPEG-over-HTTP client with reduced-resolution decoding.
+
+IP-webcam style ``multipart/x-mixed-replace`` streams are read over one
+persistent HTTP response and split on the multipart boundary here, with
+no FFmpeg involved.  Each JPEG is decoded with ``cv2.imdecode`` at
+``IMREAD_REDUCED_COLOR_2/4/8`` when the tile it is shown in is that much
+smaller than the frame, which cuts decode time roughly by the square of
+the factor.
+
+:class:`MjpegStream` mimics the part of ``cv2.VideoCapture`` that
+:class:`~camera_capture.CameraCapture` uses, and :func:`open_stream` picks
+it for HTTP URLs that really serve MJPEG.
+"""
+
+from __future__ import annotations
+
+import base64
+import http.client
+import logging
+import urllib.parse
+import urllib.request
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+REDUCED_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+# SOFn markers carry the frame size; C4/C8/CC are DHT/JPG/DAC
+_SOF = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """``(width, height)`` from the JPEG's SOF header, or None if not found."""
+    i, n = 2, len(data)
+    if data[:2] != b"\xff\xd8":
+        return None
+    while i + 4 <= n:
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:          # fill byte
+            i += 1
+            continue
+        if 0xD0 <= marker <= 0xD9 or marker == 0x01:
+            i += 2                  # standalone markers
+            continue
+        if marker in _SOF:
+            if i + 9 > n:
+                return None
+            height = (data[i + 5] << 8) | data[i + 6]
+            width  = (data[i + 7] << 8) | data[i + 8]
+            return width, height
+        i += 2 + ((data[i + 2] << 8) | data[i + 3])
+    return None
+
+
+def reduction_for(size: Tuple[int, int], box: Optional[Tuple[int, int]]) -> int:
+    """Largest IMREAD_REDUCED factor that still covers *size* fitted into *box*."""
+    if box is None:
+        return 1
+    limit = min(size[0] / box[0], size[1] / box[1])   # 1 / fit scale
+    for factor in (8, 4, 2):
+        if factor <= limit:
+            return factor
+    return 1
+
+
+class MjpegStream:
+    """Minimal ``cv2.VideoCapture`` stand-in for multipart MJPEG over HTTP.
+
+    ``grab()`` reads the next JPEG part off the open response (this is
+    where network waits land); ``retrieve()`` decodes it, reduced by
+    :func:`reduction_for` against ``target_size``.
+    """
+
+    def __init__(self, url: str, timeout: float = 5.0) -> None:
+        self.url         = url
+        self.target_size: Optional[Tuple[int, int]] = None   # set by CameraCapture
+        self.reduction   = 1
+        self.response    = None
+        self.reachable   = False    # server answered (even if not with MJPEG)
+        self._boundary   = b""
+        self._at_part    = False    # boundary line already consumed
+        self.jpeg: Optional[bytes] = None   # last grabbed part, as received
+        try:
+            self.response = urllib.request.urlopen(self._request(url), timeout=timeout)
+            self.reachable = True
+            ctype = self.response.headers.get("Content-Type", "")
+            if not ctype.startswith("multipart/"):
+                self.release()
+                return
+            for param in ctype.split(";")[1:]:
+                key, _, value = param.strip().partition("=")
+                if key.lower() == "boundary":
+                    self._boundary = value.strip('"').encode().lstrip(b"-")
+            if not self._boundary:
+                self.release()
+        except (OSError, ValueError, http.client.HTTPException) as e:
+            logging.warning("MJPEG %s: %s", url, e)
+            self.release()
+
+    @staticmethod
+    def _request(url: str) -> urllib.request.Request:
+        """Request for *url*, moving ``user:pass@`` into a Basic auth header."""
+        parts = urllib.parse.urlsplit(url)
+        if parts.username is None:
+            return urllib.request.Request(url)
+        netloc = parts.hostname + (f":{parts.port}" if parts.port else "")
+        request = urllib.request.Request(urllib.parse.urlunsplit(parts._replace(netloc=netloc)))
+        token = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+        request.add_header("Authorization", "Basic " + base64.b64encode(token.encode()).decode())
+        return request
+
+    def isOpened(self) -> bool:
+        return self.response is not None
+
+    def set(self, prop, value) -> bool:
+        return False
+
+    def release(self) -> None:
+        if self.response is not None:
+            self.response.close()
+            self.response = None
+
+    # ------------------------------------------------------------------ parsing
+
+    def _is_boundary(self, line: bytes) -> bool:
+        line = line.strip()
+        return line.startswith(b"--") and line.lstrip(b"-").rstrip(b"-") == self._boundary
+
+    def _next_part(self) -> bytes:
+        fp = self.response
+        if not self._at_part:
+            while True:
+                line = fp.readline()
+                if not line:
+                    raise EOFError("stream ended")
+                if self._is_boundary(line):
+                    break
+        self._at_part = False
+
+        length = None
+        while True:
+            line = fp.readline()
+            if not line:
+                raise EOFError("stream ended")
+            if not line.strip():
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            if key.strip().lower() == "content-length":
+                length = int(value)
+
+        if length is not None:
+            data = fp.read(length)
+            if len(data) < length:
+                raise EOFError("stream ended mid-frame")
+            return data
+
+        # no Content-Length: collect lines up to the next boundary
+        chunks = []
+        while True:
+            line = fp.readline()
+            if not line:
+                raise EOFError("stream ended")
+            if self._is_boundary(line):
+                self._at_part = True
+                break
+            chunks.append(line)
+        return b"".join(chunks).rstrip(b"\r\n")
+
+    # ------------------------------------------------------------------ VideoCapture API
+
+    def grab(self) -> bool:
+        if self.response is None:
+            return False
+        try:
+            self.jpeg = self._next_part()
+        except (OSError, EOFError, ValueError, http.client.HTTPException) as e:
+            logging.warning("MJPEG %s: %s", self.url, e)
+            return False
+        return True
+
+    def retrieve(self):
+        data = self.jpeg
+        if data is None:
+            return False, None
+        size = jpeg_size(data)
+        self.reduction = reduction_for(size, self.target_size) if size else 1
+        image = cv2.imdecode(np.frombuffer(data, np.uint8), REDUCED_FLAGS[self.reduction])
+        return image is not None, image
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+
+def open_stream(url: str):
+    """MjpegStream for HTTP MJPEG sources, ``cv2.VideoCapture`` otherwise.
+
+    An unreachable HTTP server is not retried through FFmpeg; the closed
+    MjpegStream is returned and the caller's reconnect logic takes over.
+    """
+    if url.lower().startswith(("http://", "https://")):
+        stream = MjpegStream(url)
+        if stream.isOpened() or not stream.reachable:
+            return stream
+    return cv2.VideoCapture(url)
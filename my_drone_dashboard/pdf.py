@@ -5,219 +5,391 @@ import math
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel
 )
-from PyQt6.QtGui import QPainter, QPen, QColor, QFont, QBrush, QPainterPath
-from PyQt6.QtCore import Qt,  QRectF, QPointF
+from PyQt6.QtGui import QPainter, QPen, QColor, QFont, QFontMetricsF, QBrush, QPainterPath, QPixmap
+from PyQt6.QtCore import Qt,  QRect, QRectF, QPointF, QEvent
 
 # Import the DataHandler
 from data_handler import DataHandler
+from utils.perf import TIMINGS
+
+
+def _layer(widget, width, height):
+    """Transparent pixmap of *width* x *height* logical pixels at the widget's DPR."""
+    dpr = widget.devicePixelRatioF()
+    pixmap = QPixmap(max(1, math.ceil(width * dpr)), max(1, math.ceil(height * dpr)))
+    pixmap.setDevicePixelRatio(dpr)
+    pixmap.fill(Qt.GlobalColor.transparent)
+    return pixmap
+
+
+# Static parts of the instruments below (pitch ladder, bezel,
+# compass tape) are rendered once into QPixmap layers; paintEvent only
+# blits / transforms them and draws the few moving pointers.  Layers are
+# rebuilt on resize, DPR and palette/style (theme) changes.
+_LAYER_EVENTS = (QEvent.Type.PaletteChange, QEvent.Type.StyleChange,
+                 QEvent.Type.FontChange, QEvent.Type.DevicePixelRatioChange)
+
+
+class PFDInstrument(QWidget):
+    """Base for the PFD instruments: repaint only visible, dirty changes.
+
+    Setters work out how many pixels the new value moves the display.
+    Below ``threshold_px`` nothing is scheduled and ``suppressed`` is
+    counted.  Otherwise only the affected rects are updated.  Values are
+    compared with what was last *painted*, so sub-threshold steps cannot
+    add up to a visible error.
+    """
+    threshold_px = 0.5
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.paints = 0
+        self.suppressed = 0
+
+    def _schedule(self, *rects):
+        rects = [r for r in rects if r is not None]
+        if not rects:
+            self.suppressed += 1
+            return
+        for rect in rects:
+            self.update(rect)
+
+    @staticmethod
+    def _covers(event, rect):
+        return event.rect().contains(rect)
+
 
-# The existing widget classes (DroneAttitudeIndicator, HeadingIndicator, etc.) remain unchanged
 # DroneAttitudeIndicator class
-class DroneAttitudeIndicator(QWidget):
+class DroneAttitudeIndicator(PFDInstrument):
+    SKY    = QColor(0, 128, 255)
+    GROUND = QColor(139, 69, 19)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.roll = 0.0
         self.pitch = 0.0
         self.setMinimumSize(150, 150)
+        self._ladder = None   # pitch lines + labels, drawn rotated + shifted
+        self._bezel  = None   # aircraft symbol, outer circle, roll scale
+        self._shown  = (0.0, 0.0)
         
     def setPitchRoll(self, pitch, roll):
         self.pitch = pitch
         self.roll = roll
+        # the rotated horizon can reach every pixel, so the dirty rect
+        # is the whole widget; pitch moves r/45 px per degree, roll
+        # moves the rim by r * angle
+        radius = self._radius()
+        moved = max(abs(pitch - self._shown[0]) * radius / 45.0,
+                    math.radians(abs(roll - self._shown[1])) * radius)
+        self._schedule(self.rect() if moved >= self.threshold_px else None)
+
+    def invalidateLayers(self):
+        self._ladder = self._bezel = None
         self.update()
-        
-    def paintEvent(self, event):
-        painter = QPainter(self)
+
+    def resizeEvent(self, event):
+        self._ladder = self._bezel = None
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() in _LAYER_EVENTS:
+            self.invalidateLayers()
+        super().changeEvent(event)
+
+    def _radius(self):
+        return min(self.width(), self.height()) / 2 - 10
+
+    def _build_ladder(self, radius):
+        # pitch ladder + labels, centered on the horizon: x, y in [-r, r]
+        pixmap = _layer(self, radius * 2, radius * 2)
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        width = self.width()
-        height = self.height()
-        center_x = width / 2
-        center_y = height / 2
-        radius = min(width, height) / 2 - 10
-        
-        # Save the current state
-        painter.save()
-        
-        # Move to center and rotate
-        painter.translate(center_x, center_y)
-        painter.rotate(self.roll)
-        
-        # Draw artificial horizon
-        sky_rect = QRectF(-radius, -radius, radius * 2, radius * 2)
-        ground_rect = QRectF(-radius, 0, radius * 2, radius * 2)
-        
-        # Adjust for pitch
-        pitch_offset = radius * self.pitch / 45.0  # Scale pitch to pixels
-        painter.translate(0, pitch_offset)
-        
-        # Draw sky
-        painter.setBrush(QBrush(QColor(0, 128, 255)))
-        painter.setPen(Qt.PenStyle.NoPen)
-        painter.drawRect(QRectF(-radius, -radius * 2, radius * 2, radius * 2))
-        
-        # Draw ground
-        painter.setBrush(QBrush(QColor(139, 69, 19)))
-        painter.drawRect(QRectF(-radius, 0, radius * 2, radius * 2))
-        
-        # Draw horizon line
-        painter.setPen(QPen(Qt.GlobalColor.white, 2))
-        painter.drawLine(int(-radius), 0, int(radius), 0)
-        
+        painter.translate(radius, radius)
+
         # Draw pitch lines
         painter.setPen(QPen(Qt.GlobalColor.white, 1))
+        painter.setFont(QFont("Arial", 8))
+        metrics = painter.fontMetrics()
         for i in range(-45, 46, 5):
             if i == 0:
-                continue  # Skip zero (horizon line already drawn)
-                
+                continue  # Skip zero (horizon line drawn per frame)
+
             y = -i * radius / 45.0
-            
+
             # Different line lengths based on multiples of 10
             line_length = radius * 0.5 if i % 10 == 0 else radius * 0.25
-            
+
             painter.drawLine(int(-line_length / 2), int(y), int(line_length / 2), int(y))
-            
+
             # Add degree numbers for multiples of 10
             if i % 10 == 0:
-                painter.setFont(QFont("Arial", 8))
                 degree_text = str(abs(i))
-                text_width = painter.fontMetrics().horizontalAdvance(degree_text)
+                text_width = metrics.horizontalAdvance(degree_text)
                 painter.drawText(QPointF(-line_length / 2 - text_width - 5, y + 4), degree_text)
                 painter.drawText(QPointF(line_length / 2 + 5, y + 4), degree_text)
-        
-        painter.restore()
-        
+        painter.end()
+        return pixmap
+
+    def _build_bezel(self, radius):
+        width = self.width()
+        height = self.height()
+        center_x = width / 2
+        center_y = height / 2
+        pixmap = _layer(self, width, height)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
         # Draw fixed aircraft symbol
         painter.setPen(QPen(Qt.GlobalColor.yellow, 3))
         painter.drawLine(int(center_x - 30), int(center_y), int(center_x - 10), int(center_y))
         painter.drawLine(int(center_x + 10), int(center_y), int(center_x + 30), int(center_y))
         painter.drawLine(int(center_x), int(center_y - 5), int(center_x), int(center_y + 5))
-        
+
         # Draw outer circle
         painter.setPen(QPen(Qt.GlobalColor.white, 2))
         painter.setBrush(Qt.BrushStyle.NoBrush)
         painter.drawEllipse(QRectF(center_x - radius, center_y - radius, radius * 2, radius * 2))
-        
-        # Draw roll indicator at the top
-        painter.save()
-        painter.translate(center_x, center_y)
-        
+
         # Draw roll indicator ticks
+        painter.translate(center_x, center_y)
+        painter.setFont(QFont("Arial", 8))
+        metrics = painter.fontMetrics()
         tick_angles = [-60, -45, -30, -20, -10, 0, 10, 20, 30, 45, 60]
         for angle in tick_angles:
             painter.save()
             painter.rotate(angle)
             tick_length = 10 if angle % 30 == 0 else 5
             painter.drawLine(0, int(-radius + 2), 0, int(-radius + 2 + tick_length))
-            
+
             if angle % 30 == 0:
-                painter.setFont(QFont("Arial", 8))
                 text = str(abs(angle))
-                text_width = painter.fontMetrics().horizontalAdvance(text)
+                text_width = metrics.horizontalAdvance(text)
                 painter.drawText(QPointF(-text_width/2, -radius + 25), text)
-            
+
             painter.restore()
-        
-        # Draw roll indicator arrow
-        painter.rotate(-self.roll)
-        painter.setPen(QPen(Qt.GlobalColor.yellow, 2))
-        painter.drawLine(0, int(-radius + 5), 0, int(-radius + 15))
-        painter.drawLine(0, int(-radius + 15), -5, int(-radius + 20))
-        painter.drawLine(0, int(-radius + 15), 5, int(-radius + 20))
-        
-        painter.restore()
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        with TIMINGS.measure("pfd.attitude.paint"):
+            self.paints += 1
+            self._shown = (self.pitch, self.roll)
+            radius = self._radius()
+            if self._ladder is None:
+                self._ladder = self._build_ladder(radius)
+                self._bezel  = self._build_bezel(radius)
+
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+            # Move to center, rotate by roll, adjust for pitch
+            painter.save()
+            painter.translate(self.width() / 2, self.height() / 2)
+            painter.rotate(self.roll)
+            painter.translate(0, radius * self.pitch / 45.0)  # Scale pitch to pixels
+
+            # Draw sky and ground (plain fills stay vector)
+            painter.fillRect(QRectF(-radius, -radius * 2, radius * 2, radius * 2), self.SKY)
+            painter.fillRect(QRectF(-radius, 0, radius * 2, radius * 2), self.GROUND)
+
+            # Draw horizon line
+            painter.setPen(QPen(Qt.GlobalColor.white, 2))
+            painter.drawLine(int(-radius), 0, int(radius), 0)
+
+            # blit the cached pitch ladder
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            painter.drawPixmap(QPointF(-radius, -radius), self._ladder)
+            painter.restore()
+
+            painter.drawPixmap(0, 0, self._bezel)
+
+            # Draw roll indicator arrow
+            painter.translate(self.width() / 2, self.height() / 2)
+            painter.rotate(-self.roll)
+            painter.setPen(QPen(Qt.GlobalColor.yellow, 2))
+            painter.drawLine(0, int(-radius + 5), 0, int(-radius + 15))
+            painter.drawLine(0, int(-radius + 15), -5, int(-radius + 20))
+            painter.drawLine(0, int(-radius + 15), 5, int(-radius + 20))
+            painter.end()
+
 
+class HeadingIndicator(PFDInstrument):
+    # compass tape geometry (widget coordinates)
+    SCALE_TOP    = 20
+    SCALE_HEIGHT = 30
+    SPAN         = 60     # degrees visible across the scale
 
-class HeadingIndicator(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.heading = 0.0
         self.setMinimumSize(80,80)
+        self.heading_font = QFont("Arial", 12, QFont.Weight.Bold)
+        self._heading_metrics = QFontMetricsF(self.heading_font)
+        self._background = None   # fill and baseline
+        self._triangle   = None   # center pointer path
+        self._tape       = None   # ticks + labels for -30..390 degrees
+        self._tape_shown = 0.0
+        self._text_shown = 0.0
         
     def setHeading(self, heading):
         self.heading = heading
+        delta = (heading - self._tape_shown + 180) % 360 - 180
+        tape = abs(delta) * self._pixels_per_degree() >= self.threshold_px
+        text = int(heading) != int(self._text_shown)
+        self._schedule(self._tape_rect() if tape else None,
+                       self._text_rect() if text else None)
+
+    def _tape_rect(self):
+        # ticks, labels and pointer all sit above the baseline
+        return QRect(0, 0, self.width(), self.SCALE_TOP + self.SCALE_HEIGHT + 2).intersected(self.rect())
+
+    def _text_rect(self):
+        m = self._heading_metrics
+        top = self.height() - 10 - m.ascent() - 1
+        return QRectF(0, top, self.width(), m.ascent() + m.descent() + 2).toAlignedRect().intersected(self.rect())
+
+    def invalidateLayers(self):
+        self._background = self._tape = None
         self.update()
-        
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
+
+    def resizeEvent(self, event):
+        self._background = self._tape = None
+        super().resizeEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() in _LAYER_EVENTS:
+            self.invalidateLayers()
+        super().changeEvent(event)
+
+    def _pixels_per_degree(self):
+        return (self.width() - 40) / float(self.SPAN)
+
+    def _build_background(self):
         width = self.width()
         height = self.height()
         center_x = width / 2
-        
+        scale_top = self.SCALE_TOP
+        scale_bottom = scale_top + self.SCALE_HEIGHT
+        pixmap = _layer(self, width, height)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
         # Draw background
         painter.setBrush(QBrush(QColor(10, 10, 30)))
         painter.setPen(Qt.PenStyle.NoPen)
         painter.drawRect(0, 0, width, height)
-        
-        # Draw heading scale
+
+        # Draw heading scale baseline
         painter.setPen(QPen(Qt.GlobalColor.white, 1))
-        scale_width = width - 40
-        scale_top = 20
-        scale_height = 30
-        
-        painter.drawLine(20, scale_top + scale_height, width - 20, scale_top + scale_height)
-        
-        # Draw degree marks
-        pixels_per_degree = scale_width / 60.0  # Show 60 degrees in view
-        
-        for i in range(-30, 31):
-            degree = (self.heading + i) % 360
-            x = int(center_x + i * pixels_per_degree)
-            
-            if 0 <= x <= width:
-                # Different line heights based on multiples
-                line_height = 15 if degree % 30 == 0 else (10 if degree % 10 == 0 else 5)
-                
-                painter.drawLine(x, scale_top + scale_height - line_height, x, scale_top + scale_height)
-                
-                # Add text for major headings
-                if degree % 30 == 0:
-                    # Use N, E, S, W for cardinal directions
-                    if degree == 0:
-                        label = "N"
-                    elif degree == 90:
-                        label = "E"
-                    elif degree == 180:
-                        label = "S"
-                    elif degree == 270:
-                        label = "W"
-                    else:
-                        label = str(degree)
-                        
-                    painter.setFont(QFont("Arial", 10))
-                    text_width = painter.fontMetrics().horizontalAdvance(label)
-                    painter.drawText(QPointF(x - text_width/2, scale_top + scale_height - 20), label)
-        
-        # Draw center triangle
-        painter.setPen(QPen(Qt.GlobalColor.yellow, 2))
-        painter.setBrush(QBrush(Qt.GlobalColor.yellow))
+        painter.drawLine(20, scale_bottom, width - 20, scale_bottom)
+        painter.end()
+
         triangle = QPainterPath()
         triangle.moveTo(center_x, scale_top)
         triangle.lineTo(center_x - 10, scale_top + 10)
         triangle.lineTo(center_x + 10, scale_top + 10)
         triangle.closeSubpath()
-        painter.drawPath(triangle)
-        
-        # Draw heading number
+        self._triangle = triangle
+        return pixmap
+
+    def _build_tape(self):
+        # degree d sits at x = (d + SPAN/2) * ppd; labels wrap past 360
+        ppd = self._pixels_per_degree()
+        half = self.SPAN // 2
+        scale_bottom = self.SCALE_TOP + self.SCALE_HEIGHT
+        pixmap = _layer(self, (360 + self.SPAN) * ppd + 1, scale_bottom + 1)
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setPen(QPen(Qt.GlobalColor.white, 1))
-        painter.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-        heading_text = f"{int(self.heading):03d}°"
-        text_width = painter.fontMetrics().horizontalAdvance(heading_text)
-        painter.drawText(QPointF(center_x - text_width/2, height - 10), heading_text)
+        painter.setFont(QFont("Arial", 10))
+        metrics = painter.fontMetrics()
+        for d in range(-half, 360 + half + 1):
+            degree = d % 360
+            x = round((d + half) * ppd)
+
+            # Different line heights based on multiples
+            line_height = 15 if degree % 30 == 0 else (10 if degree % 10 == 0 else 5)
+            painter.drawLine(x, scale_bottom - line_height, x, scale_bottom)
+
+            # Add text for major headings
+            if degree % 30 == 0:
+                # Use N, E, S, W for cardinal directions
+                label = {0: "N", 90: "E", 180: "S", 270: "W"}.get(degree, str(degree))
+                text_width = metrics.horizontalAdvance(label)
+                painter.drawText(QPointF(x - text_width/2, scale_bottom - 20), label)
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        with TIMINGS.measure("pfd.heading.paint"):
+            self.paints += 1
+            if self._covers(event, self._tape_rect()):
+                self._tape_shown = self.heading
+            if self._covers(event, self._text_rect()):
+                self._text_shown = self.heading
+            if self._background is None:
+                self._background = self._build_background()
+                self._tape       = self._build_tape()
+
+            width = self.width()
+            height = self.height()
+            center_x = width / 2
+            ppd = self._pixels_per_degree()
+
+            painter = QPainter(self)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.drawPixmap(0, 0, self._background)
+
+            # slide the tape so the current heading sits under the pointer,
+            # showing +/- SPAN/2 degrees as before
+            heading = self.heading % 360
+            painter.save()
+            painter.setClipRect(QRectF(20 - 1, 0, width - 40 + 2, height))
+            painter.drawPixmap(round(center_x - (heading + self.SPAN // 2) * ppd), 0, self._tape)
+            painter.restore()
+
+            # Draw center triangle
+            painter.setPen(QPen(Qt.GlobalColor.yellow, 2))
+            painter.setBrush(QBrush(Qt.GlobalColor.yellow))
+            painter.drawPath(self._triangle)
+
+            # Draw heading number
+            painter.setPen(QPen(Qt.GlobalColor.white, 1))
+            painter.setFont(self.heading_font)
+            heading_text = f"{int(self.heading):03d}°"
+            text_width = self._heading_metrics.horizontalAdvance(heading_text)
+            painter.drawText(QPointF(center_x - text_width/2, height - 10), heading_text)
+            painter.end()
 
 
-class AltitudeIndicator(QWidget):
+class AltitudeIndicator(PFDInstrument):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.altitude = 0.0
         self.setMinimumSize(80, 100)
+        self._scale_shown = 0.0
+        self._text_shown  = 0.0
         
     def setAltitude(self, altitude):
         self.altitude = altitude
-        self.update()
+        # the tape spans the full height, the readout only its box
+        pixels_per_meter = (self.height() - 40) / 100.0
+        moved = abs(altitude - self._scale_shown) * pixels_per_meter >= self.threshold_px
+        text = int(altitude) != int(self._text_shown)
+        self._schedule(self.rect() if moved else None,
+                       self._box_rect() if text else None)
+
+    def _box_rect(self):
+        center_y = self.height() / 2
+        return QRectF(5, center_y - 15, self.width() - 25, 30).adjusted(-2, -2, 2, 2).toAlignedRect().intersected(self.rect())
         
     def paintEvent(self, event):
+        self.paints += 1
+        if self._covers(event, self.rect()):
+            self._scale_shown = self.altitude
+        if self._covers(event, self._box_rect()):
+            self._text_shown = self.altitude
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
@@ -285,17 +457,33 @@ class AltitudeIndicator(QWidget):
         painter.drawText(QPointF(alt_box.center().x() - text_width/2, alt_box.center().y() + 5), alt_text)
 
 
-class AirspeedIndicator(QWidget):
+class AirspeedIndicator(PFDInstrument):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.airspeed = 0.0
         self.setMinimumSize(80, 100)
+        self._scale_shown = 0.0
+        self._text_shown  = 0.0
         
     def setAirspeed(self, airspeed):
         self.airspeed = airspeed
-        self.update()
+        # the tape spans the full height, the readout only its box
+        pixels_per_unit = (self.height() - 40) / 30.0
+        moved = abs(airspeed - self._scale_shown) * pixels_per_unit >= self.threshold_px
+        text = f"{airspeed:.1f}" != f"{self._text_shown:.1f}"
+        self._schedule(self.rect() if moved else None,
+                       self._box_rect() if text else None)
+
+    def _box_rect(self):
+        center_y = self.height() / 2
+        return QRectF(25, center_y - 15, self.width() - 25, 30).adjusted(-2, -2, 2, 2).toAlignedRect().intersected(self.rect())
         
     def paintEvent(self, event):
+        self.paints += 1
+        if self._covers(event, self.rect()):
+            self._scale_shown = self.airspeed
+        if self._covers(event, self._box_rect()):
+            self._text_shown = self.airspeed
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
@@ -446,16 +634,17 @@ class DronePFD(QMainWindow):
         # Get the latest data from DataHandler
         try:
             # Attitude data (roll, pitch, yaw)
-            roll = self.data_handler.orientation[0][-1] if self.data_handler.orientation[0] else 0.0
-            pitch = self.data_handler.orientation[1][-1] if self.data_handler.orientation[1] else 0.0
-            heading = self.data_handler.orientation[2][-1] if self.data_handler.orientation[2] else 0.0
+            store = self.data_handler.store
+            roll = store.latest("roll")
+            pitch = store.latest("pitch")
+            heading = store.latest("yaw")
             
             # Altitude data
-            altitude = self.data_handler.altitude[-1] if self.data_handler.altitude else 0.0
+            altitude = store.latest("altitude")
             
             # Battery data
-            voltage = self.data_handler.battery_voltage[-1] if self.data_handler.battery_voltage else 12.6
-            battery_percent = self.data_handler.battery_percentage[-1] if self.data_handler.battery_percentage else 100.0
+            voltage = store.latest("battery_voltage", 12.6)
+            battery_percent = store.latest("battery_percentage", 100.0)
             
             # Use speed over ground for airspeed (approximation)
             airspeed = self.data_handler.speed_over_ground
@@ -0,0 +1,142 @@
+#ring_buffer.py
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class RingBuffer:
+    """Columnar ring buffer backed by one preallocated 2-D ``float64`` array.
+
+    Every sample is written twice, at ``cursor`` and ``cursor + capacity``
+    (a "mirrored" ring).  The newest ``len(self)`` samples of any column are
+    therefore always one contiguous slice, so :meth:`column` returns a
+    zero-copy view instead of unrolling the ring.
+
+    Views alias the live storage: use them before the next append, or copy.
+    """
+
+    def __init__(self, columns: Sequence[str], capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        self.columns: List[str] = list(columns)
+        self._index: Dict[str, int] = {name: i for i, name in enumerate(self.columns)}
+        self.capacity = int(capacity)
+        self._data    = np.zeros((len(self.columns), 2 * self.capacity), dtype=np.float64)
+        self._cursor  = 0   # next write position in [0, capacity)
+        self._count   = 0   # valid samples (<= capacity)
+        self.total    = 0   # samples ever appended (monotonic sequence counter)
+
+    # ------------------------------------------------------------------ write
+
+    def append(self, row: Sequence[float]) -> None:
+        """Append one sample; *row* holds one value per column, in order."""
+        c, cap = self._cursor, self.capacity
+        self._data[:, c] = row
+        self._data[:, c + cap] = row
+        self._cursor = (c + 1) % cap
+        self._count = min(self._count + 1, cap)
+        self.total += 1
+
+    def extend(self, rows: np.ndarray) -> None:
+        """Append a block of samples, shape ``(n, len(columns))``."""
+        rows = np.asarray(rows, dtype=np.float64)
+        n = len(rows)
+        if n == 0:
+            return
+        cap = self.capacity
+        self.total += n
+        if n >= cap:
+            rows = rows[-cap:]
+            self._data[:, :cap] = rows.T
+            self._data[:, cap:] = rows.T
+            self._cursor, self._count = 0, cap
+            return
+
+        c = self._cursor
+        first = min(n, cap - c)
+        block = rows.T
+        self._data[:, c:c + first] = block[:, :first]
+        self._data[:, c + cap:c + cap + first] = block[:, :first]
+        rest = n - first
+        if rest:
+            self._data[:, :rest] = block[:, first:]
+            self._data[:, cap:cap + rest] = block[:, first:]
+        self._cursor = (c + n) % cap
+        self._count = min(self._count + n, cap)
+
+    def clear(self) -> None:
+        self._cursor = 0
+        self._count = 0
+
+    # ------------------------------------------------------------------ read
+
+    def __len__(self) -> int:
+        return self._count
+
+    def column(self, name: str) -> np.ndarray:
+        """Oldest-to-newest samples of *name* as a contiguous zero-copy view."""
+        end = self._cursor + self.capacity
+        return self._data[self._index[name], end - self._count:end]
+
+    def columns_view(self) -> np.ndarray:
+        """All columns at once, shape ``(len(columns), len(self))`` (view)."""
+        end = self._cursor + self.capacity
+        return self._data[:, end - self._count:end]
+
+    def latest(self, name: str, default: float = 0.0) -> float:
+        if not self._count:
+            return default
+        return float(self._data[self._index[name], self._cursor + self.capacity - 1])
+
+    # ------------------------------------------------------------------ resize
+
+    def resize(self, capacity: int) -> None:
+        """Change capacity, keeping the newest ``min(len, capacity)`` samples."""
+        if capacity < 1:
+            raise ValueError("capacity must be >= 1")
+        keep = self.columns_view()[:, -capacity:].copy() if self._count else None
+        self.capacity = int(capacity)
+        self._data = np.zeros((len(self.columns), 2 * self.capacity), dtype=np.float64)
+        self._cursor = 0
+        self._count = 0
+        if keep is not None:
+            total = self.total
+            self.extend(keep.T)
+            self.total = total
+
+
+class SampleQueue:
+    """Single-producer / single-consumer hand-off of sample blocks.
+
+    The serial thread ``push``es 2-D row blocks and the GUI thread
+    ``drain``s them.  ``deque.append`` and ``deque.popleft`` are atomic,
+    so neither side takes a lock.  When the consumer falls ``max_blocks``
+    behind, new blocks are dropped and counted in ``dropped_rows``.
+    """
+
+    def __init__(self, max_blocks: int = 4096) -> None:
+        self.max_blocks   = max_blocks
+        self.dropped_rows = 0
+        self._blocks: Deque[np.ndarray] = deque()
+
+    def push(self, block: np.ndarray) -> None:
+        if len(self._blocks) >= self.max_blocks:
+            self.dropped_rows += len(block)
+            return
+        self._blocks.append(block)
+
+    def drain(self) -> Optional[np.ndarray]:
+        """Everything pushed so far as one ``(n, ncols)`` array, or ``None``."""
+        blocks = self._blocks
+        n = len(blocks)
+        if not n:
+            return None
+        out = [blocks.popleft() for _ in range(n)]
+        return out[0] if n == 1 else np.concatenate(out)
+
+    def __len__(self) -> int:
+        return len(self._blocks)
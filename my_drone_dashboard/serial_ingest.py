@@ -0,0 +1,195 @@
+#serial_ingest.py
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable, List, Optional
+
+from binary_protocol import frame_valid
+
+# handler for one batch; may return how many of the frames it rejected
+FrameHandler = Callable[[List[bytes], bool], Optional[int]]
+
+MAX_PACKET = 256   # longest COBS packet the binary link can carry
+
+
+class FrameAssembler:
+    """Splits a byte stream into newline-terminated frames.
+
+    Bytes are accumulated in one fixed, reusable ``bytearray``; complete
+    frames are cut out with ``bytearray.find`` and returned as a batch.
+
+    With *auto_binary* a ``0x00`` byte switches the assembler to COBS
+    framing (see :mod:`binary_protocol`) once the packet between it and
+    the next ``0x00`` is a valid frame; the text firmware never sends a
+    zero byte, so a zero that is not followed by one is line noise and
+    dropped.  Binary framing falls back to text after ``fallback_after``
+    rejected frames in a row (see :meth:`rejected`) or when no delimiter
+    arrives within ``MAX_PACKET`` bytes.  ``binary`` tells which framing
+    produced the last batch.
+    """
+
+    def __init__(self, capacity: int = 64 * 1024, delimiter: bytes = b"\n",
+                 auto_binary: bool = True, fallback_after: int = 16) -> None:
+        self.capacity       = capacity
+        self.delimiter      = delimiter
+        self.auto_binary    = auto_binary
+        self.fallback_after = fallback_after
+        self.binary         = False
+        self.buffer         = bytearray(capacity)
+        self.view           = memoryview(self.buffer)
+        self.fill           = 0      # number of valid bytes in buffer
+        self.overflows      = 0      # frames dropped because they never fit
+        self.noise_zeros    = 0      # stray 0x00 bytes dropped from text
+        self.fallbacks      = 0      # binary -> text switches
+        self._bad_run       = 0      # rejected binary frames in a row
+
+    def free_space(self) -> memoryview:
+        """Writable tail of the buffer (for ``readinto``)."""
+        return self.view[self.fill:]
+
+    def commit(self, nbytes: int) -> List[bytes]:
+        """Account for *nbytes* written into ``free_space()`` and split."""
+        self.fill += nbytes
+        return self._split()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Copy *data* into the buffer and return every completed frame."""
+        frames: List[bytes] = []
+        data_view = memoryview(data)
+        while data_view:
+            room = self.capacity - self.fill
+            chunk = data_view[:room]
+            self.view[self.fill:self.fill + len(chunk)] = chunk
+            frames.extend(self.commit(len(chunk)))
+            data_view = data_view[len(chunk):]
+        return frames
+
+    def reset(self) -> None:
+        """Drop buffered bytes and go back to text framing."""
+        self.fill = 0
+        self._bad_run = 0
+        if self.auto_binary:
+            self.binary    = False
+            self.delimiter = b"\n"
+
+    def rejected(self, bad: int, total: int) -> None:
+        """Feedback from the decoder: *bad* of the last *total* binary frames were invalid."""
+        if not (self.auto_binary and self.binary):
+            return
+        self._bad_run = self._bad_run + bad if bad == total else 0
+        if self._bad_run >= self.fallback_after:
+            self._fall_back(f"{self._bad_run} invalid frames in a row")
+
+    def _split(self) -> List[bytes]:
+        pending = -1
+        if self.auto_binary and not self.binary:
+            pending = self._detect_binary()   # may shift the buffer
+        elif self.auto_binary and self.fill > MAX_PACKET and \
+                self.buffer.find(b"\x00", 0, self.fill) < 0:
+            self._fall_back(f"no frame delimiter in {self.fill} bytes")
+        buf, delim = self.buffer, self.delimiter
+        end = pending if pending >= 0 else self.fill   # text before an unconfirmed 0x00 only
+        strip_cr = not self.binary
+        frames: List[bytes] = []
+        start = 0
+        idx = buf.find(delim, start, end)
+        while idx >= 0:
+            frame = self.view[start:idx]
+            if strip_cr and frame and frame[-1] == 0x0D:  # tolerate Serial.println's "\r\n"
+                frame = frame[:-1]
+            if frame:
+                frames.append(bytes(frame))
+            start = idx + 1
+            idx = buf.find(delim, start, end)
+
+        if start:
+            remaining = self.fill - start
+            self.view[:remaining] = self.view[start:self.fill]
+            self.fill = remaining
+        elif end == self.capacity:
+            # a single frame larger than the whole buffer: drop it
+            self.overflows += 1
+            self.fill = 0
+        return frames
+
+    def _detect_binary(self) -> int:
+        """Switch to COBS framing on a confirmed frame, drop stray zeros.
+
+        Returns the offset of a ``0x00`` still waiting for the rest of its
+        packet, or -1.
+        """
+        buf = self.buffer
+        while True:
+            zero = buf.find(b"\x00", 0, self.fill)
+            if zero < 0:
+                return -1
+            nxt = buf.find(b"\x00", zero + 1, self.fill)
+            if nxt < 0 and self.fill - zero - 1 <= MAX_PACKET:
+                return zero        # could be the start of a binary link
+            if nxt >= 0 and frame_valid(bytes(self.view[zero + 1:nxt])):
+                # everything up to the first delimiter is a partial frame
+                remaining = self.fill - zero - 1
+                self.view[:remaining] = self.view[zero + 1:self.fill]
+                self.fill      = remaining
+                self.binary    = True
+                self.delimiter = b"\x00"
+                self._bad_run  = 0
+                logging.info("Binary telemetry frames detected; switching to COBS framing")
+                return -1
+            # not followed by a valid frame: line noise
+            self.view[zero:self.fill - 1] = self.view[zero + 1:self.fill]
+            self.fill -= 1
+            self.noise_zeros += 1
+
+    def _fall_back(self, reason: str) -> None:
+        self.binary    = False
+        self.delimiter = b"\n"
+        self._bad_run  = 0
+        self.fallbacks += 1
+        logging.warning("Binary telemetry lost (%s); back to text framing", reason)
+
+
+class SerialIngestor:
+    """Bulk reader for a pyserial-like device feeding batches of frames."""
+
+    def __init__(self, device, on_frames: FrameHandler,
+                 assembler: Optional[FrameAssembler] = None) -> None:
+        self.device     = device
+        self.on_frames  = on_frames
+        self.assembler  = assembler or FrameAssembler()
+        self.bytes_read = 0
+        self.frames_out = 0
+
+    def poll(self) -> int:
+        """Read everything that is available (blocking for at least one byte
+        up to the device timeout) and dispatch completed frames.
+
+        Returns the number of frames dispatched.
+        """
+        waiting = self.device.in_waiting
+        room = self.assembler.free_space()
+        want = min(max(1, waiting), len(room))
+        nbytes = self.device.readinto(room[:want]) or 0
+        if not nbytes:
+            return 0
+        self.bytes_read += nbytes
+        assembler = self.assembler
+        frames = assembler.commit(nbytes)
+        if frames:
+            self.frames_out += len(frames)
+            bad = self.on_frames(frames, assembler.binary)
+            if bad is not None and assembler.binary:
+                assembler.rejected(bad, len(frames))
+        return len(frames)
+
+    def run(self, keep_running: Callable[[], bool]) -> None:
+        """Loop ``poll()`` until *keep_running* returns False."""
+        while keep_running():
+            try:
+                self.poll()
+            except Exception as exc:
+                logging.error("Serial read error: %s", exc)
+                self.assembler.reset()
+                time.sleep(1)
@@ -0,0 +1,247 @@
+#serial_link.py
+
+"""Arduino serial connection on a worker thread with auto-reconnect.
+
+:class:`SerialLink` owns the port for as long as it is started: it opens
+it, waits out the board's reset, reads it through a
+:class:`~serial_ingest.SerialIngestor` and, when the cable glitches or
+the board is unplugged, closes it and tries again with exponential
+backoff.  While waiting, ``serial.tools.list_ports`` is polled so a board
+that is plugged back in is reopened at once instead of after the current
+backoff step.
+
+The GUI thread only calls :meth:`SerialLink.start`, :meth:`SerialLink.stop`
+and :meth:`SerialLink.configure`, none of which touch the port or wait for
+the worker: a stopped worker delivers no more frames, finishes its current
+read, closes the port and exits on its own, and the next worker waits for
+it before opening the device.  Progress is reported through
+:attr:`SerialLink.stateChanged`.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Set
+
+import serial
+from serial.tools import list_ports
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from serial_ingest import FrameHandler, SerialIngestor
+
+# link states, as emitted by SerialLink.stateChanged
+IDLE         = "idle"           # not started
+CONNECTING   = "connecting"     # opening the port / waiting for the board reset
+CONNECTED    = "connected"
+RECONNECTING = "reconnecting"   # backing off before the next attempt
+WAITING      = "waiting"        # port not present; watching for it to be plugged in
+
+
+def available_ports() -> Set[str]:
+    """Device names of the serial ports currently present."""
+    try:
+        return {port.device for port in list_ports.comports()}
+    except Exception as exc:   # platform enumeration errors must not kill the link
+        logging.warning("Cannot list serial ports: %s", exc)
+        return set()
+
+
+class SerialLink(QObject):
+    """Keeps one serial port open in the background and feeds its frames onward."""
+
+    stateChanged = pyqtSignal(str, str)   # state, detail for the status line
+
+    PORT_SCAN_INTERVAL = 0.5   # s between list_ports polls while waiting
+    LIVE_SCAN_INTERVAL = 2.0   # s between checks that a connected port still exists
+
+    def __init__(self, port: str, baudrate: int, on_frames: FrameHandler,
+                 on_connect: Optional[Callable[[], None]] = None,
+                 reset_delay: float = 2.0,
+                 backoff_initial: float = 0.5,
+                 backoff_max: float = 30.0,
+                 read_timeout: float = 0.5) -> None:
+        super().__init__()
+        self.port            = port
+        self.baudrate        = baudrate
+        self.on_frames       = on_frames
+        self.on_connect      = on_connect
+        self.reset_delay     = reset_delay
+        self.backoff_initial = backoff_initial
+        self.backoff_max     = backoff_max
+        self.read_timeout    = read_timeout
+        self.state           = IDLE
+        self.detail          = ""
+        self.device          = None
+        self.ingestor: Optional[SerialIngestor] = None
+        self.connects        = 0   # successful opens
+        self.failures        = 0   # attempts since frames last arrived (sets the backoff)
+        self._stop           = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping: List[threading.Thread] = []   # stopped workers that may not have exited yet
+        self._deliver = threading.Lock()   # held while frames are handed on; stop() waits for it
+
+    @property
+    def connected(self) -> bool:
+        return self.state == CONNECTED
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None
+
+    # ------------------------------------------------------------------ GUI side
+
+    def start(self) -> None:
+        """Start connecting in the background (no-op while already started)."""
+        if self._thread is not None:
+            return
+        if not self.port:
+            self._set_state(IDLE, "no port configured")
+            return
+        # a fresh event per run: a worker that outlives stop() stays silenced
+        self._stop = stop = threading.Event()
+        self._stopping = [t for t in self._stopping if t.is_alive()]
+        self._thread = threading.Thread(target=self._run, args=(stop, list(self._stopping)),
+                                        name=f"serial {self.port}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the worker without waiting for it; it closes the port itself.
+
+        Returns once no more frames will be delivered.  A worker blocked in
+        the driver is left to finish its read (up to ``read_timeout``, or
+        however long a hung driver takes); the next :meth:`start` does not
+        open the device until it has exited.
+        """
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        with self._deliver:
+            self._stop.set()
+        self._stopping.append(thread)
+        self._set_state(IDLE, "disconnected")
+        logging.info("Disconnected from Arduino")
+
+    def configure(self, port: str, baudrate: int) -> None:
+        """Change port settings, reconnecting if the link is running."""
+        if (port, baudrate) == (self.port, self.baudrate):
+            return
+        restart = self.active
+        self.stop()
+        self.port, self.baudrate = port, baudrate
+        if restart:
+            self.start()
+
+    # ------------------------------------------------------------------ worker
+
+    def _set_state(self, state: str, detail: str = "", stop: Optional[threading.Event] = None) -> None:
+        if stop is not None and stop.is_set():
+            return
+        self.state, self.detail = state, detail
+        self.stateChanged.emit(state, detail)
+
+    def _port_listed(self) -> bool:
+        ports = available_ports()
+        return self.port in ports or os.path.realpath(self.port) in ports
+
+    def _run(self, stop: threading.Event, previous: List[threading.Thread]) -> None:
+        # never open the device while a stopped worker may still hold it
+        if any(thread.is_alive() for thread in previous):
+            self._set_state(CONNECTING, "waiting for the previous connection to close", stop)
+        for thread in previous:
+            while thread.is_alive():
+                thread.join(self.PORT_SCAN_INTERVAL)
+                if stop.is_set():
+                    return
+        hotplug = "://" not in self.port   # URLs (socket://, loop://) are never listed
+        while not stop.is_set():
+            device = self._open(stop)
+            if device is not None:
+                reason = self._read(device, stop, hotplug)
+                if stop.is_set():
+                    break
+                logging.warning("Serial %s: connection lost (%s), reconnecting", self.port, reason)
+            # a port that opens and drops again before any frame keeps backing off
+            self.failures += 1
+            delay = min(self.backoff_max, self.backoff_initial * 2 ** max(0, self.failures - 1))
+            self._wait(stop, delay, hotplug)
+
+    def _open(self, stop: threading.Event):
+        self._set_state(CONNECTING, f"opening {self.port}", stop)
+        try:
+            device = serial.serial_for_url(self.port, baudrate=self.baudrate,
+                                           timeout=self.read_timeout)
+        except (serial.SerialException, OSError, ValueError) as exc:
+            if self.failures == 0:   # don't repeat the same error every backoff step
+                logging.error("Failed to connect to Arduino: %s", exc)
+            return None
+        # opening the port toggles DTR, which resets the board: wait out
+        # the bootloader here, off the GUI thread, and drop what it printed
+        if stop.wait(self.reset_delay):
+            device.close()
+            return None
+        try:
+            device.reset_input_buffer()
+        except (serial.SerialException, OSError):
+            pass
+        self.device = device
+        self.connects += 1
+        if self.on_connect is not None:
+            self.on_connect()
+        self._set_state(CONNECTED, self.port, stop)
+        logging.info("Connected to Arduino on %s", self.port)
+        return device
+
+    def _read(self, device, stop: threading.Event, hotplug: bool) -> str:
+        """Read until the port fails or *stop* is set; returns why it ended."""
+        def deliver(frames, binary):
+            with self._deliver:
+                if stop.is_set():   # stop() has returned: drop what was still in flight
+                    return None
+                return self.on_frames(frames, binary)
+
+        self.ingestor = ingestor = SerialIngestor(device, deliver)
+        watch = hotplug and self._port_listed()   # unlisted ports (ptys, links) can't be watched
+        next_scan = time.monotonic() + self.LIVE_SCAN_INTERVAL
+        try:
+            while not stop.is_set():
+                try:
+                    if ingestor.poll() and self.failures:
+                        self.failures = 0   # frames flowing: the link is healthy again
+                except (serial.SerialException, OSError) as exc:
+                    return str(exc)
+                except Exception as exc:
+                    logging.error("Serial read error: %s", exc)
+                    ingestor.assembler.reset()
+                if watch and time.monotonic() >= next_scan:
+                    next_scan = time.monotonic() + self.LIVE_SCAN_INTERVAL
+                    if not self._port_listed():
+                        return "port removed"
+            return "stopped"
+        finally:
+            self.device = self.ingestor = None
+            try:
+                device.close()
+            except Exception:
+                pass
+
+    def _wait(self, stop: threading.Event, delay: float, hotplug: bool) -> None:
+        """Back off for *delay* s, cut short when the port (re)appears."""
+        listed = hotplug and self._port_listed()
+        if hotplug and not listed:
+            self._set_state(WAITING, f"waiting for {self.port} (retry in {delay:.0f} s)", stop)
+        else:
+            self._set_state(RECONNECTING, f"retry in {delay:.1f} s", stop)
+        deadline = time.monotonic() + delay
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or stop.wait(min(self.PORT_SCAN_INTERVAL, remaining)):
+                return
+            if hotplug:
+                now_listed = self._port_listed()
+                if now_listed and not listed:
+                    logging.info("Serial port %s appeared", self.port)
+                    return
+                listed = now_listed
@@ -0,0 +1,153 @@
+#telemetry_parser.py
+
+"""Single-pass parser for the Arduino text telemetry line.
+
+Expected layout (sections separated by ``|``)::
+
+    Rx: Y:1500 P:1500 T:1000 R:1500|...|...|PWM: M1:1000 ...|Ang: X:0.0 Y:0.0 Z:0.0|Current: M1:0.0 ...
+
+Canonical lines are matched by one precompiled regex; anything else falls
+back to a single tokenizing pass that locates sections by their header.
+A section is applied only when all of its fields are present and numeric
+(angles are applied per axis), so a corrupted line never leaves a
+half-written receiver/PWM/current vector behind.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, Union
+
+# section bits returned by TelemetryParser.parse()
+RX  = 1
+PWM = 2
+ANG = 4
+CUR = 8
+
+_INT   = rb"(-?\d+)"
+_FLOAT = rb"(-?\d+(?:\.\d*)?|-?nan|-?inf)"
+
+_TOKEN = re.compile(rb"(\|)|([A-Za-z]+)(\d*):([^\s|]*)")
+_INT_RE   = re.compile(_INT + rb"$")
+_FLOAT_RE = re.compile(_FLOAT + rb"$")
+
+_RX_KEYS  = {b"Y": 0, b"P": 1, b"T": 2, b"R": 3}
+_ANG_KEYS = {b"X": 0, b"Y": 1, b"Z": 2}
+
+
+def _canonical_pattern(num_motors: int) -> "re.Pattern[bytes]":
+    sp = rb"\s+"
+    motors_i = sp.join(rb"M%d:" % (i + 1) + _INT for i in range(num_motors))
+    motors_f = sp.join(rb"M%d:" % (i + 1) + _FLOAT for i in range(num_motors))
+    return re.compile(
+        rb"[^|]*?Rx:\s+Y:" + _INT + sp + rb"P:" + _INT + sp + rb"T:" + _INT + sp + rb"R:" + _INT +
+        rb"\s*\|[^|]*\|[^|]*\|\s*PWM:\s+" + motors_i +
+        rb"\s*\|\s*Ang:\s+X:" + _FLOAT + sp + rb"Y:" + _FLOAT + sp + rb"Z:" + _FLOAT +
+        rb"\s*\|\s*Current:\s+" + motors_f + rb"\s*(?:\|.*)?$"
+    )
+
+
+class TelemetryRecord:
+    """Latest decoded values; updated in place by :class:`TelemetryParser`."""
+
+    __slots__ = ("receiver", "motor_pwm", "roll", "pitch", "yaw", "motor_currents")
+
+    def __init__(self, num_motors: int = 4) -> None:
+        self.receiver: List[int]         = [1500, 1500, 1000, 1500]  # yaw, pitch, throttle, roll
+        self.motor_pwm: List[int]        = [1000] * num_motors
+        self.roll  = 0.0
+        self.pitch = 0.0
+        self.yaw   = 0.0
+        self.motor_currents: List[float] = [0.0] * num_motors
+
+
+class TelemetryParser:
+    """Decodes text lines into a preallocated :class:`TelemetryRecord`."""
+
+    def __init__(self, num_motors: int = 4) -> None:
+        self.num_motors = num_motors
+        self.record     = TelemetryRecord(num_motors)
+        self._canonical = _canonical_pattern(num_motors)
+        self.lines_fast     = 0
+        self.lines_fallback = 0
+        self.lines_rejected = 0
+
+    def parse(self, line: Union[bytes, bytearray, str]) -> int:
+        """Parse one line; return the OR of the section bits that were applied."""
+        if isinstance(line, str):
+            line = line.encode(errors="ignore")
+
+        m = self._canonical.match(line)
+        if m is None:
+            mask = self._parse_tokens(line)
+            if mask:
+                self.lines_fallback += 1
+            else:
+                self.lines_rejected += 1
+            return mask
+
+        g = m.groups()
+        n = self.num_motors
+        rec = self.record
+        rec.receiver[:]       = map(int, g[0:4])
+        rec.motor_pwm[:]      = map(int, g[4:4 + n])
+        rec.roll, rec.pitch, rec.yaw = map(float, g[4 + n:7 + n])
+        rec.motor_currents[:] = map(float, g[7 + n:7 + 2 * n])
+        self.lines_fast += 1
+        return RX | PWM | ANG | CUR
+
+    # ------------------------------------------------------------------ tolerant path
+
+    def _parse_tokens(self, line: bytes) -> int:
+        n = self.num_motors
+        rx:  List = [None] * 4
+        pwm: List = [None] * n
+        cur: List = [None] * n
+        ang: List = [None] * 3
+        section = b""
+
+        for sep, name, idx, value in _TOKEN.findall(line):
+            if sep:
+                section = b""
+                continue
+            if not value:
+                section = name + idx
+                continue
+            if section == b"Rx" and not idx:
+                slot = _RX_KEYS.get(name)
+                if slot is not None and rx[slot] is None and _INT_RE.match(value):
+                    rx[slot] = int(value)
+            elif section == b"Ang" and not idx:
+                slot = _ANG_KEYS.get(name)
+                if slot is not None and ang[slot] is None and _FLOAT_RE.match(value):
+                    ang[slot] = float(value)
+            elif name == b"M" and idx:
+                slot = int(idx) - 1
+                if section == b"PWM":
+                    if 0 <= slot < n and pwm[slot] is None and _INT_RE.match(value):
+                        pwm[slot] = int(value)
+                elif section == b"Current":
+                    if 0 <= slot < n and cur[slot] is None and _FLOAT_RE.match(value):
+                        cur[slot] = float(value)
+
+        rec = self.record
+        mask = 0
+        if None not in rx:
+            rec.receiver[:] = rx
+            mask |= RX
+        if None not in pwm:
+            rec.motor_pwm[:] = pwm
+            mask |= PWM
+        if ang[0] is not None:
+            rec.roll = ang[0]
+            mask |= ANG
+        if ang[1] is not None:
+            rec.pitch = ang[1]
+            mask |= ANG
+        if ang[2] is not None:
+            rec.yaw = ang[2]
+            mask |= ANG
+        if None not in cur:
+            rec.motor_currents[:] = cur
+            mask |= CUR
+        return mask
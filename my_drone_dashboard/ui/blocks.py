@@ -3,7 +3,21 @@ from PyQt6.QtWidgets import QVBoxLayout,QSplitter,QSizePolicy, QHBoxLayout, QWid
 from PyQt6.QtCore import QTimer, Qt
 import pyqtgraph as pg
 from pyqtgraph import DateAxisItem
-from typing import Any, Dict
+from typing import Any, Dict, List
+import numpy as np
+from utils.perf import TIMINGS
+from utils.rolling import RollingMinMax, ScrollBuffer
+
+
+class TimedPlotWidget(pg.PlotWidget):
+    """PlotWidget that records each repaint under ``<stage>.paint`` in TIMINGS."""
+    def __init__(self, *args: Any, stage: str = "plot", **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stage = stage
+
+    def paintEvent(self, ev) -> None:
+        with TIMINGS.measure(f"{self.stage}.paint"):
+            super().paintEvent(ev)
 
 
 class MotorCurrentVisualization(QWidget):
@@ -11,7 +25,7 @@ class MotorCurrentVisualization(QWidget):
     def __init__(self, data_handler: Any) -> None:
         super().__init__()
         self.data_handler = data_handler
-        self.data_handler.dataUpdated.connect(self.update_plot)
+        # redrawn by the RenderScheduler; see DisplayWidget
         # initial settings
         self.frequency = self.data_handler.config.get("motor_update_freq", 200)
         self.titles    = self.data_handler.config.get("motor_titles", [])
@@ -23,6 +37,14 @@ class MotorCurrentVisualization(QWidget):
         self.stats  = []
         self.motor_widgets = []
 
+        # incremental plotting: per-motor vertex buffer + rolling min/max,
+        # fed only with samples newer than store.total at the last frame
+        self.buffers: List[ScrollBuffer]  = []
+        self.ranges:  List[RollingMinMax] = []
+        self._seen   = 0
+        self._step   = 0
+        self._window = 0
+
         self.initUI()
 
     def initUI(self) -> None:
@@ -66,8 +88,11 @@ class MotorCurrentVisualization(QWidget):
 
             # time-series plot
             axis  = DateAxisItem(orientation='bottom')
-            plot  = pg.PlotWidget(axisItems={'bottom': axis})
+            plot  = TimedPlotWidget(stage="motor.curves", axisItems={'bottom': axis})
             plot.setLabel('left', "Current (A)")
+            # only the visible 20 s window is processed, even for huge buffers
+            plot.setClipToView(True)
+            plot.setDownsampling(auto=True, mode='peak')
             curve = plot.plot([], [], pen=pg.mkPen(color=col, width=2))
             self.plots.append(plot)
             self.curves.append(curve)
@@ -116,11 +141,19 @@ class MotorCurrentVisualization(QWidget):
         self.row_splitter = grid_split    
 
         # ── bar chart of latest currents ─────────────────────────────
-        self.bar_plot = pg.PlotWidget()
+        # one long-lived item; each frame only rewrites its heights
+        self.bar_plot = TimedPlotWidget(stage="motor.bars")
         self.bar_plot.setLabel('left', "Current (A)")
         self.bar_plot.getAxis('bottom').setTicks(
             [[(i, f"M{i+1}") for i in range(4)]])
         self.bar_plot.setFixedHeight(150)
+        self.bar_heights = np.zeros(4)
+        self.bar_item = pg.BarGraphItem(
+            x=np.arange(4), height=self.bar_heights, width=0.6,
+            brushes=self._bar_brushes())
+        self.bar_plot.addItem(self.bar_item)
+        self.bar_plot.setXRange(-0.5, 3.5, padding=0.05)
+        self.bar_plot.enableAutoRange(axis=pg.ViewBox.YAxis, enable=True)
 
         # placeholder to absorb extra vertical stretch
         placeholder = QWidget()
@@ -166,46 +199,73 @@ class MotorCurrentVisualization(QWidget):
         """Update how often plots refresh """
         self.frequency = int(freq_str)
 
+    def _reset_buffers(self, step: int, window: int) -> None:
+        """(Re)size the vertex buffers; the next frame refills them from the store."""
+        store = self.data_handler.store
+        self._step, self._window = step, window
+        self.buffers = [ScrollBuffer(window) for _ in self.curves]
+        self.ranges  = [RollingMinMax(window) for _ in self.curves]
+        self._seen   = store.total - len(store)
+
+    def _bar_brushes(self) -> List[Any]:
+        return [pg.mkBrush(self.colors[i] if i < len(self.colors) else "#000000")
+                for i in range(4)]
+
     def update_plot(self) -> None:
-        """Fetch the latest data from DataHandler and redraw both time-series and bars."""
+        """Append the samples that arrived since the last frame and redraw."""
+        with TIMINGS.measure("motor.curves.update"):
+            changed = self._update_curves()
+        if changed:
+            with TIMINGS.measure("motor.bars.update"):
+                self._update_bars()
+
+    def _update_curves(self) -> bool:
+        """Feed new samples to the curves; False when nothing arrived."""
+        store = self.data_handler.store
         step = max(1, round(self.frequency / 200))
-        # DataHandler.time_buffer now holds float seconds
-        times = list(self.data_handler.time_buffer)[::step] 
+        window = -(-store.capacity // step)
+        if step != self._step or window != self._window or not len(store):
+            self._reset_buffers(step, window)
+
+        new = min(store.total - self._seen, len(store))
+        self._seen = store.total
+        if new <= 0:
+            return False
+
+        # keep every step-th sample of the global sequence, so decimation
+        # does not depend on how samples are batched between frames
+        keep = np.arange(store.total - new, store.total) % step == 0
+        times = store.column("time")[-new:][keep]
 
         # update each motor’s curve + stats
         for i, curve in enumerate(self.curves):
-            data = list(self.data_handler.motor_currents[i])[::step]
-            if not data:
+            buf, rng = self.buffers[i], self.ranges[i]
+            data = store.column(f"motor{i+1}_current")[-new:][keep]
+            buf.extend(times, data)
+            rng.extend(data)
+            if not len(buf):
                 continue
-            curve.setData(times[:len(data)], data)
-            plot = self.plots[i]
-            mx = max(times)
-            plot.setXRange(mx - 20, mx)
+            # only the scrolled-in 20 s window is handed to the curve
+            mx = buf.x[-1]
+            lo = max(0, int(np.searchsorted(buf.x, mx - 20)) - 1)
+            curve.setData(buf.x[lo:], buf.y[lo:])
+            self.plots[i].setXRange(mx - 20, mx)
 
             a, mi, ma = self.stats[i]
-            a.setText(f"Actual: {data[-1]:.2f} A")
-            mi.setText(f"Min:    {min(data):.2f} A")
-            ma.setText(f"Max:    {max(data):.2f} A")
-
-        # update bar chart
-        current_vals = [
-            (self.data_handler.motor_currents[i][-1]
-             if self.data_handler.motor_currents[i] else 0.0)
-            for i in range(4)
-        ]
-        self.bar_plot.clear()
-        ticks = [(i, f"M{i+1}") for i in range(4)]
-        self.bar_plot.getAxis('bottom').setTicks([ticks])
-        for i, val in enumerate(current_vals):
-            bg = pg.BarGraphItem(
-                x=[i], height=[val], width=0.6, brush=self.colors[i]
-            )
-            self.bar_plot.addItem(bg)
-        self.bar_plot.enableAutoRange(axis=pg.ViewBox.XAxis, enable=True)
-        self.bar_plot.enableAutoRange(axis=pg.ViewBox.YAxis, enable=True)
+            a.setText(f"Actual: {buf.y[-1]:.2f} A")
+            mi.setText(f"Min:    {rng.min:.2f} A")
+            ma.setText(f"Max:    {rng.max:.2f} A")
+        return True
+
+    def _update_bars(self) -> None:
+        """Write the latest currents into the bar item in place."""
+        store = self.data_handler.store
+        for i in range(4):
+            self.bar_heights[i] = store.latest(f"motor{i+1}_current", 0.0)
+        self.bar_item.setOpts(height=self.bar_heights)
 
         # update total
-        total = sum(current_vals)
+        total = float(self.bar_heights.sum())
         self.total_current_label.setText(f"Total: {total:.2f} A")
 
     def updateConfig(self, new_config: Dict[str, Any]) -> None:
@@ -223,6 +283,7 @@ class MotorCurrentVisualization(QWidget):
             for i, w in enumerate(self.motor_widgets):
                 sw = w.layout().itemAt(0).layout().itemAt(0).widget()
                 sw.setStyleSheet(f"background-color: {self.colors[i]};")
+            self.bar_item.setOpts(brushes=self._bar_brushes())
 
         if "motor_update_freq" in new_config:
             self.frequency = new_config["motor_update_freq"]
@@ -233,8 +294,7 @@ class OrientationAltitudeVisualization(QWidget):
     def __init__(self, data_handler: Any) -> None:
         super().__init__()
         self.data_handler = data_handler
-        self.data_handler.dataUpdated.connect(self.update_plot)
-        # refresh frequency (driven externally via dataUpdated)
+        # refresh frequency (redrawn by the RenderScheduler; see DisplayWidget)
         self.frequency = self.data_handler.config.get("orientation_update_freq", 200)
         self.titles    = self.data_handler.config.get("orientation_titles", [])
         self.colors    = self.data_handler.config.get("orientation_colors", [])
@@ -328,10 +388,12 @@ class OrientationAltitudeVisualization(QWidget):
 
         # plot
         axis = DateAxisItem(orientation='bottom')
-        plot = pg.PlotWidget(axisItems={'bottom': axis})
+        plot = TimedPlotWidget(stage="orient", axisItems={'bottom': axis})
         
         plot.setLabel('left', self.ylabels[i])
         plot.setLabel('bottom', 'Time')
+        plot.setClipToView(True)
+        plot.setDownsampling(auto=True, mode='peak')
         pen = pg.mkPen(color=col, width=2)
         curve = plot.plot([], [], pen=pen)
         self.plots.append(plot)
@@ -364,32 +426,29 @@ class OrientationAltitudeVisualization(QWidget):
         """Redraw all four plots using the latest DataHandler buffers."""
         step = max(1, round(self.frequency / 200))
         # DataHandler.time_buffer holds floats
-        times = list(self.data_handler.time_buffer)[::step] 
+        times = self.data_handler.time_buffer[::step]
 
-        # orientation series + altitude
+        # orientation series + altitude (strided views, no copies)
         series = [
-            list(self.data_handler.orientation[idx])[::step]
-            if len(self.data_handler.orientation[idx]) else []
-            for idx in range(3)
+            self.data_handler.orientation[idx][::step] for idx in range(3)
         ] + [
-            list(self.data_handler.altitude)[::step]
-            if self.data_handler.altitude else []
+            self.data_handler.altitude[::step]
         ]
 
         for i, curve in enumerate(self.curves):
             y = series[i]
-            if not y:
+            if not len(y):
                 continue
             curve.setData(times[:len(y)], y)
             plot = self.plots[i]
-            mx = max(times)
+            mx = times[-1]
             plot.setXRange(mx - 20, mx)
 
             a, mi, ma = self.stats_labels[i]
             unit = '°' if i < 3 else ' m'
             a.setText(f"Actual: {y[-1]:.2f}{unit}")
-            mi.setText(f"Min:    {min(y):.2f}{unit}")
-            ma.setText(f"Max:    {max(y):.2f}{unit}")
+            mi.setText(f"Min:    {y.min():.2f}{unit}")
+            ma.setText(f"Max:    {y.max():.2f}{unit}")
 
     def updateConfig(self, new_config: Dict[str, Any]) -> None:
         """Allow runtime changes to titles, colors, and refresh rate."""
@@ -440,10 +499,12 @@ class BatteryMonitoring(QWidget):
         self.toggle_button.clicked.connect(self.toggle_view)
         main_layout.addWidget(self.toggle_button)
         date_axis = DateAxisItem(orientation='bottom')
-        self.plot_widget = pg.PlotWidget(axisItems={'bottom': date_axis})
+        self.plot_widget = TimedPlotWidget(stage="battery", axisItems={'bottom': date_axis})
         
         self.plot_widget.setLabel('left', "Battery (%)" if self.show_percentage else "Battery (V)")
         self.plot_widget.setLabel('bottom', "Time")
+        self.plot_widget.setClipToView(True)
+        self.plot_widget.setDownsampling(auto=True, mode='peak')
         main_layout.addWidget(self.plot_widget)
         self.curve = self.plot_widget.plot([], [], pen='m')
         stats_layout = QGridLayout()
@@ -481,18 +542,16 @@ class BatteryMonitoring(QWidget):
 
     def update_plot(self) -> None:
         base_interval_ms = 200
-        sampling_factor = int(round(self.frequency / base_interval_ms))
-        x_data_full = list(self.data_handler.time_buffer)
-        x_data = x_data_full[::sampling_factor]
+        sampling_factor = max(1, int(round(self.frequency / base_interval_ms)))
+        x_data = self.data_handler.time_buffer[::sampling_factor]
         if self.show_percentage:
-            y_data_full = list(getattr(self.data_handler, "battery_percentage", []))
+            y_data = self.data_handler.battery_percentage[::sampling_factor]
         else:
-            y_data_full = list(getattr(self.data_handler, "battery_voltage", []))
-        y_data = y_data_full[::sampling_factor] if y_data_full else []
-        if not x_data or not y_data:
+            y_data = self.data_handler.battery_voltage[::sampling_factor]
+        if not len(x_data) or not len(y_data):
             return
         self.curve.setData(x_data, y_data)
-        max_time = max(x_data)
+        max_time = x_data[-1]
         min_time = max_time - 20
         self.plot_widget.setXRange(min_time, max_time)
         if self.show_percentage:
@@ -500,8 +559,8 @@ class BatteryMonitoring(QWidget):
         else:
             self.plot_widget.setYRange(10, 14.6)
         current = y_data[-1]
-        min_val = min(y_data)
-        max_val = max(y_data)
+        min_val = y_data.min()
+        max_val = y_data.max()
         unit = "%" if self.show_percentage else "V"
         self.current_value_label.setText(f"Actual: {current:.2f}{unit}")
         self.min_value_label.setText(f"Min: {min_val:.2f}{unit}")
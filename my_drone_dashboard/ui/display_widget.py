@@ -6,13 +6,19 @@ from PyQt6.QtWidgets import (
     QLabel, QProgressBar, QSizePolicy,QSplitter
 )
 from PyQt6.QtCore import Qt, QTimer
-from PyQt6.QtGui import QFont
+from PyQt6.QtGui import QFont, QKeySequence, QMatrix4x4, QShortcut
 import pyqtgraph as pg
 from pyqtgraph.opengl import GLViewWidget, GLLinePlotItem
 import numpy as np
+import logging
+import os
 from typing          import Any, Dict
 from pdf import DroneAttitudeIndicator, HeadingIndicator
 from ui.blocks import MotorCurrentVisualization, OrientationAltitudeVisualization, BatteryMonitoring
+from ui.perf_overlay import PerfOverlay
+from ui.render_scheduler import RenderScheduler
+from utils.logging_setup import PERF_LOGGER, perf_log_active, start_perf_log, stop_perf_log
+from utils.perf import TIMINGS
 
 class MotorBlock(QWidget):
     """Group box for motor current visualization."""
@@ -45,11 +51,6 @@ class OrientationAltitudeBlock(QWidget):
         self.data_handler = data_handler
         self.initUI()
 
-        # timer to refresh PFD & gauges
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refresh_controls)
-        self.timer.start(50)
-
     def initUI(self) -> None:
         self.group_box = QGroupBox("Orientation & Altitude & Stats")
         group_layout = QVBoxLayout()
@@ -69,6 +70,8 @@ class OrientationAltitudeBlock(QWidget):
         center = QVBoxLayout()
         self.attitude = DroneAttitudeIndicator()
         self.heading  = HeadingIndicator()
+        threshold = self.data_handler.config.get("pfd_repaint_threshold_px", 0.5)
+        self.attitude.threshold_px = self.heading.threshold_px = threshold
         center.addWidget(self.attitude)
         center.addWidget(self.heading)
         pfd_layout.addLayout(center)
@@ -115,13 +118,12 @@ class OrientationAltitudeBlock(QWidget):
 
     def refresh_controls(self) -> None:
         """Update PFD and RC gauge values from data_handler."""
-        from datetime import datetime, timezone
-        def safe(buf, d=0.0): return buf[-1] if buf else d
+        store = self.data_handler.store
 
         # attitude
-        roll  = safe(self.data_handler.orientation[0])
-        pitch = safe(self.data_handler.orientation[1])
-        yaw   = safe(self.data_handler.orientation[2])
+        roll  = store.latest("roll")
+        pitch = store.latest("pitch")
+        yaw   = store.latest("yaw")
         self.attitude.setPitchRoll(pitch, roll)
         self.heading.setHeading(yaw)
 
@@ -134,6 +136,9 @@ class OrientationAltitudeBlock(QWidget):
 
     def updateConfig(self, new_config: Dict[str, Any]) -> None:
         self.orient_block.updateConfig(new_config)
+        if "pfd_repaint_threshold_px" in new_config:
+            threshold = float(new_config["pfd_repaint_threshold_px"])
+            self.attitude.threshold_px = self.heading.threshold_px = threshold
 
 
 class BatteryBlock(QWidget):
@@ -159,18 +164,47 @@ class BatteryBlock(QWidget):
     def updateConfig(self, new_config: dict) -> None:
         self.battery_block.updateConfig(new_config)
 
+def attitude_matrices(roll, pitch, yaw) -> np.ndarray:
+    """Rotation matrices (..., 3, 3) for angles in degrees.
+
+    Same composition as ``rotate(yaw, z); rotate(pitch, y); rotate(roll, x)``
+    on a GLGraphicsItem: R = Rx(roll) @ Ry(pitch) @ Rz(yaw).  Vectorized
+    over array inputs.
+    """
+    r, p, y = (np.radians(np.asarray(a, dtype=np.float64)) for a in (roll, pitch, yaw))
+    cr, sr, cp, sp, cy, sy = np.cos(r), np.sin(r), np.cos(p), np.sin(p), np.cos(y), np.sin(y)
+    return np.stack([
+        np.stack([cp * cy,                 -cp * sy,                 sp], -1),
+        np.stack([sr * sp * cy + cr * sy, -sr * sp * sy + cr * cy, -sr * cp], -1),
+        np.stack([-cr * sp * cy + sr * sy, cr * sp * sy + sr * cy,  cr * cp], -1),
+    ], -2)
+
+
 class DroneStatusBlock(QWidget):
     """Block to display drone status information plus 3D wireframe."""
+    # wireframe as one 'lines' item: vertex pairs + per-vertex colors
+    ARM_VERTICES = np.array([
+        [0, 0, 0], [0, 1, 0],      # front arm
+        [0, 1, 0], [0, 1.2, 0],    # arrow
+        [0, 0, 0], [0, -1, 0],     # back
+        [0, 0, 0], [-1, 0, 0],     # left
+        [0, 0, 0], [1, 0, 0],      # right
+    ], dtype=np.float32)
+    ARM_COLORS = np.repeat(np.array([
+        (0, 1, 0, 1), (1, 1, 1, 1), (1, 0, 0, 1), (0, 0, 1, 1), (0, 0, 1, 1),
+    ], dtype=np.float32), 2, axis=0)
+    NOSE         = np.array([0, 1.2, 0])
+    TRAIL_POINTS = 2048     # trail vertices; longer buffers are strided
+    MIN_CHANGE   = 1e-3     # degrees; smaller changes keep the transform
+
     def __init__(self, data_handler: Any) -> None:
         super().__init__()
         self.data_handler = data_handler
+        self.show_trail = bool(self.data_handler.config.get("orientation_trail", False))
+        self._orientation = None   # (roll, pitch, yaw) of the current transform
+        self._trail_total = -1     # store.total the trail was built from
         self.initUI()
 
-        # Timer to refresh both grid and 3D model
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refresh_status)
-        self.timer.start(50)  # 20 Hz
-
     def initUI(self) -> None:
         group_box = QGroupBox("Drone Status")
         main_layout = QVBoxLayout()
@@ -181,32 +215,18 @@ class DroneStatusBlock(QWidget):
         self.gl_view.setBackgroundColor(pg.mkColor(30,30,30))
         self.gl_view.opts['distance'] = 20
 
-        # build the drone arms
-        arms = []
-        # front arm + arrow
-        arms.append(GLLinePlotItem(
-            pos=np.array([[0,0,0],[0,1,0]], dtype=np.float32),
-            color=(0,1,0,1), width=3))
-        arms.append(GLLinePlotItem(
-            pos=np.array([[0,1,0],[0,1.2,0]], dtype=np.float32),
-            color=(1,1,1,1), width=3))
-        # back
-        arms.append(GLLinePlotItem(
-            pos=np.array([[0,0,0],[0,-1,0]], dtype=np.float32),
-            color=(1,0,0,1), width=3))
-        # left/right
-        arms.append(GLLinePlotItem(
-            pos=np.array([[0,0,0],[-1,0,0]], dtype=np.float32),
-            color=(0,0,1,1), width=3))
-        arms.append(GLLinePlotItem(
-            pos=np.array([[0,0,0],[1,0,0]], dtype=np.float32),
-            color=(0,0,1,1), width=3))
-
-        self.drone_lines = arms
-        for item in self.drone_lines:
-            self.gl_view.addItem(item)
-
-       
+        # build the drone arms: vertices are uploaded once, orientation
+        # only changes the item's transform
+        self.drone_item = GLLinePlotItem(
+            pos=self.ARM_VERTICES, color=self.ARM_COLORS, width=3, mode='lines')
+        self.gl_view.addItem(self.drone_item)
+
+        # optional trail of the nose over the whole buffer, one line strip
+        self.trail_item = GLLinePlotItem(
+            pos=np.zeros((1, 3), dtype=np.float32), width=1, mode='line_strip')
+        self.trail_item.setVisible(self.show_trail)
+        self.gl_view.addItem(self.trail_item)
+
 
         # — Status grid —
         grid = QGridLayout()
@@ -257,7 +277,7 @@ class DroneStatusBlock(QWidget):
 
     def refresh_status(self) -> None:
         from datetime import datetime, timezone
-        def safe(buf, d=0.0): return buf[-1] if buf else d
+        store = self.data_handler.store
 
         # update grid values
         self.lat_value.setText(f"{self.data_handler.gps_lat:.6f}")
@@ -265,24 +285,57 @@ class DroneStatusBlock(QWidget):
         self.alt_value.setText(f"{self.data_handler.gps_alt:.2f}")
         self.utc_value.setText(
     datetime.fromtimestamp(
-        self.data_handler.time_buffer[-1]  # Use actual timestamp from buffer
+        store.latest("time")  # Use actual timestamp from buffer
     ).strftime("%Y-%m-%d %H:%M:%S")
-) if self.data_handler.time_buffer else "N/A"
+) if len(store) else "N/A"
         self.speed_value.setText(f"{self.data_handler.speed_over_ground:.2f}")
         self.course_value.setText(f"{self.data_handler.course:.2f}")
         self.fix_value.setText(str(self.data_handler.gps_fix))
         self.sat_value.setText(str(self.data_handler.num_satellites))
 
         # update 3D orientation
-        roll  = safe(self.data_handler.orientation[0])
-        pitch = safe(self.data_handler.orientation[1])
-        yaw   = safe(self.data_handler.orientation[2])
-
-        for item in self.drone_lines:
-            item.resetTransform()
-            item.rotate(yaw,   0,0,1)
-            item.rotate(pitch, 0,1,0)
-            item.rotate(roll,  1,0,0)
+        roll  = store.latest("roll")
+        pitch = store.latest("pitch")
+        yaw   = store.latest("yaw")
+
+        self._update_orientation(roll, pitch, yaw)
+        if self.show_trail:
+            self._update_trail()
+
+    def _update_orientation(self, roll: float, pitch: float, yaw: float) -> None:
+        """Set the wireframe transform; skipped when the attitude has not moved."""
+        if self._orientation is not None and np.allclose(
+                self._orientation, (roll, pitch, yaw), rtol=0, atol=self.MIN_CHANGE):
+            return
+        self._orientation = (roll, pitch, yaw)
+        m = np.eye(4)
+        m[:3, :3] = attitude_matrices(roll, pitch, yaw)
+        self.drone_item.setTransform(QMatrix4x4(*m.ravel().tolist()))
+
+    def _update_trail(self) -> None:
+        """Nose positions for every buffered attitude, as one line strip."""
+        store = self.data_handler.store
+        if store.total == self._trail_total or len(store) < 2:
+            return
+        self._trail_total = store.total
+        step = -(-len(store) // self.TRAIL_POINTS)
+        first = (len(store) - 1) % step   # keep the newest sample
+        rot = attitude_matrices(store.column("roll")[first::step],
+                                store.column("pitch")[first::step],
+                                store.column("yaw")[first::step])
+        pos = (rot @ self.NOSE).astype(np.float32)
+        color = np.empty((len(pos), 4), dtype=np.float32)
+        color[:, :3] = (1.0, 0.8, 0.2)
+        color[:, 3] = np.linspace(0.05, 1.0, len(pos))   # older = fainter
+        self.trail_item.setData(pos=pos, color=color)
+
+    def updateConfig(self, new_config: Dict[str, Any]) -> None:
+        if "orientation_trail" in new_config:
+            self.show_trail = bool(new_config["orientation_trail"])
+            self.trail_item.setVisible(self.show_trail)
+            self._trail_total = -1
+            if self.show_trail:
+                self._update_trail()
 class DisplayWidget(QWidget):
     """Combined display widget for telemetry data with adjustable panel sizes both horizontally and vertically."""
     def __init__(self, data_handler: Any) -> None:
@@ -290,8 +343,22 @@ class DisplayWidget(QWidget):
         self.data_handler = data_handler
         self.initUI()
 
-        # redraw everything whenever new data arrives
-        self.data_handler.dataUpdated.connect(self._refresh_all)
+        # new data only marks the panels dirty; the scheduler redraws
+        # each visible one at most once per frame
+        self.scheduler = RenderScheduler(
+            self.data_handler.config.get("render_fps", 30), self)
+        self._register_panels()
+        self.data_handler.dataUpdated.connect(self.scheduler.mark_dirty)
+
+        # instrumentation: F3 toggles the timing overlay; with perf_log on,
+        # a summary goes to <log_dir>/perf.jsonl every perf_log_interval s
+        self.perf_overlay = PerfOverlay(self)
+        self.perf_overlay.counters = self._instrument_counters
+        QShortcut(QKeySequence("F3"), self, activated=self.toggle_perf_overlay)
+        self.perf_timer = QTimer(self)
+        self.perf_timer.setInterval(5000)
+        self.perf_timer.timeout.connect(self._log_perf)
+        self._apply_perf_config(self.data_handler.config)
 
     def initUI(self) -> None:
         # Main layout
@@ -338,16 +405,55 @@ class DisplayWidget(QWidget):
         main_layout.addWidget(main_hsplit)
         self.setLayout(main_layout)
 
-    def _refresh_all(self):
-        print("Refresh called!")  # Debug line
-        print(f"Motor data length: {len(self.data_handler.motor_currents[0])}")  # Debug line
-        print(f"Time data length: {len(self.data_handler.time_buffer)}")  # Debug line
-        
-        try:
-            self.motor_block.motor_block.update_plot()
-            self.orientation_block.orient_block.update_plot()
-            self.battery.battery_block.update_plot()
-            self.drone_status.refresh_status()
-            print("Refresh completed successfully!")  # Debug line
-        except Exception as e:
-            print(f"Refresh error: {e}")
\ No newline at end of file
+    def _register_panels(self) -> None:
+        sched = self.scheduler
+        motor  = self.motor_block.motor_block
+        orient = self.orientation_block.orient_block
+        sched.register("motor",    motor,  motor.update_plot)
+        sched.register("orient",   orient, orient.update_plot)
+        sched.register("pfd",      self.orientation_block.attitude,
+                       self.orientation_block.refresh_controls)
+        sched.register("battery",  self.battery.battery_block,
+                       self.battery.battery_block.update_plot)
+        sched.register("status",   self.drone_status,
+                       self.drone_status.refresh_status)
+
+    # ------------------------------------------------------------------ instrumentation
+
+    def toggle_perf_overlay(self) -> None:
+        self.perf_overlay.setVisible(not self.perf_overlay.isVisible())
+
+    def _apply_perf_config(self, config: Dict[str, Any]) -> None:
+        if "perf_overlay" in config:
+            self.perf_overlay.setVisible(bool(config["perf_overlay"]))
+        if "perf_log_interval" in config:
+            self.perf_timer.setInterval(int(float(config["perf_log_interval"]) * 1000))
+        if config.get("perf_log"):
+            if not perf_log_active():
+                log_dir = self.data_handler.config.get("log_dir", "logs")
+                start_perf_log(os.path.join(log_dir, "perf.jsonl"))
+            self.perf_timer.start()
+        elif "perf_log" in config:
+            self.perf_timer.stop()
+            stop_perf_log()
+
+    def _log_perf(self) -> None:
+        stats = {stage: {k: round(v, 3) for k, v in s.items()}
+                 for stage, s in TIMINGS.summary().items()}
+        if stats:
+            logging.getLogger(PERF_LOGGER).info("timings", extra={"perf": {
+                "stages": stats, "instruments": self._instrument_counters()}})
+
+    def _instrument_counters(self) -> Dict[str, Dict[str, int]]:
+        """Paints issued vs. repaints suppressed by the PFD thresholds."""
+        block = self.orientation_block
+        return {name: {"paints": w.paints, "suppressed": w.suppressed}
+                for name, w in (("pfd.attitude", block.attitude), ("pfd.heading", block.heading))}
+
+    def updateConfig(self, new_config: Dict[str, Any]) -> None:
+        self.scheduler.updateConfig(new_config)
+        self._apply_perf_config(new_config)
+        self.motor_block.updateConfig(new_config)
+        self.orientation_block.updateConfig(new_config)
+        self.battery.updateConfig(new_config)
+        self.drone_status.updateConfig(new_config)
@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from PyQt6.QtWidgets import (
     QMainWindow, QTabWidget, QLabel, QPushButton, QWidget, QHBoxLayout,
     QMessageBox
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 
 from ui.display_widget import DisplayWidget
 from ui.reload_window  import ReloadWindow
@@ -25,7 +25,11 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.data_handler = data_handler
         self.initUI()
-        self._setup_connection_timer()
+        self.data_handler.connectionChanged.connect(self._update_connection_status)
+        self.data_handler.logFinalized.connect(self._on_log_finalized)
+        self._saving: Optional[str] = None   # .qlog that Stop & Save is waiting for
+        self._update_connection_status(self.data_handler.serial_link.state,
+                                       self.data_handler.serial_link.detail)
 
     # ------------------------------------------------------------------ UI
 
@@ -62,8 +66,8 @@ class MainWindow(QMainWindow):
         tab_widget.addTab(self.telemetry_widget, "Telemetry")
 
         # ── Camera tab -----------------------------------------------------
-        camera_window = MultiCameraWindow()
-        camera_widget = camera_window.centralWidget() or camera_window
+        self.camera_window = MultiCameraWindow(config=self.data_handler.config)
+        camera_widget = self.camera_window.centralWidget() or self.camera_window
         tab_widget.addTab(camera_widget, "Camera")
 
         # ── Reload Data tab ------------------------------------------------
@@ -72,61 +76,68 @@ class MainWindow(QMainWindow):
 
         self.setCentralWidget(tab_widget)
 
-    # ------------------------------------------------------------------ connection polling
-
-    def _setup_connection_timer(self) -> None:
-        self.conn_timer = QTimer(self)
-        self.conn_timer.timeout.connect(self._update_connection_status)
-        self.conn_timer.start(500)  # twice per second
-
-    def _update_connection_status(self) -> None:
-        ser = self.data_handler.serial_device
-        if ser and ser.is_open:
-            self.conn_label.setText("Connected")
-            self.conn_label.setStyleSheet("color:green;font-weight:bold;")
-        else:
-            self.conn_label.setText("Disconnected")
-            self.conn_label.setStyleSheet("color:red;font-weight:bold;")
+    # ------------------------------------------------------------------ connection state
+
+    CONNECTION_STYLE = {
+        "connected":    ("Connected",     "green"),
+        "connecting":   ("Connecting…",   "orange"),
+        "reconnecting": ("Reconnecting…", "orange"),
+        "waiting":      ("No device",     "orange"),
+        "idle":         ("Disconnected",  "red"),
+    }
+
+    def _update_connection_status(self, state: str, detail: str) -> None:
+        """SerialLink state change (queued from its worker thread)."""
+        text, color = self.CONNECTION_STYLE.get(state, ("Disconnected", "red"))
+        self.conn_label.setText(text)
+        self.conn_label.setToolTip(detail)
+        self.conn_label.setStyleSheet(f"color:{color};font-weight:bold;")
+        # a running link keeps reconnecting by itself; Connect only restarts a stopped one
+        self.connect_btn.setEnabled(not self.data_handler.serial_link.active)
 
     # ------------------------------------------------------------------ slots / actions
 
     def _on_connect_clicked(self) -> None:
-        """Attempt to (re)connect the Arduino and start serial thread."""
-        if self.data_handler.serial_connected:
-            QMessageBox.information(self, "Already connected",
-                                    "Arduino is already connected.")
+        """Start the background connection (returns at once; the label follows its state)."""
+        if not self.data_handler.arduino_port:
+            QMessageBox.warning(self, "No port configured",
+                                "Set the Arduino port on the Configuration tab.")
             return
-
-        ok = self.data_handler.connect_to_arduino()
-        if ok:
-            self.data_handler.start_serial_thread()
-            # ensure sampling timer is running (may have been stopped)
-            if not self.data_handler.timer.isActive():
-                self.data_handler.timer.start(200)
-            QMessageBox.information(self, "Connected",
-                                    f"Connected to {self.data_handler.arduino_port}")
-            self.connect_btn.setEnabled(False)  # prevent double click
-            self.stop_btn.setEnabled(True)
-        else:
-            QMessageBox.warning(self, "Connection failed",
-                                "Cannot connect to Arduino. Check the port and cable.")
+        self.data_handler.connect_to_arduino()
+        self.data_handler.running = True
+        # ensure sampling timer is running (may have been stopped)
+        if not self.data_handler.timer.isActive():
+            self.data_handler.timer.start(self.data_handler.update_interval)
+        self.connect_btn.setEnabled(False)  # prevent double click
+        self.stop_btn.setEnabled(True)
 
     def _on_stop_clicked(self) -> None:
-        """Stop timers, close serial and save the Excel log."""
+        """Stop timers, close serial and finalize the flight log."""
         if self.data_handler.timer.isActive() or self.data_handler.running:
-            self.data_handler.stop()
+            if self.data_handler.recorder is not None:
+                self._saving = self.data_handler.log_path
+            self.data_handler.stop()   # compaction continues in the background
             self.stop_btn.setEnabled(False)
             self.connect_btn.setEnabled(True)
-            QMessageBox.information(self, "Data saved",
-                                    "Telemetry log saved to quadcopter_data.xlsx")
+
+    def _on_log_finalized(self, source: str, path: str) -> None:
+        """A flight log was compacted in the background (ours or a recovered one)."""
+        if path:
             self.reload_widget.apply_reload()
+        if source != self._saving:   # a crashed session recovered at start
+            return
+        self._saving = None
+        if path:
+            QMessageBox.information(self, "Data saved", f"Telemetry log saved to {path}")
+        else:
+            QMessageBox.warning(self, "Save failed",
+                                "The flight log could not be compacted; it will be recovered on the next start.")
 
     # ------------------------------------------------------------------ propagate config
 
     def updateConfig(self, new_config: dict) -> None:
-        self.telemetry_widget.motor_block.updateConfig(new_config)
-        self.telemetry_widget.orientation_block.updateConfig(new_config)
-        self.telemetry_widget.battery.updateConfig(new_config)
+        self.telemetry_widget.updateConfig(new_config)
+        self.camera_window.updateConfig(new_config)
 
     # ------------------------------------------------------------------ window life‑cycle
 
@@ -134,6 +145,7 @@ class MainWindow(QMainWindow):
         # guarantee we flush data to disk even on window X
         if self.data_handler.timer.isActive() or self.data_handler.running:
             self.data_handler.stop()
+        self.camera_window.stop_all()
         super().closeEvent(event)
 
    
\ No newline at end of file
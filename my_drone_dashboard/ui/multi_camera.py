@@ -1,17 +1,108 @@
 #multi_camera.py
 
-from PyQt6.QtWidgets import QMainWindow, QWidget, QGridLayout, QVBoxLayout, QLabel, QLineEdit, QPushButton
-from PyQt6.QtCore import QTimer, Qt
-from PyQt6.QtGui import QImage, QPixmap
-import cv2
+import math
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from PyQt6.QtWidgets import QMainWindow, QWidget, QGridLayout, QHBoxLayout, QVBoxLayout, QLabel, QLineEdit, QPushButton, QSizePolicy
+from PyQt6.QtCore import QEvent, QObject, QPointF, QRectF, QTimer, Qt, pyqtSignal
+from PyQt6.QtGui import QColor, QImage, QPainter, QPen
+import numpy as np
+
+from camera_process import CameraProcess
+from camera_recorder import recording_stem
+from utils.perf import TIMINGS
+
+class VideoTile(QWidget):
+    """Paints a BGR frame straight from its NumPy buffer.
+
+    The capture worker already downscaled the frame to :meth:`device_size`,
+    so painting is one ``Format_BGR888`` QImage over the array (no colour
+    conversion, no copy) drawn unscaled.  Frames from before a resize are
+    scaled to fit until the worker catches up.
+    """
+    clicked       = pyqtSignal()
+    doubleClicked = pyqtSignal()
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
+        self.setMinimumSize(160, 90)
+        self.frame: Optional[np.ndarray] = None
+        self.text = "Video Feed"
+        self.highlighted = False
+
+    def set_highlighted(self, on: bool) -> None:
+        if on != self.highlighted:
+            self.highlighted = on
+            self.update()
+
+    def mousePressEvent(self, event) -> None:
+        self.clicked.emit()
+        super().mousePressEvent(event)
+
+    def mouseDoubleClickEvent(self, event) -> None:
+        self.doubleClicked.emit()
+        super().mouseDoubleClickEvent(event)
+
+    def device_size(self) -> tuple:
+        dpr = self.devicePixelRatioF()
+        return max(1, round(self.width() * dpr)), max(1, round(self.height() * dpr))
+
+    def set_frame(self, frame: np.ndarray) -> None:
+        self.frame = frame   # keeps the buffer alive while QImage points at it
+        self.update()
+
+    def set_text(self, text: str) -> None:
+        if self.frame is None and text == self.text:
+            return
+        self.frame = None
+        self.text = text
+        self.update()
+
+    def paintEvent(self, event) -> None:
+        with TIMINGS.measure("camera.paint"):
+            painter = QPainter(self)
+            painter.fillRect(self.rect(), QColor(0, 0, 0))
+            frame = self.frame
+            if frame is None:
+                painter.setPen(QColor(200, 200, 200))
+                painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self.text)
+            else:
+                self._draw_frame(painter, frame)
+            if self.highlighted:
+                painter.setPen(QPen(QColor(0, 170, 255), 2))
+                painter.drawRect(QRectF(self.rect()).adjusted(1, 1, -1, -1))
+
+    def _draw_frame(self, painter: QPainter, frame: np.ndarray) -> None:
+        height, width = frame.shape[:2]
+        image = QImage(frame.data, width, height, frame.strides[0], QImage.Format.Format_BGR888)
+        dpr = self.devicePixelRatioF()
+        box_w, box_h = self.width() * dpr, self.height() * dpr
+        if width <= box_w and height <= box_h:
+            image.setDevicePixelRatio(dpr)
+            painter.drawImage(QPointF((box_w - width) / (2 * dpr), (box_h - height) / (2 * dpr)), image)
+        else:
+            scale = min(box_w / width, box_h / height) / dpr
+            w, h = width * scale, height * scale
+            painter.drawImage(QRectF((self.width() - w) / 2, (self.height() - h) / 2, w, h), image)
 
 class VideoChannelWidget(QWidget):
-    """Widget for a single video channel."""
+    """Widget for a single video channel.
+
+    Capture and decoding run in the channel's :class:`CameraProcess`;
+    the GUI timer only picks up the newest decoded frame.
+    """
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
-        self.cap = None
+        self.capture = None
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.update_frame)
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.update_stats)
+        self.age_ms = 0.0
         self.initUI()
 
     def initUI(self) -> None:
@@ -20,47 +111,119 @@ class VideoChannelWidget(QWidget):
         self.url_edit.setPlaceholderText("Enter IP Webcam URL")
         self.start_button = QPushButton("Start", self)
         self.start_button.clicked.connect(self.start_stream)
-        self.video_label = QLabel("Video Feed", self)
-        self.video_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.video = VideoTile(self)
+        self.stats_label = QLabel("", self)
+        self.stats_label.setStyleSheet("font-family: monospace; font-size: 11px;")
         layout.addWidget(self.url_edit)
         layout.addWidget(self.start_button)
-        layout.addWidget(self.video_label)
+        layout.addWidget(self.video, 1)
+        layout.addWidget(self.stats_label)
 
     def start_stream(self) -> None:
-        if self.cap is not None and self.cap.isOpened():
-            self.cap.release()
+        self.stop_stream()
         url = self.url_edit.text().strip()
         if url:
-            self.cap = cv2.VideoCapture(url)
-            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            self.capture = CameraProcess(url)
+            self.capture.target_size = self.video.device_size()
+            self.capture.start()
+            self.video.set_text("Connecting…")
             self.timer.start(30)
+            self.stats_timer.start(1000)
+
+    def stop_stream(self) -> None:
+        self.timer.stop()
+        self.stats_timer.stop()
+        if self.capture is not None:
+            self.capture.stop()
+            self.capture = None
 
     def update_frame(self) -> None:
-        if self.cap is not None:
-            ret, frame = self.cap.read()
-            if ret:
-                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                height, width, _ = frame.shape
-                bytes_per_line = 3 * width
-                q_img = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888)
-                pixmap = QPixmap.fromImage(q_img).scaled(self.video_label.size(), Qt.AspectRatioMode.KeepAspectRatio)
-                self.video_label.setPixmap(pixmap)
-            else:
-                self.video_label.setText("Failed to read frame")
+        if self.capture is None:
+            return
+        self.capture.target_size = self.video.device_size()   # follows tile resizes
+        captured = self.capture.latest()
+        if captured is None:
+            if self.capture.stats.state == "error":
+                self.video.set_text("Failed to read frame")
+            return
+        self.age_ms = (time.monotonic() - captured.captured) * 1e3
+        self.video.set_frame(captured.image)
+
+    def update_stats(self) -> None:
+        if self.capture is None:
+            return
+        s = self.capture.stats
+        rate = self.capture.requested_fps
+        requested = "max" if math.isinf(rate) else f"{rate:.3g}" if rate > 0 else "paused"
+        self.stats_label.setText(
+            f"{s.fps:5.1f}/{requested} fps  decode {s.decode_ms:5.1f} ms (1/{s.reduction})  resize {s.resize_ms:4.1f} ms  age {self.age_ms:5.1f} ms  "
+            f"dropped {s.dropped}  errors {s.errors}  restarts {s.restarts}"
+            + (f"  rec {s.recorded}" if self.capture.recording else ""))
 
     def closeEvent(self, event) -> None:
-        if self.cap is not None and self.cap.isOpened():
-            self.cap.release()
+        self.stop_stream()
         event.accept()
 
+class DecodeBudget:
+    """Splits a total decode rate (frames/s over all channels) between tiles.
+
+    The focused tile gets ``focus_fps``; the other live tiles share what
+    is left, capped at ``background_fps`` and never below ``MIN_FPS`` so
+    they keep updating.  With no focused tile the budget is split evenly.
+    Nothing is decoded while the camera view is hidden.
+    """
+    MIN_FPS = 1.0
+
+    def __init__(self, total: float = 60.0, focus_fps: float = 30.0, background_fps: float = 5.0) -> None:
+        self.total          = total
+        self.focus_fps      = focus_fps
+        self.background_fps = background_fps
+
+    def allocate(self, live: List[bool], focused: Optional[int], visible: bool) -> List[float]:
+        """Requested fps per channel; 0 pauses a channel."""
+        rates = [0.0] * len(live)
+        channels = [i for i, on in enumerate(live) if on]
+        if not visible or not channels:
+            return rates
+        if focused in channels:
+            rates[focused] = min(self.focus_fps, self.total)
+            others = [i for i in channels if i != focused]
+            if others:
+                share = max(0.0, self.total - rates[focused]) / len(others)
+                for i in others:
+                    rates[i] = max(self.MIN_FPS, min(self.background_fps, share))
+        else:
+            share = self.total / len(channels)
+            for i in channels:
+                rates[i] = max(self.MIN_FPS, min(self.focus_fps, share))
+        return rates
+
+
 class MultiCameraWindow(QMainWindow):
-    """Window for displaying multiple video channels."""
-    def __init__(self, parent=None) -> None:
+    """Window for displaying multiple video channels.
+
+    Click a tile to focus it (full decode rate), double-click to enlarge
+    it alone; :class:`DecodeBudget` sets every channel's decode rate.
+    "Record" writes every running channel (and any started meanwhile) to
+    ``<log_dir>/camera_*`` segments that the reload tab plays back.
+    """
+    def __init__(self, parent=None, config: Optional[Dict] = None) -> None:
         super().__init__(parent)
         self.setWindowTitle("4 Video Channels")
         central_widget = QWidget(self)
         self.setCentralWidget(central_widget)
-        grid_layout = QGridLayout(central_widget)
+        self.view = central_widget   # centralWidget() is None once embedded in a tab
+        layout = QVBoxLayout(central_widget)
+        bar = QHBoxLayout()
+        self.record_button = QPushButton("Record", self)
+        self.record_button.setCheckable(True)
+        self.record_button.toggled.connect(self.set_recording)
+        self.record_label = QLabel("", self)
+        bar.addWidget(self.record_button)
+        bar.addWidget(self.record_label, 1)
+        layout.addLayout(bar)
+        grid_layout = QGridLayout()
+        layout.addLayout(grid_layout, 1)
         self.channels = []
         for i in range(4):
             channel = VideoChannelWidget(self)
@@ -68,3 +231,84 @@ class MultiCameraWindow(QMainWindow):
             col = i % 2
             grid_layout.addWidget(channel, row, col)
             self.channels.append(channel)
+            channel.video.clicked.connect(lambda i=i: self.set_focus(i))
+            channel.video.doubleClicked.connect(lambda i=i: self.toggle_enlarged(i))
+            channel.start_button.clicked.connect(self.rebalance)
+            channel.start_button.clicked.connect(lambda _=False, i=i: self._record_channel(i))
+
+        self.log_dir  = "logs"
+        self.segment_seconds = 60.0
+        self.recording_since: Optional[datetime] = None
+        self.budget   = DecodeBudget()
+        self.focused: Optional[int] = None
+        self.enlarged: Optional[int] = None
+        self.updateConfig(config or {})
+        central_widget.installEventFilter(self)
+        # also catches window minimise / restore, which no child event reports
+        self.budget_timer = QTimer(self)
+        self.budget_timer.timeout.connect(self.rebalance)
+        self.budget_timer.start(500)
+
+    def set_focus(self, index: Optional[int]) -> None:
+        self.focused = index
+        for i, channel in enumerate(self.channels):
+            channel.video.set_highlighted(i == index)
+        self.rebalance()
+
+    def toggle_enlarged(self, index: int) -> None:
+        self.enlarged = None if self.enlarged == index else index
+        for i, channel in enumerate(self.channels):
+            channel.setVisible(self.enlarged is None or i == self.enlarged)
+        self.set_focus(index)
+
+    def _view_visible(self) -> bool:
+        return self.view.isVisible() and not self.view.window().isMinimized()
+
+    def rebalance(self) -> None:
+        """Push the budget's per-channel decode rates to the captures."""
+        live = [c.capture is not None and c.isVisible() for c in self.channels]
+        rates = self.budget.allocate(live, self.focused, self._view_visible())
+        for channel, rate in zip(self.channels, rates):
+            if channel.capture is not None:
+                channel.capture.requested_fps = rate
+
+    def set_recording(self, on: bool) -> None:
+        """Start or stop recording every running channel."""
+        self.recording_since = datetime.now() if on else None
+        for i, channel in enumerate(self.channels):
+            if on:
+                self._record_channel(i)
+            elif channel.capture is not None:
+                channel.capture.stop_recording()
+        self.record_button.setText("Stop Recording" if on else "Record")
+        self.record_label.setText(
+            f"Recording to {self.log_dir} since {self.recording_since:%H:%M:%S}" if on else "")
+
+    def _record_channel(self, index: int) -> None:
+        capture = self.channels[index].capture
+        if self.recording_since is None or capture is None:
+            return
+        stem = recording_stem(self.log_dir, f"ch{index + 1}", self.recording_since)
+        capture.start_recording(stem, self.segment_seconds)
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if event.type() in (QEvent.Type.Show, QEvent.Type.Hide):
+            QTimer.singleShot(0, self.rebalance)   # tab switched
+        return False
+
+    def updateConfig(self, new_config: Dict) -> None:
+        self.budget.total          = float(new_config.get("camera_decode_budget", self.budget.total))
+        self.budget.focus_fps      = float(new_config.get("camera_focus_fps", self.budget.focus_fps))
+        self.budget.background_fps = float(new_config.get("camera_background_fps", self.budget.background_fps))
+        self.segment_seconds       = float(new_config.get("camera_segment_seconds", self.segment_seconds))
+        self.log_dir               = new_config.get("log_dir", self.log_dir)
+        self.rebalance()
+
+    def stop_all(self) -> None:
+        """Stop every capture process (channels embedded in a tab never get closeEvent)."""
+        for channel in self.channels:
+            channel.stop_stream()
+
+    def closeEvent(self, event) -> None:
+        self.stop_all()
+        super().closeEvent(event)
@@ -0,0 +1,69 @@
+#perf_overlay.py
+
+"""Translucent per-stage timing table drawn over the telemetry view."""
+
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtCore import QEvent, QObject, Qt, QTimer
+from PyQt6.QtWidgets import QLabel, QWidget
+
+from utils.perf import TIMINGS
+
+
+class PerfOverlay(QLabel):
+    """Shows ``TIMINGS.summary()`` in the top-right corner of *parent*.
+
+    Refreshes twice a second, and only while shown.  ``counters`` may
+    return extra ``{name: {counter: value}}`` rows (e.g. PFD paints vs.
+    suppressed repaints).
+    """
+
+    def __init__(self, parent: QWidget) -> None:
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setTextFormat(Qt.TextFormat.PlainText)
+        self.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 170); color: #e0e0e0;"
+            "font-family: monospace; font-size: 11px;"
+            "padding: 6px; border-radius: 4px;")
+        self.counters: Optional[Callable[[], Dict[str, Dict[str, int]]]] = None
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        parent.installEventFilter(self)
+        self.hide()
+
+    def refresh(self) -> None:
+        stats = TIMINGS.summary()
+        lines = []
+        frame = stats.get("frame.interval")
+        if frame:
+            lines.append(f"render {1000.0 / frame['mean']:5.1f} fps")
+        lines.append(f"{'stage (ms)':24s} {'mean':>7s} {'p95':>7s} {'max':>7s}")
+        for stage, s in stats.items():
+            if stage != "frame.interval":
+                lines.append(f"{stage:24s} {s['mean']:7.2f} {s['p95']:7.2f} {s['max']:7.2f}")
+        if self.counters is not None:
+            for name, values in self.counters().items():
+                lines.append(f"{name:24s} " + "  ".join(f"{k} {v}" for k, v in values.items()))
+        self.setText("\n".join(lines))
+        self.adjustSize()
+        self._place()
+
+    def _place(self) -> None:
+        parent = self.parentWidget()
+        self.move(parent.width() - self.width() - 8, 8)
+        self.raise_()
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Resize and self.isVisible():
+            self._place()
+        return False
+
+    def showEvent(self, event) -> None:
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start(500)
+
+    def hideEvent(self, event) -> None:
+        super().hideEvent(event)
+        self.timer.stop()
@@ -1,28 +1,82 @@
 #reload_window.py
 
 import logging
+import os
 from datetime import datetime
-import pandas as pd
+import cv2
+import numpy as np
 from PyQt6.QtWidgets import (
     QGridLayout, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
-    QLabel, QComboBox, QLineEdit, QPushButton, QFrame
+    QLabel, QComboBox, QLineEdit, QPushButton, QFrame, QSlider
 )
 import pyqtgraph as pg
 from pyqtgraph import DateAxisItem
+from camera_recorder import CameraRecording, find_recordings
 from config_manager import load_config
+from flight_log import FlightLog, LogSlice, import_excel
+from flight_recorder import latest_log, session_path
+from mjpeg_stream import REDUCED_FLAGS, jpeg_size, reduction_for
+from ui.multi_camera import VideoTile
 from PyQt6.QtCore import Qt
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Union
+
+LEGACY_EXCEL = "quadcopter_data.xlsx"
+
+# channel name -> array: a FlightLog or a LogSlice of one (memory-mapped
+# views, nothing is read until a plot touches it)
+LogData = Union[FlightLog, LogSlice]
 
 class LocalDateAxisItem(DateAxisItem):
     """Custom DateAxisItem to format timestamps."""
     def tickStrings(self, values, scale, spacing):
         return [datetime.fromtimestamp(value).strftime("%H:%M:%S") for value in values]
 
+class LodCurve:
+    """Feeds one curve about two points per pixel of its visible X range.
+
+    The log's min/max pyramid is re-queried whenever the view is panned,
+    zoomed or resized, so long flights never push every sample to Qt.
+    """
+    def __init__(self, curve: pg.PlotDataItem, plot_widget: pg.PlotWidget,
+                 data: LogData, name: str) -> None:
+        self.curve = curve
+        self.view = plot_widget.getViewBox()
+        self.data = data
+        self.name = name
+        self._last = None
+        self.view.sigXRangeChanged.connect(self.refresh)
+        self.view.sigResized.connect(self.refresh)
+        self.refresh()
+
+    def set_channel(self, name: str) -> None:
+        self.name = name
+        self.refresh()
+
+    def refresh(self, *_) -> None:
+        if not len(self.data):
+            self.curve.setData([], [])
+            return
+        if self.view.autoRangeEnabled()[0]:
+            time_data = self.data.time
+            x0, x1 = float(time_data[0]), float(time_data[-1])
+        else:
+            x0, x1 = self.view.viewRange()[0]
+        width = max(100, int(self.view.width()))
+        key = (x0, x1, width, self.name)
+        if key == self._last:
+            return
+        self._last = key
+        self.curve.setData(*self.data.envelope(self.name, x0, x1, 2 * width))
+
+    def detach(self) -> None:
+        self.view.sigXRangeChanged.disconnect(self.refresh)
+        self.view.sigResized.disconnect(self.refresh)
+
 class ReloadMotorBlock(QWidget):
     """Block to display motor current plots and stats for reloaded data."""
-    def __init__(self, df: pd.DataFrame, config: Dict[str, Any]) -> None:
+    def __init__(self, data: LogData, config: Dict[str, Any]) -> None:
         super().__init__()
-        self.df = df
+        self.data = data
         self.config = config
         self.titles = self.config.get("reload_motor_titles", [])
         self.colors = self.config.get("reload_motor_colors", [])
@@ -44,6 +98,7 @@ class ReloadMotorBlock(QWidget):
         self.motor_plots = []
         self.stats_labels = []
         self.titles_labels = []
+        self.lod_curves = []
 
         for i in range(4):
             motor_widget = QWidget()
@@ -93,23 +148,25 @@ class ReloadMotorBlock(QWidget):
 
     def plot_data(self) -> None:
         """Plot motor data and update stats labels."""
-        time_data = self.df["Timestamp"].tolist()
-        time_data_ts = [t.to_pydatetime().timestamp() for t in time_data]
-        motors = [self.df.get(f"Motor{i+1}", []).tolist() for i in range(4)]
+        for lod in self.lod_curves:
+            lod.detach()
+        self.lod_curves = []
+        motors = [self.data.get(f"motor{i+1}_current", np.empty(0)) for i in range(4)]
         for i in range(4):
             plot_widget = self.motor_plots[i]
             plot_widget.clear()
-            if time_data_ts and motors[i]:
-                plot_widget.plot(
-                    time_data_ts, motors[i],
+            if len(motors[i]):
+                curve = plot_widget.plot(
+                    [], [],
                     pen=pg.mkPen(color=self.colors[i] if i < len(self.colors) else "#000000", width=2),
                     name=self.titles[i] if i < len(self.titles) else f"Motor {i+1}"
                 )
+                self.lod_curves.append(LodCurve(curve, plot_widget, self.data, f"motor{i+1}_current"))
                 plot_widget.enableAutoRange(axis=pg.ViewBox.XAxis, enable=True)
-            if motors[i]:
-                avg_val = sum(motors[i]) / len(motors[i])
-                min_val = min(motors[i])
-                max_val = max(motors[i])
+            if len(motors[i]):
+                avg_val = motors[i].mean()
+                min_val = motors[i].min()
+                max_val = motors[i].max()
                 avg_lbl, min_lbl, max_lbl = self.stats_labels[i]
                 avg_lbl.setText(f"Avg: {avg_val:.2f} A")
                 min_lbl.setText(f"Min: {min_val:.2f} A")
@@ -127,9 +184,9 @@ class ReloadMotorBlock(QWidget):
 
 class ReloadOrientationBlock(QWidget):
     """Block to display orientation and altitude plots for reloaded data."""
-    def __init__(self, df: pd.DataFrame, config: Dict[str, Any]) -> None:
+    def __init__(self, data: LogData, config: Dict[str, Any]) -> None:
         super().__init__()
-        self.df = df
+        self.data = data
         self.config = config
         self.titles = self.config.get("reload_orientation_titles", [])
         self.colors = self.config.get("reload_orientation_colors", [])
@@ -152,6 +209,7 @@ class ReloadOrientationBlock(QWidget):
         self.stats_labels = []
         self.titles_labels = []
         self.color_labels = []
+        self.lod_curves = []
 
         for i in range(4):
             widget = QWidget()
@@ -206,22 +264,19 @@ class ReloadOrientationBlock(QWidget):
         self.setLayout(main_layout)
 
     def plot_data(self) -> None:
-        time_data = self.df["Timestamp"].tolist()
-        time_data_ts = [t.to_pydatetime().timestamp() for t in time_data]
-        roll = self.df.get("Roll", []).tolist()
-        pitch = self.df.get("Pitch", []).tolist()
-        yaw = self.df.get("Yaw", []).tolist()
-        altitude = self.df.get("Altitude", []).tolist()
-        data_list = [roll, pitch, yaw, altitude]
-        for i in range(4):
+        for lod in self.lod_curves:
+            lod.detach()
+        self.lod_curves = []
+        for i, name in enumerate(("roll", "pitch", "yaw", "altitude")):
             plot_widget = self.orient_plots[i]
             plot_widget.clear()
-            if time_data_ts and data_list[i]:
-                plot_widget.plot(
-                    time_data_ts, data_list[i],
+            if len(self.data) and name in self.data:
+                curve = plot_widget.plot(
+                    [], [],
                     pen=pg.mkPen(color=self.colors[i] if i < len(self.colors) else "#000000", width=2),
                     name=self.titles[i] if i < len(self.titles) else f"Param {i+1}"
                 )
+                self.lod_curves.append(LodCurve(curve, plot_widget, self.data, name))
                 plot_widget.enableAutoRange(axis=pg.ViewBox.XAxis, enable=True)
 
     def updateConfig(self, new_config: Dict[str, Any]) -> None:
@@ -239,9 +294,9 @@ class ReloadOrientationBlock(QWidget):
 
 class ReloadBatteryBlock(QWidget):
     """Block to display battery data and stats for reloaded data."""
-    def __init__(self, df: pd.DataFrame, config: Dict[str, Any]) -> None:
+    def __init__(self, data: LogData, config: Dict[str, Any]) -> None:
         super().__init__()
-        self.df = df
+        self.data = data
         self.config = config
         self.battery_title = self.config.get("reload_battery_title", "Battery Status")
         self.battery_color = self.config.get("reload_battery_color", "#000000")
@@ -274,6 +329,7 @@ class ReloadBatteryBlock(QWidget):
             pen=pg.mkPen(color=self.battery_color, width=2),
             name="Battery Percentage"
         )
+        self.battery_lod = LodCurve(self.battery_curve, self.plot_widget, self.data, "battery_percentage")
 
         stats_layout = QGridLayout()
         self.avg_value_label = QLabel("Avg: 0.00%")
@@ -300,22 +356,18 @@ class ReloadBatteryBlock(QWidget):
         self.setLayout(main_layout)
 
     def plot_data(self) -> None:
-        time_data = self.df["Timestamp"].tolist()
-        time_data_ts = [t.to_pydatetime().timestamp() for t in time_data]
-        if self.show_percentage:
-            y_data = self.df.get("Percentage", []).tolist()
-        else:
-            y_data = self.df.get("Voltage", []).tolist()
-        if time_data_ts and y_data:
-            self.battery_curve.setData(time_data_ts, y_data)
+        name = "battery_percentage" if self.show_percentage else "battery_voltage"
+        y_data = self.data.get(name, np.empty(0))
+        if len(y_data):
+            self.battery_lod.set_channel(name)
             self.plot_widget.enableAutoRange(axis=pg.ViewBox.XAxis, enable=True)
             if self.show_percentage:
                 self.plot_widget.setYRange(20, 100)
             else:
                 self.plot_widget.setYRange(10, 14.6)
-            avg_val = sum(y_data) / len(y_data)
-            min_val = min(y_data)
-            max_val = max(y_data)
+            avg_val = y_data.mean()
+            min_val = y_data.min()
+            max_val = y_data.max()
             unit = "%" if self.show_percentage else "V"
             self.avg_value_label.setText(f"Avg: {avg_val:.2f}{unit}")
             self.min_value_label.setText(f"Min: {min_val:.2f}{unit}")
@@ -335,22 +387,98 @@ class ReloadBatteryBlock(QWidget):
             self.battery_curve.setPen(pg.mkPen(color=self.battery_color, width=2))
         self.plot_data()
 
+class ReloadVideoBlock(QWidget):
+    """Camera recordings overlapping the reloaded data, seekable by telemetry time.
+
+    The slider runs over the data's time range; each position is looked up
+    in the recording's frame index (one binary search) and only that JPEG
+    is read and decoded, reduced to the tile size.
+    """
+    def __init__(self, data: LogData, recordings: List[CameraRecording]) -> None:
+        super().__init__()
+        self.data = data
+        self.recordings = recordings
+        self.t0 = float(data.time[0])
+        self.t1 = float(data.time[-1])
+        self._shown = None
+        self.initUI()
+        self.seek(self.t0)
+
+    def initUI(self) -> None:
+        self.group_box = QGroupBox("Camera")
+        group_layout = QVBoxLayout()
+        group_layout.setContentsMargins(2,2,2,2)
+        group_layout.setSpacing(4)
+        self.group_box.setLayout(group_layout)
+
+        self.channel_dropdown = QComboBox()
+        for rec in self.recordings:
+            self.channel_dropdown.addItem(os.path.basename(rec.stem))
+        self.channel_dropdown.currentIndexChanged.connect(lambda _: self.seek(self.current_time()))
+        group_layout.addWidget(self.channel_dropdown)
+
+        self.video = VideoTile()
+        self.video.setMinimumSize(320, 180)
+        group_layout.addWidget(self.video, 1)
+
+        self.slider = QSlider(Qt.Orientation.Horizontal)
+        self.slider.setRange(0, max(1, int((self.t1 - self.t0) * 1000)))
+        self.slider.valueChanged.connect(lambda _: self.seek(self.current_time()))
+        group_layout.addWidget(self.slider)
+        self.time_label = QLabel("")
+        group_layout.addWidget(self.time_label)
+
+        main_layout = QVBoxLayout()
+        main_layout.setContentsMargins(0,0,0,0)
+        main_layout.addWidget(self.group_box)
+        self.setLayout(main_layout)
+
+    def current_time(self) -> float:
+        return self.t0 + self.slider.value() / 1000.0
+
+    def seek(self, t: float) -> None:
+        """Show the frame that was on screen at epoch *t*."""
+        rec = self.recordings[self.channel_dropdown.currentIndex()]
+        i = rec.seek(t)
+        lag = t - float(rec.time[i])
+        self.time_label.setText(
+            f"{datetime.fromtimestamp(t).strftime('%H:%M:%S.%f')[:-3]}  frame {int(rec.frames['frame'][i])}"
+            + (f"  (no video, {lag:+.1f} s)" if abs(lag) > 1.0 else ""))
+        if (rec, i) == self._shown:
+            return
+        self._shown = (rec, i)
+        jpeg = rec.jpeg(i)
+        size = jpeg_size(jpeg)
+        flags = REDUCED_FLAGS[reduction_for(size, self.video.device_size()) if size else 1]
+        image = cv2.imdecode(np.frombuffer(jpeg, np.uint8), flags)
+        if image is None:
+            self.video.set_text("Unreadable frame")
+        else:
+            self.video.set_frame(image)
+
 class CombinedReloadDisplayWidget(QWidget):
     """Combined widget for reloaded data display."""
-    def __init__(self, df: pd.DataFrame, config: Dict[str, Any]) -> None:
+    def __init__(self, data: LogData, config: Dict[str, Any]) -> None:
         super().__init__()
-        self.df = df
+        self.data = data
         self.config = config
         self.initUI()
 
     def initUI(self) -> None:
         layout = QHBoxLayout()
-        self.reload_motor = ReloadMotorBlock(self.df, config=self.config)
-        self.reload_orientation = ReloadOrientationBlock(self.df, config=self.config)
-        self.reload_battery = ReloadBatteryBlock(self.df, config=self.config)
+        self.reload_motor = ReloadMotorBlock(self.data, config=self.config)
+        self.reload_orientation = ReloadOrientationBlock(self.data, config=self.config)
+        self.reload_battery = ReloadBatteryBlock(self.data, config=self.config)
         layout.addWidget(self.reload_motor)
         layout.addWidget(self.reload_orientation)
         layout.addWidget(self.reload_battery)
+        self.reload_video = None
+        if len(self.data):
+            recordings = find_recordings(self.config.get("log_dir", "logs"),
+                                         float(self.data.time[0]), float(self.data.time[-1]))
+            if recordings:
+                self.reload_video = ReloadVideoBlock(self.data, recordings)
+                layout.addWidget(self.reload_video)
         self.setLayout(layout)
 
     def updateConfig(self, new_config: Dict[str, Any]) -> None:
@@ -421,16 +549,12 @@ class ReloadWindow(QMainWindow):
 
         self.set_partial_fields_enabled(False, False, False, False)
 
-        try:
-            self.df_full = pd.read_excel("quadcopter_data.xlsx")
-            self.df_full["Timestamp"] = pd.to_datetime(self.df_full["Timestamp"], format="%Y-%m-%d %H:%M:%S.%f")
-        except Exception as e:
-            logging.error(f"Error loading Excel file: {e}")
-            self.df_full = None
+        self.log = None
+        self.open_latest_log()
 
-        if self.df_full is not None:
+        if self.log is not None:
             current_config = load_config()
-            self.combined_reload_display = CombinedReloadDisplayWidget(self.df_full, config=current_config)
+            self.combined_reload_display = CombinedReloadDisplayWidget(self.log, config=current_config)
             main_layout.addWidget(self.combined_reload_display)
         else:
             error_label = QLabel("Failed to load data.")
@@ -457,21 +581,43 @@ class ReloadWindow(QMainWindow):
         elif mode == "Partial Reload (Last X Data Points)":
             self.set_partial_fields_enabled(False, False, False, True)
 
-    def apply_reload(self) -> None:
+    def open_latest_log(self) -> None:
+        """Map the newest finished flight log (re-used if it is already open)."""
+        log_dir = load_config().get("log_dir", "logs")
+        path = latest_log(log_dir, ".qcol")
+        if path is None and os.path.exists(LEGACY_EXCEL):
+            path = self.import_legacy_excel(log_dir)
+        if path is None:
+            logging.error("No flight log found to reload")
+            self.log = None
+            return
+        if self.log is not None and self.log.path == path:
+            return
         try:
-            self.df_full = pd.read_excel("quadcopter_data.xlsx")
-            self.df_full["Timestamp"] = pd.to_datetime(self.df_full["Timestamp"], format="%Y-%m-%d %H:%M:%S.%f")
+            self.log = FlightLog(path)
         except Exception as e:
-            logging.error(f"Error loading Excel file: {e}")
-            self.df_full = None
-            return
+            logging.error(f"Error opening flight log {path}: {e}")
+            self.log = None
 
-        if self.df_full is None or self.df_full.empty:
+    def import_legacy_excel(self, log_dir: str) -> Optional[str]:
+        """One-time conversion of a quadcopter_data.xlsx from older versions."""
+        stamp = datetime.fromtimestamp(os.path.getmtime(LEGACY_EXCEL))
+        qcol_path = os.path.splitext(session_path(log_dir, stamp))[0] + ".qcol"
+        try:
+            os.makedirs(log_dir, exist_ok=True)
+            return import_excel(LEGACY_EXCEL, qcol_path)
+        except Exception as e:
+            logging.error(f"Error importing {LEGACY_EXCEL}: {e}")
+            return None
+
+    def apply_reload(self) -> None:
+        self.open_latest_log()
+        if self.log is None or not len(self.log):
             return
 
         mode = self.mode_dropdown.currentText()
         if mode == "Full Reload":
-            df_filtered = self.df_full.copy()
+            data = self.log
         elif mode == "Partial Reload (Time Range)":
             try:
                 start_time_input = datetime.strptime(self.start_time_edit.text(), "%H:%M:%S.%f")
@@ -489,19 +635,17 @@ class ReloadWindow(QMainWindow):
                 except ValueError:
                     logging.error("Invalid end time format. Use HH:MM:SS or HH:MM:SS.mmm")
                     return
-            base_date = self.df_full["Timestamp"].min().date()
-            start_time = datetime.combine(base_date, start_time_input.time())
-            end_time = datetime.combine(base_date, end_time_input.time())
-            df_filtered = self.df_full[(self.df_full["Timestamp"] >= start_time) & (self.df_full["Timestamp"] <= end_time)]
+            base_date = datetime.fromtimestamp(self.log.header["t_first"]).date()
+            start_time = datetime.combine(base_date, start_time_input.time()).timestamp()
+            end_time = datetime.combine(base_date, end_time_input.time()).timestamp()
+            data = self.log.query(start_time, end_time)
         elif mode == "Partial Reload (Last X Seconds)":
             try:
                 last_seconds = float(self.last_time_edit.text())
             except ValueError:
                 logging.error("Invalid time value. Please enter a numeric value.")
                 return
-            max_time = self.df_full["Timestamp"].max()
-            start_time = max_time - pd.Timedelta(seconds=last_seconds)
-            df_filtered = self.df_full[self.df_full["Timestamp"] >= start_time]
+            data = self.log.tail(last_seconds)
         elif mode == "Partial Reload (Data Point Range)":
             try:
                 start_idx = int(self.start_index_edit.text())
@@ -509,16 +653,16 @@ class ReloadWindow(QMainWindow):
             except ValueError:
                 logging.error("Invalid index values. Please enter integer values.")
                 return
-            df_filtered = self.df_full.iloc[start_idx:end_idx]
+            data = self.log.slice(start_idx, end_idx)
         elif mode == "Partial Reload (Last X Data Points)":
             try:
                 last_points = int(self.last_points_edit.text())
             except ValueError:
                 logging.error("Invalid data points value. Please enter an integer value.")
                 return
-            df_filtered = self.df_full.iloc[-last_points:]
+            data = self.log.slice(-last_points, None)
         else:
-            df_filtered = self.df_full.copy()
+            data = self.log
 
         container = self.centralWidget()
         if container is None:
@@ -532,7 +676,7 @@ class ReloadWindow(QMainWindow):
             self.combined_reload_display.deleteLater()
 
         current_config = load_config()
-        self.combined_reload_display = CombinedReloadDisplayWidget(df_filtered, config=current_config)
+        self.combined_reload_display = CombinedReloadDisplayWidget(data, config=current_config)
         central_layout.addWidget(self.combined_reload_display)
 
     def updateConfig(self, new_config: Dict[str, Any]) -> None:
@@ -0,0 +1,127 @@
+#render_scheduler.py
+
+"""Frame-rate-governed redraws for the live dashboard.
+
+Widgets register a redraw callback once; new data only marks them
+dirty.  A single timer ticks at the target FPS (capped at the display's
+refresh rate) and runs each dirty, visible callback at most once per
+frame, so bursts of ``dataUpdated`` coalesce into one redraw.
+
+Hidden widgets (inactive tab, minimized window) do no drawing work:
+new data only marks them stale, without waking the frame timer.  When
+such a widget is shown again it catches up with a single redraw on the
+next frame.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtCore import QEvent, QObject, QTimer, Qt
+from PyQt6.QtGui import QGuiApplication
+from PyQt6.QtWidgets import QWidget
+
+from utils.perf import TIMINGS
+
+
+@dataclass
+class RenderTarget:
+    widget: QWidget
+    redraw: Callable[[], None]
+    dirty:  bool = True
+    stale:  int  = 0      # data ticks that arrived while hidden
+
+
+class RenderScheduler(QObject):
+    """Coalesces dirty flags and redraws at most once per frame."""
+
+    def __init__(self, fps: float = 30, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.targets: Dict[str, RenderTarget] = {}
+        self.frames = 0
+        self._last_frame = 0.0
+        self.timer  = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+        self.set_fps(fps)
+
+    # ------------------------------------------------------------------ rate
+
+    @staticmethod
+    def display_fps() -> float:
+        screen = QGuiApplication.primaryScreen()
+        rate = screen.refreshRate() if screen else 0.0
+        return rate if rate > 0 else 60.0
+
+    def set_fps(self, fps: float) -> None:
+        """Target frame rate; 0 follows the display refresh rate."""
+        display = self.display_fps()
+        self.fps = min(float(fps), display) if fps and fps > 0 else display
+        self.timer.setInterval(max(1, round(1000 / self.fps)))
+
+    # ------------------------------------------------------------------ targets
+
+    def register(self, name: str, widget: QWidget, redraw: Callable[[], None]) -> None:
+        """Redraw *widget* through *redraw* whenever it is dirty and visible."""
+        self.targets[name] = RenderTarget(widget, redraw)
+        widget.installEventFilter(self)
+        self.timer.start()
+
+    def unregister(self, name: str) -> None:
+        target = self.targets.pop(name, None)
+        if target is not None:
+            target.widget.removeEventFilter(self)
+
+    def mark_dirty(self, *names: str) -> None:
+        """Flag the named targets (all when none given) for the next frame."""
+        wake = False
+        for name in names or self.targets:
+            target = self.targets[name]
+            target.dirty = True
+            if self._visible(target.widget):
+                wake = True
+            else:
+                target.stale += 1
+        if wake and not self.timer.isActive():
+            self.timer.start()
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        # tab switch / window restore: one catch-up frame for stale targets
+        if event.type() == QEvent.Type.Show and not self.timer.isActive():
+            if any(t.dirty and t.widget is obj for t in self.targets.values()):
+                self.timer.start()
+        return False
+
+    # ------------------------------------------------------------------ frame
+
+    @staticmethod
+    def _visible(widget: QWidget) -> bool:
+        return widget.isVisible() and not widget.window().isMinimized()
+
+    def _tick(self) -> None:
+        drawn = False
+        for name, target in self.targets.items():
+            if not target.dirty or not self._visible(target.widget):
+                continue
+            target.dirty = False
+            target.stale = 0
+            try:
+                with TIMINGS.measure(f"{name}.render"):
+                    target.redraw()
+            except Exception as e:
+                logging.error(f"Redraw of {name} failed: {e}")
+            drawn = True
+        if drawn:
+            now = time.perf_counter()
+            if self.frames:
+                TIMINGS.record("frame.interval", (now - self._last_frame) * 1e3)
+            self._last_frame = now
+            self.frames += 1
+        else:
+            # idle until the next mark_dirty
+            self.timer.stop()
+
+    def updateConfig(self, new_config: Dict) -> None:
+        if "render_fps" in new_config:
+            self.set_fps(new_config["render_fps"])
@@ -1,7 +1,16 @@
 #logging_setup.py
 
+import json
 import logging
+import logging.handlers
+import os
+import queue
 import sys
+from typing import Optional
+
+PERF_LOGGER = "perf"
+
+_perf_listener: Optional[logging.handlers.QueueListener] = None
 
 def setup_logging() -> None:
     """Setup logging configuration."""
@@ -11,6 +20,53 @@ def setup_logging() -> None:
         handlers=[logging.StreamHandler(sys.stdout)]
     )
 
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record: ``time`` plus the record's ``perf`` dict."""
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {"time": round(record.created, 3), **getattr(record, "perf", {})}
+        return json.dumps(payload, separators=(",", ":"))
+
+
+def start_perf_log(path: str, max_bytes: int = 5_000_000, backup_count: int = 3) -> None:
+    """Route the ``perf`` logger to a rotating JSON-lines file.
+
+    The GUI thread only enqueues records (QueueHandler); formatting and
+    file I/O run on the QueueListener's thread.
+    """
+    stop_perf_log()
+    global _perf_listener
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    file_handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    file_handler.setFormatter(JsonLinesFormatter())
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    logger = logging.getLogger(PERF_LOGGER)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False   # keep perf records off the console
+    logger.addHandler(logging.handlers.QueueHandler(records))
+    _perf_listener = logging.handlers.QueueListener(records, file_handler)
+    _perf_listener.start()
+    logging.info("Perf log: %s", path)
+
+
+def stop_perf_log() -> None:
+    """Flush and close the perf log, if one is running."""
+    global _perf_listener
+    if _perf_listener is None:
+        return
+    logger = logging.getLogger(PERF_LOGGER)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    _perf_listener.stop()
+    for handler in _perf_listener.handlers:
+        handler.close()
+    _perf_listener = None
+
+
+def perf_log_active() -> bool:
+    return _perf_listener is not None
+
 if __name__ == "__main__":
     setup_logging()
     logging.info("Logging is set up.")
@@ -0,0 +1,71 @@
+#perf.py
+
+"""Lightweight per-stage timing for the GUI.
+
+``TIMINGS`` is a process-wide collector: wrap a stage in
+``with TIMINGS.measure("motor.bars.update"):`` (or call :meth:`record`)
+and read rolling statistics back with :meth:`StageTimings.summary`.
+Only the last ``window`` samples of each stage are kept.  Stages may be
+recorded from any thread (the serial reader times its parsing here).
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Iterator
+
+import numpy as np
+
+
+class StageTimings:
+    """Rolling window of durations (ms) per named stage."""
+
+    def __init__(self, window: int = 300) -> None:
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, ms: float) -> None:
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+                self._counts[stage] = 0
+            samples.append(ms)
+            self._counts[stage] += 1
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - t0) * 1e3)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """``{stage: {count, mean, p95, max}}`` over the rolling window (ms)."""
+        with self._lock:
+            snapshot = {stage: (list(samples), self._counts[stage])
+                        for stage, samples in self._samples.items()}
+        out = {}
+        for stage, (samples, count) in sorted(snapshot.items()):
+            if not samples:
+                continue
+            arr = np.asarray(samples, dtype=np.float64)
+            out[stage] = {
+                "count": count,
+                "mean":  float(arr.mean()),
+                "p95":   float(np.percentile(arr, 95)),
+                "max":   float(arr.max()),
+            }
+        return out
+
+
+TIMINGS = StageTimings()
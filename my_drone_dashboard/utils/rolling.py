@@ -0,0 +1,117 @@
+#rolling.py
+
+"""Incremental helpers for scrolling live plots.
+
+Both classes hold the newest *N* samples and are fed only the samples
+that arrived since the last frame, so per-frame work is O(new samples)
+instead of O(window).
+"""
+
+from collections import deque
+from typing import Deque, Tuple
+
+import numpy as np
+
+
+class RollingMinMax:
+    """Min / max of the last *window* values via two monotonic deques.
+
+    Each value enters and leaves each deque at most once, so a push is
+    amortized O(1).
+    """
+
+    def __init__(self, window: int) -> None:
+        self.window = max(1, int(window))
+        self._count = 0
+        self._lo: Deque[Tuple[int, float]] = deque()   # increasing values
+        self._hi: Deque[Tuple[int, float]] = deque()   # decreasing values
+
+    def clear(self) -> None:
+        self._count = 0
+        self._lo.clear()
+        self._hi.clear()
+
+    def push(self, value: float) -> None:
+        i = self._count
+        self._count += 1
+        lo, hi = self._lo, self._hi
+        while lo and lo[-1][1] >= value:
+            lo.pop()
+        lo.append((i, value))
+        while hi and hi[-1][1] <= value:
+            hi.pop()
+        hi.append((i, value))
+        oldest = i - self.window + 1
+        if lo[0][0] < oldest:
+            lo.popleft()
+        if hi[0][0] < oldest:
+            hi.popleft()
+
+    def extend(self, values) -> None:
+        if len(values) > self.window:   # older values could never be reported
+            self._count += len(values) - self.window
+            self._lo.clear()
+            self._hi.clear()
+            values = values[-self.window:]
+        for v in values.tolist() if isinstance(values, np.ndarray) else values:
+            self.push(v)
+
+    def __len__(self) -> int:
+        return min(self._count, self.window)
+
+    @property
+    def min(self) -> float:
+        return self._lo[0][1] if self._lo else 0.0
+
+    @property
+    def max(self) -> float:
+        return self._hi[0][1] if self._hi else 0.0
+
+
+class ScrollBuffer:
+    """Preallocated x/y vertex buffer holding the newest *capacity* points.
+
+    Storage is ``2 * capacity`` long: points are appended in place and,
+    once the end is reached, the newest ``capacity`` points are moved back
+    to the front (once per ``capacity`` appends).  :attr:`x` and :attr:`y`
+    are contiguous views, ready for ``PlotDataItem.setData``.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, int(capacity))
+        self._x = np.empty(2 * self.capacity)
+        self._y = np.empty(2 * self.capacity)
+        self._start = 0
+        self._end   = 0
+
+    def clear(self) -> None:
+        self._start = self._end = 0
+
+    def extend(self, x: np.ndarray, y: np.ndarray) -> None:
+        n, cap = len(x), self.capacity
+        if n >= cap:
+            self._x[:cap] = x[-cap:]
+            self._y[:cap] = y[-cap:]
+            self._start, self._end = 0, cap
+            return
+        if self._end + n > 2 * cap:
+            keep = min(cap - n, self._end - self._start)
+            src = slice(self._end - keep, self._end)
+            self._x[:keep] = self._x[src]
+            self._y[:keep] = self._y[src]
+            self._start, self._end = 0, keep
+        self._x[self._end:self._end + n] = x
+        self._y[self._end:self._end + n] = y
+        self._end += n
+        self._start = max(self._start, self._end - cap)
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._x[self._start:self._end]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._y[self._start:self._end]
@@ -0,0 +1,70 @@
+#timestamps.py
+
+"""Vectorized conversions between float epoch seconds and local time.
+
+Telemetry keeps ``time`` as ``float64`` epoch seconds from the serial
+thread to the flight log and the reload plots.  These helpers are for
+the edges only (Excel export / import) and convert whole columns at
+once instead of looping over ``datetime`` objects.
+
+The local UTC offset is looked up once per 15-minute bucket that occurs
+in the data (every time zone changes offset on such a boundary), so the
+results match ``datetime.fromtimestamp`` / ``datetime.timestamp``
+exactly, DST included.
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+EXCEL_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+_BUCKET = 900
+_EPOCH  = datetime(1970, 1, 1)
+
+
+def _utc_offset(epoch: int) -> int:
+    """Local UTC offset (s) at *epoch*."""
+    return int(datetime.fromtimestamp(epoch, timezone.utc).astimezone().utcoffset().total_seconds())
+
+
+def _wall_offset(wall: int) -> int:
+    """Local UTC offset (s) for the wall-clock time *wall* (naive seconds)."""
+    return wall - int((_EPOCH + timedelta(seconds=wall)).timestamp())
+
+
+def _offsets(seconds: np.ndarray, lookup: Callable[[int], int]) -> np.ndarray:
+    buckets, inverse = np.unique(seconds // _BUCKET, return_inverse=True)
+    table = np.array([lookup(int(b) * _BUCKET) for b in buckets], dtype=np.int64)
+    return table[inverse]
+
+
+def epoch_to_local(t) -> np.ndarray:
+    """Naive local ``datetime64[us]``, like ``datetime.fromtimestamp`` per element."""
+    t = np.asarray(t, dtype=np.float64)
+    sec = np.floor(t).astype(np.int64)
+    us = np.round((t - sec) * 1e6).astype(np.int64)   # exact fraction, as fromtimestamp
+    local = (sec + _offsets(sec, _utc_offset)) * 1_000_000 + us
+    return local.astype("datetime64[us]")
+
+
+def format_epoch(t) -> np.ndarray:
+    """``EXCEL_FORMAT`` strings (``YYYY-mm-dd HH:MM:SS.ffffff``) for epoch seconds."""
+    iso = np.datetime_as_string(epoch_to_local(t), unit="us")
+    return np.char.replace(iso, "T", " ")
+
+
+def parse_local(values) -> np.ndarray:
+    """Epoch seconds for local timestamps (``EXCEL_FORMAT`` strings or datetimes).
+
+    Repeated wall times at a DST change resolve to the first one, as
+    ``datetime.timestamp()`` does.
+    """
+    values = pd.Series(values)
+    if not pd.api.types.is_datetime64_any_dtype(values):
+        values = pd.to_datetime(values, format=EXCEL_FORMAT)
+    us = values.dt.as_unit("us").to_numpy().view(np.int64)
+    wall = us // 1_000_000
+    return (wall - _offsets(wall, _wall_offset)) + (us - wall * 1_000_000) / 1e6